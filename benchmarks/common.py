@@ -0,0 +1,104 @@
+"""
+Shared helpers for the CypherDetective benchmarks
+
+Benchmarks run headless (SDL dummy video/audio drivers) from the repository
+root, e.g. python -m benchmarks.render_bench
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import time
+import platform
+import contextlib
+import subprocess
+import pygame
+from typing import Any, Callable, Dict, List
+
+from src.db.generator import generate_case
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarize timing samples (ms) as count, mean and percentiles"""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"count": 0}
+    last = len(ordered) - 1
+
+    def pct(p):
+        return ordered[min(last, int(round(p / 100 * last)))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "min_ms": ordered[0],
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1],
+    }
+
+
+def time_calls(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Call fn repeat times and return the duration of each call in ms"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and revision the benchmark ran on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.time(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+    }
+
+
+def game_output_to_stderr():
+    """Keep the game's console output out of JSON results printed to stdout"""
+    return contextlib.redirect_stdout(sys.stderr)
+
+
+def write_results(results: Dict[str, Any], output: str = None):
+    """Write benchmark results as JSON to a file, or stdout if no file is given"""
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text)
+        print(f"Wrote benchmark results to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+def synthetic_case(num_nodes: int, seed: int = 73) -> Dict[str, Any]:
+    """
+    Generate a case with roughly num_nodes nodes (see src.db.generator)
+
+    Suspects make up ~90% of the nodes, locations and banks ~5% each.
+    """
+    return generate_case(
+        suspects=max(1, int(num_nodes * 0.9)),
+        locations=max(1, num_nodes // 20),
+        banks=max(1, num_nodes // 20),
+        seed=seed,
+    )
@@ -0,0 +1,184 @@
+"""
+Database round-trip benchmark for DatabaseConnection
+
+Runs against the in-process backend (with optional simulated latency) or a
+local Bolt-compatible server, and measures cold connect, per-query latency,
+throughput under concurrent submissions and the cost of the full-graph fetch
+behind GraphVisualization.load_graph_for_level as the dataset grows.
+
+    python -m benchmarks.db_bench --latency-ms 2 --output db.json
+    python -m benchmarks.db_bench --uri bolt://localhost:7687 --user neo4j \\
+        --password secret
+"""
+
+from benchmarks.common import (
+    environment,
+    game_output_to_stderr,
+    summarize,
+    synthetic_case,
+    time_calls,
+    write_results,
+)
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from src.levels import get_ground_truth_queries
+from src.db.database import DatabaseConnection
+from src.db.memory_driver import InMemoryDriver
+from src.db.queries import NODES_QUERY, RELATIONSHIPS_QUERY
+
+
+def memory_driver(num_nodes, latency):
+    """Build an in-process driver serving a generated case and its answers"""
+    return InMemoryDriver.from_case(synthetic_case(num_nodes), latency=latency)
+
+
+class Backend:
+    """Creates connections to the benchmarked backend"""
+
+    def __init__(self, args):
+        self.args = args
+        self._driver = None  # (num_nodes, in-process driver) of the last dataset
+
+    def driver(self, num_nodes=100):
+        """Get the in-process driver of a dataset size, generating it only once"""
+        if self._driver is None or self._driver[0] != num_nodes:
+            self._driver = (
+                num_nodes,
+                memory_driver(num_nodes, self.args.latency_ms / 1000.0),
+            )
+        return self._driver[1]
+
+    def connect(self, num_nodes=100):
+        if self.args.uri:
+            return DatabaseConnection(
+                uri=self.args.uri, user=self.args.user, password=self.args.password
+            )
+        return DatabaseConnection(driver=self.driver(num_nodes))
+
+
+def bench_cold_connect(backend, repeat):
+    """Time establishing (and verifying) a fresh connection"""
+    if not backend.args.uri:
+        backend.driver()  # Generate the dataset outside the timed region
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db = backend.connect()
+        samples.append((time.perf_counter() - start) * 1000.0)
+        db.close()
+    return summarize(samples)
+
+
+def bench_query_latency(db, repeat):
+    """Time each level's ground truth query"""
+    return {
+        f"level_{level_num}": summarize(
+            time_calls(lambda: db.execute_query(query), repeat)
+        )
+        for level_num, query in get_ground_truth_queries().items()
+    }
+
+
+def bench_throughput(db, concurrency_levels, total_queries):
+    """Measure queries per second with concurrent submissions"""
+    queries = list(get_ground_truth_queries().values())
+    results = {}
+    for workers in concurrency_levels:
+        latencies = []
+
+        def run(i):
+            start = time.perf_counter()
+            db.execute_query(queries[i % len(queries)])
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, range(total_queries)))
+        elapsed = time.perf_counter() - start
+        results[str(workers)] = {
+            "queries_per_second": total_queries / elapsed,
+            "latency": summarize(latencies),
+        }
+    return results
+
+
+def bench_graph_fetch(backend, sizes, repeat):
+    """Time the full-graph fetch of load_graph_for_level per dataset size"""
+    results = []
+    for num_nodes in sizes:
+        db = backend.connect(num_nodes)
+        rows = {}
+
+        def fetch():
+            rows["nodes"] = db.execute_query(NODES_QUERY)
+            rows["relationships"] = db.execute_query(RELATIONSHIPS_QUERY)
+
+        samples = time_calls(fetch, repeat)
+        results.append(
+            {
+                "nodes": len(rows["nodes"]),
+                "relationships": len(rows["relationships"]),
+                "fetch": summarize(samples),
+            }
+        )
+        db.close()
+        if backend.args.uri:
+            break  # A live server has a single dataset size
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database round-trip benchmark")
+    parser.add_argument("--uri", help="Bolt URI (default: in-process backend)")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default="neo4j")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated round-trip latency of the in-process backend",
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--concurrency", default="1,2,4,8,16")
+    parser.add_argument("--total-queries", type=int, default=400)
+    parser.add_argument(
+        "--sizes",
+        default="10,100,1000,10000,100000",
+        help="Comma-separated dataset sizes (nodes) for the graph fetch",
+    )
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    args = parser.parse_args()
+
+    with game_output_to_stderr():
+        backend = Backend(args)
+        results = {
+            "environment": environment(),
+            "config": {
+                "backend": args.uri or "in-process",
+                "latency_ms": None if args.uri else args.latency_ms,
+                "repeat": args.repeat,
+                "total_queries": args.total_queries,
+            },
+            "cold_connect": bench_cold_connect(backend, max(1, args.repeat // 10)),
+        }
+
+        db = backend.connect()
+        results["query_latency"] = bench_query_latency(db, args.repeat)
+        results["throughput"] = bench_throughput(
+            db,
+            [int(n) for n in args.concurrency.split(",")],
+            args.total_queries,
+        )
+        db.close()
+
+        results["graph_fetch"] = bench_graph_fetch(
+            backend, [int(n) for n in args.sizes.split(",")], max(1, args.repeat // 10)
+        )
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
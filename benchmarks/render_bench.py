@@ -0,0 +1,224 @@
+"""
+Headless rendering benchmark for the game states and the graph visualizer
+
+Drives MenuState, LevelSelectorState and GameplayState with scripted events and
+times update()/render() per frame, then stresses GraphVisualization with
+synthetic graphs (load, layout, render and hit-test times). For the layout it
+also reports the iterations that ran and the temperature of the last one
+relative to the first (near 0 once the layout has cooled down).
+
+    python -m benchmarks.render_bench --frames 300 --sizes 10,100,1000,10000 \\
+        --output render.json
+"""
+
+from benchmarks.common import (
+    environment,
+    game_output_to_stderr,
+    summarize,
+    synthetic_case,
+    time_calls,
+    write_results,
+)
+
+import time
+import random
+import argparse
+import pygame
+
+from src.play import GameManager
+from src.levels import get_level
+from src.states.menu import MenuState
+from src.states.gameplay import GameplayState
+from src.states.level_selector import LevelSelectorState
+from src.ui import gameplay_ui
+from src.ui.gameplay_ui import GraphVisualization
+from src.db.database import DatabaseConnection
+from src.db.memory_driver import InMemoryDriver
+
+
+def _click(pos):
+    """Events for a left click at pos"""
+    return [
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos),
+        pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=pos),
+    ]
+
+
+def _key(key):
+    """Event for a key press"""
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="")
+
+
+def menu_script(state, frame):
+    """Move the mouse around and toggle the case details panel"""
+    events = [
+        pygame.event.Event(
+            pygame.MOUSEMOTION, pos=(frame * 7 % 1200, frame * 3 % 800), rel=(1, 1)
+        )
+    ]
+    if frame % 60 == 30 and state.case_button:
+        events += _click(state.case_button.rect.center)
+    return events
+
+
+def level_selector_script(state, frame):
+    """Hover the grid and open/cancel the reset confirmation dialog"""
+    events = [
+        pygame.event.Event(
+            pygame.MOUSEMOTION, pos=(frame * 11 % 1200, frame * 5 % 800), rel=(1, 1)
+        )
+    ]
+    if frame % 60 == 20 and state.reset_progress_rect:
+        pygame.mouse.set_pos(state.reset_progress_rect.center)
+        events += _click(state.reset_progress_rect.center)
+    elif frame % 60 == 50:
+        events.append(_key(pygame.K_ESCAPE))
+    return events
+
+
+def gameplay_script(state, frame):
+    """Hover and zoom the graph visualization"""
+    vis = state.graph_visualization
+    if not vis:
+        return []
+    x = vis.rect.x + frame * 7 % max(1, vis.rect.width)
+    y = vis.rect.y + frame * 5 % max(1, vis.rect.height)
+    events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(1, 1))]
+    if frame % 20 == 0:
+        events.append(
+            pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN, button=4 if frame % 40 else 5, pos=(x, y)
+            )
+        )
+    return events
+
+
+def bench_state(game, state, script, frames):
+    """Time update() and render() of a state over scripted frames"""
+    game.state = state
+    time_delta = 1.0 / game.cfg.fps
+    update_ms, render_ms = [], []
+    for frame in range(frames):
+        for event in script(state, frame):
+            state.handle_event(event)
+
+        start = time.perf_counter()
+        state.update(time_delta)
+        update_ms.append((time.perf_counter() - start) * 1000.0)
+
+        start = time.perf_counter()
+        state.render()
+        render_ms.append((time.perf_counter() - start) * 1000.0)
+    return {"update": summarize(update_ms), "render": summarize(render_ms)}
+
+
+def bench_states(game, frames):
+    """Benchmark the menu, level selector and gameplay states"""
+    results = {}
+    results["menu"] = bench_state(game, MenuState(game), menu_script, frames)
+    results["level_selector"] = bench_state(
+        game, LevelSelectorState(game), level_selector_script, frames
+    )
+    game.current_level = get_level(1)
+    gameplay = GameplayState(game)
+    results["gameplay"] = bench_state(game, gameplay, gameplay_script, frames)
+    gameplay.clean_up()
+    game.current_level = None
+    return results
+
+
+def bench_graph(game, num_nodes, frames, hit_tests):
+    """Benchmark GraphVisualization on a synthetic graph"""
+    case = synthetic_case(num_nodes)
+    game.db = DatabaseConnection(driver=InMemoryDriver.from_case(case))
+    game.current_level = get_level(1)
+    state = GameplayState(game)
+    rect = pygame.Rect(700, 100, 450, 460)
+
+    vis = GraphVisualization(state, rect)
+    start = time.perf_counter()
+    vis.load_graph_for_level(1)
+    load_ms = (time.perf_counter() - start) * 1000.0
+
+    gameplay_ui._layout_cache.clear()  # Time the layout itself, not the cache
+    start = time.perf_counter()
+    vis._compute_layout()
+    layout_ms = (time.perf_counter() - start) * 1000.0
+
+    # How far the timed layout converged
+    engine = vis.layout_engine
+
+    render_ms = time_calls(lambda: vis.render(game.screen), frames)
+
+    rng = random.Random(73)
+    points = [
+        (rng.randint(rect.left, rect.right), rng.randint(rect.top, rect.bottom))
+        for _ in range(hit_tests)
+    ]
+    points_iter = iter(points * 2)
+    node_hit_ms = time_calls(
+        lambda: vis._get_node_at_position(next(points_iter)), hit_tests
+    )
+    edge_hit_ms = time_calls(
+        lambda: vis._get_edge_at_position(next(points_iter)), hit_tests
+    )
+
+    vis.clean_up()
+    return {
+        "nodes": len(case["nodes"]),
+        "relationships": len(case["relationships"]),
+        "visible_nodes": vis.model.num_nodes,
+        "load_ms": load_ms,
+        "layout_ms": layout_ms,
+        "layout": {
+            "engine": type(engine).__name__,
+            "iterations": getattr(engine, "iterations_run", engine.iterations),
+            "last_temperature": getattr(engine, "last_temperature", None),
+        },
+        "render": summarize(render_ms),
+        "node_hit_test": summarize(node_hit_ms),
+        "edge_hit_test": summarize(edge_hit_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per case")
+    parser.add_argument(
+        "--sizes",
+        default="10,100,1000,10000",
+        help="Comma-separated synthetic graph sizes (nodes)",
+    )
+    parser.add_argument("--hit-tests", type=int, default=200)
+    parser.add_argument("--skip-states", action="store_true")
+    parser.add_argument("--skip-graph", action="store_true")
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    args = parser.parse_args()
+
+    with game_output_to_stderr():
+        game = GameManager(
+            db=DatabaseConnection(driver=InMemoryDriver.from_case(synthetic_case(50)))
+        )
+
+        results = {
+            "environment": environment(),
+            "config": {
+                "frames": args.frames,
+                "sizes": args.sizes,
+                "hit_tests": args.hit_tests,
+            },
+        }
+        if not args.skip_states:
+            results["states"] = bench_states(game, args.frames)
+        if not args.skip_graph:
+            results["graph"] = [
+                bench_graph(game, int(size), args.frames, args.hit_tests)
+                for size in args.sizes.split(",")
+            ]
+
+    pygame.quit()
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Cold start benchmark for the game
+
+Starts fresh interpreters that import src.play, create the GameManager and
+draw the first menu frame, timing each step. It also records which of the
+lazily loaded heavy modules got imported anyway. The import of src.play is
+checked against a budget, so a stray top-level import of neo4j, numpy or the
+gameplay UI fails the run:
+
+    python -m benchmarks.startup_bench --runs 5 --budget-ms 250 --output startup.json
+"""
+
+from benchmarks.common import environment, summarize, write_results
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Modules that must not be loaded to show the menu (see src.play)
+LAZY_MODULES = [
+    "neo4j",
+    "numpy",
+    "networkx",
+    "src.db.database",
+    "src.ui.gameplay_ui",
+    "src.states.gameplay",
+]
+
+_CHILD = """
+import sys, json, time
+start = time.perf_counter()
+import src.play
+imported = time.perf_counter()
+game = src.play.GameManager()
+created = time.perf_counter()
+game.render()
+rendered = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000.0,
+    "init_ms": (created - imported) * 1000.0,
+    "first_frame_ms": (rendered - start) * 1000.0,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def _child_env():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    return env
+
+
+def run_once():
+    """Time one cold start in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD % (LAZY_MODULES,)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_child_env(),
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(count):
+    """Get the modules with the largest cumulative import time under src.play"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.play"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_child_env(),
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            imports.append((int(cumulative) / 1000.0, name.strip()))
+    imports.sort(reverse=True)
+    return [
+        {"module": name, "cumulative_ms": ms}
+        for ms, name in imports
+        if name != "src.play"
+    ][:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to time")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=250.0,
+        help="Maximum median import time of src.play (0 to disable)",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed")
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+    results = {
+        "environment": environment(),
+        "config": {"runs": args.runs, "budget_ms": args.budget_ms},
+        "import": summarize([run["import_ms"] for run in runs]),
+        "init": summarize([run["init_ms"] for run in runs]),
+        "first_frame": summarize([run["first_frame_ms"] for run in runs]),
+        "eagerly_loaded": loaded,
+        "slowest_imports": slowest_imports(args.top),
+    }
+    write_results(results, args.output)
+
+    failures = []
+    if args.budget_ms and results["import"]["p50_ms"] > args.budget_ms:
+        failures.append(
+            f"importing src.play took {results['import']['p50_ms']:.0f} ms "
+            f"(budget {args.budget_ms:.0f} ms)"
+        )
+    if loaded:
+        failures.append(f"loaded before the first frame: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"Startup budget exceeded: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
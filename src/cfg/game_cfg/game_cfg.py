@@ -1,7 +1,8 @@
 # TODO: add colors here so they can be customized
 
 import pygame
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
 
 @dataclass
@@ -11,8 +12,48 @@ class GameConfig:
     screen_width: int = 1200
     screen_height: int = 800
 
-    def __post_init__(self):
-        self.font_large = pygame.font.SysFont("Times New Roman", 32)
-        self.font_medium = pygame.font.SysFont("Times New Roman", 24)
-        self.font_small = pygame.font.SysFont("Arial", 20)
-        self.font_tiny = pygame.font.SysFont("Arial", 16)
+    # Graph layout: "auto" (networkx for small graphs, Barnes-Hut for large),
+    # "networkx" or "barnes_hut"
+    layout_engine: str = "auto"
+    layout_iterations: int = 50
+    layout_time_budget: float = 2.0  # Seconds, Barnes-Hut only
+
+    # Live query preview (toggled in game with the Preview button)
+    live_preview: bool = False
+    preview_debounce: float = 0.5  # Seconds of typing pause before running
+    preview_timeout: float = 2.0  # Seconds
+    preview_max_rows: int = 50
+
+    # Binary graph snapshot directory to load level graphs from (see src.db.snapshot)
+    graph_snapshot: Optional[str] = None
+
+    # Reject player queries whose EXPLAIN plan is over budget (see src.db.cost_gate)
+    query_cost_gate: bool = False
+    max_estimated_rows: int = 1_000_000
+
+    # Fonts are resolved on first use, looking up system fonts is slow
+    _fonts: Dict[Tuple[str, int], pygame.font.Font] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _font(self, name: str, size: int) -> pygame.font.Font:
+        font = self._fonts.get((name, size))
+        if font is None:
+            font = self._fonts[(name, size)] = pygame.font.SysFont(name, size)
+        return font
+
+    @property
+    def font_large(self) -> pygame.font.Font:
+        return self._font("Times New Roman", 32)
+
+    @property
+    def font_medium(self) -> pygame.font.Font:
+        return self._font("Times New Roman", 24)
+
+    @property
+    def font_small(self) -> pygame.font.Font:
+        return self._font("Arial", 20)
+
+    @property
+    def font_tiny(self) -> pygame.font.Font:
+        return self._font("Arial", 16)
@@ -0,0 +1,131 @@
+"""
+EXPLAIN-based cost gate for player queries
+
+Before a player's query runs, its plan is fetched with EXPLAIN (which doesn't
+execute anything) and checked for operators that can overload the shared
+database: Cartesian products of unconnected patterns, variable-length expands
+without an upper bound, and estimated row counts over a budget. Verdicts are
+cached per dataset version and normalized query text, so a query is only
+explained once. The cache is shared with the query preview thread.
+"""
+
+from src.db.queries import normalize_query
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+# Variable-length relationship in a plan's details, e.g. [r*1..] or [*]
+_VAR_LENGTH = re.compile(r"\*\s*(\d*)\s*(\.\.)?\s*(\d*)\s*[\]{]")
+
+
+class QueryCostError(Exception):
+    """A query was rejected by the cost gate"""
+
+
+def _operators(plan: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Walk all operators of a plan tree"""
+    stack = [plan]
+    while stack:
+        operator = stack.pop()
+        yield operator
+        stack.extend(operator.get("children", []))
+
+
+def _is_unbounded(details: str) -> bool:
+    """Whether a variable-length relationship in the details has no upper bound"""
+    for lower, dots, upper in _VAR_LENGTH.findall(details):
+        if not upper and (dots or not lower):
+            return True
+    return False
+
+
+class QueryCostGate:
+    """Rejects queries whose EXPLAIN plan exceeds the cost budget"""
+
+    def __init__(self, max_estimated_rows: float = 1_000_000, cache_size: int = 256):
+        """
+        Args:
+            max_estimated_rows: Largest estimated row count allowed for any operator
+            cache_size: Maximum number of cached verdicts
+        """
+        self.max_estimated_rows = max_estimated_rows
+        self.cache_size = cache_size
+        # Verdicts by (dataset version, normalized query)
+        self._cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        self._dataset_version = None
+        self._lock = threading.Lock()
+
+    def set_dataset_version(self, version: Optional[str]):
+        """Drop the cached verdicts if the data changed (plans depend on it)"""
+        with self._lock:
+            if version != self._dataset_version or version is None:
+                self._cache.clear()
+                self._dataset_version = version
+
+    def cached_verdict(self, query: str, version: Optional[str] = None):
+        """
+        Get the cached verdict for a query
+
+        Args:
+            query: Cypher query string
+            version: Dataset version the query runs against
+
+        Returns:
+            Tuple of (found, rejection reason or None)
+        """
+        key = (version, normalize_query(query))
+        with self._lock:
+            if key not in self._cache:
+                return False, None
+            self._cache.move_to_end(key)
+            return True, self._cache[key]
+
+    def store_verdict(
+        self, query: str, reason: Optional[str], version: Optional[str] = None
+    ):
+        """Cache the verdict for a query run against a dataset version"""
+        with self._lock:
+            self._cache[(version, normalize_query(query))] = reason
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def analyze(self, plan: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Check a plan against the budget
+
+        Args:
+            plan: Plan tree as returned by ResultSummary.plan (operatorType,
+                arguments, children), or None if unavailable
+
+        Returns:
+            Reason for rejecting the query, or None if it is within budget
+        """
+        if not plan:
+            return None
+
+        max_rows = 0.0
+        for operator in _operators(plan):
+            operator_type = operator.get("operatorType", "")
+            arguments = operator.get("args") or operator.get("arguments") or {}
+            details = str(arguments.get("Details", ""))
+
+            if operator_type.startswith("CartesianProduct"):
+                return (
+                    "it combines unconnected patterns into a Cartesian product. "
+                    "Connect the patterns or split the query"
+                )
+            if "VarLengthExpand" in operator_type and _is_unbounded(details):
+                return (
+                    "it has a variable-length relationship without an upper bound. "
+                    "Add one, e.g. [*1..5]"
+                )
+            max_rows = max(max_rows, float(arguments.get("EstimatedRows", 0) or 0))
+
+        if max_rows > self.max_estimated_rows:
+            return (
+                f"the database estimates {max_rows:,.0f} rows "
+                f"(limit {self.max_estimated_rows:,.0f}). Narrow down the query"
+            )
+        return None
@@ -1,6 +1,10 @@
 // --- Clear existing data
 MATCH (n) DETACH DELETE n;
 
+// === Indexes and constraints ===
+// Declared per case in src/db/schema.py, apply them (and stamp the dataset
+// version) with: python -m src.db.schema src/db/create/john_doe.json
+
 // === Create Victim ===
 CREATE (victim:Victim {
     name: "John Doe"
@@ -13,6 +17,7 @@ CREATE
     (outside:Location {name: "Outside", type: "outdoors"});
 
 // === Create 10 Suspects ===
+// graph_mask: bit n set = visible in the graph of level n + 1
 CREATE
 (s1:Suspect {
     name: "Alice Brown",
@@ -21,7 +26,7 @@ CREATE
     height: 5.7,
     blood_type: "B+",
     access_level: 0,
-    graph_0: true
+    graph_mask: 1
 }),
 (s2:Suspect {
     name: "Ben Carter",
@@ -30,7 +35,7 @@ CREATE
     height: 6.1,
     blood_type: "O+",
     access_level: 0,
-    graph_0: true, graph_1: true, graph_2: true
+    graph_mask: 7
 }),
 (s3:Suspect {
     name: "Chloe Diaz",
@@ -39,7 +44,7 @@ CREATE
     height: 5.5,
     blood_type: "A-",
     access_level: 3,
-    graph_0: true, graph_1: true, graph_2: true, graph_3: true, graph_4: true
+    graph_mask: 31
 }),
 (s4:Suspect {
     name: "David Evans",
@@ -48,7 +53,7 @@ CREATE
     height: 6.2,
     blood_type: "O+",
     access_level: 2,
-    graph_0: true, graph_1: true, graph_2: true, graph_3: true, graph_4: true, graph_5: true, graph_6: true, graph_7: true, graph_8: true
+    graph_mask: 511
 }),
 (s5:Suspect {
     name: "Ella Fisher",
@@ -57,7 +62,7 @@ CREATE
     height: 5.6,
     blood_type: "AB-",
     access_level: 1,
-    graph_0: true, graph_1: true
+    graph_mask: 3
 }),
 (s6:Suspect {
     name: "Frank Green",
@@ -66,7 +71,7 @@ CREATE
     height: 6.0,
     blood_type: "O+",
     access_level: 1,
-    graph_0: true, graph_1: true, graph_2: true, graph_3: true
+    graph_mask: 15
 }),
 (s7:Suspect {
     name: "Grace Hill",
@@ -75,7 +80,7 @@ CREATE
     height: 6.0,
     blood_type: "O+",
     access_level: 2,
-    graph_0: true, graph_1: true, graph_2: true, graph_3: true, graph_4: true, graph_5: true, graph_6: true, graph_7: true
+    graph_mask: 255
 }),
 (s8:Suspect {
     name: "Harry Irving",
@@ -84,7 +89,7 @@ CREATE
     height: 6.3,
     blood_type: "O+",
     access_level: 2,
-    graph_0: true, graph_1: true, graph_2: true, graph_3: true, graph_4: true, graph_5: true, graph_6: true
+    graph_mask: 127
 }),
 (s9:Suspect {
     name: "Isla Jones",
@@ -93,7 +98,7 @@ CREATE
     height: 6.0,
     blood_type: "B+",
     access_level: 3,
-    graph_0: true, graph_1: true, graph_2: true, graph_3: true, graph_4: true, graph_5: true
+    graph_mask: 63
 }),
 (s10:Suspect {
     name: "Jack Knight",
@@ -102,7 +107,7 @@ CREATE
     height: 6.1,
     blood_type: "O+",
     access_level: 0,
-    graph_0: true, graph_1: true
+    graph_mask: 3
 });
 
 // === Create Location Relationships ===
@@ -128,9 +133,9 @@ CREATE (s)-[:CLOSE_FRIEND_OF]->(v);
 
 // === Create Banks ===
 CREATE
-(b1:Bank {name: "First National", graph_7: true}),
-(b2:Bank {name: "River City Bank", graph_7: true}),
-(b3:Bank {name: "Metro Credit Union", graph_7: true});
+(b1:Bank {name: "First National", graph_mask: 128}),
+(b2:Bank {name: "River City Bank", graph_mask: 128}),
+(b3:Bank {name: "Metro Credit Union", graph_mask: 128});
 
 // === Create Deposit Relationships with Amounts ===
 
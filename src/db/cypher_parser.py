@@ -0,0 +1,664 @@
+"""
+Client-side Cypher syntax check for player queries
+
+A small tokenizer and recursive-descent parser for the read-only subset of
+Cypher the levels are about (MATCH, OPTIONAL MATCH, WHERE, WITH, UNWIND, RETURN,
+ORDER BY, SKIP, LIMIT, UNION and the usual expressions). It catches typos and
+write clauses before a query is sent to the server, and reports them with a line
+and column.
+
+Constructs outside the subset (CALL, subqueries, comprehensions, quantified
+paths, ...) are not judged locally: the query is deferred to the server, which
+stays the authority on what is valid Cypher.
+"""
+
+from typing import List, NamedTuple, Optional
+
+# Clauses that modify the database or its schema
+WRITE_CLAUSES = {
+    "CREATE",
+    "MERGE",
+    "DELETE",
+    "DETACH",
+    "SET",
+    "REMOVE",
+    "DROP",
+    "FOREACH",
+    "LOAD",
+    "ALTER",
+    "GRANT",
+    "DENY",
+    "REVOKE",
+    "RENAME",
+    "START",
+    "STOP",
+    "TERMINATE",
+}
+
+# Clauses outside the supported subset, left to the server
+DEFERRED_CLAUSES = {"CALL", "USE", "SHOW", "EXPLAIN", "PROFILE", "CYPHER", "FINISH"}
+
+# Keywords that start a clause. Cypher allows any keyword as a variable name,
+# so where an expression is expected other keywords are taken as variables,
+# and these are left to the server (e.g. "WITH 1 AS match RETURN match" is
+# valid, "WHERE RETURN n" is not)
+CLAUSE_KEYWORDS = {
+    "MATCH",
+    "OPTIONAL",
+    "WHERE",
+    "WITH",
+    "RETURN",
+    "UNWIND",
+    "UNION",
+    "ORDER",
+    "SKIP",
+    "LIMIT",
+} | WRITE_CLAUSES
+
+# Functions whose arguments aren't plain expressions (e.g. any(x IN list WHERE ...))
+DEFERRED_FUNCTIONS = {
+    "ALL",
+    "ANY",
+    "NONE",
+    "SINGLE",
+    "REDUCE",
+    "SHORTESTPATH",
+    "ALLSHORTESTPATHS",
+}
+
+_MULTI_CHAR_OPS = ("<=", ">=", "<>", "=~", "+=", "..")
+_SINGLE_CHAR_OPS = set("()[]{},.:;|=<>+-*/%^")
+_COMPARISON_OPS = {"=", "<>", "<", ">", "<=", ">=", "=~"}
+
+
+class CypherSyntaxError(Exception):
+    """Syntax error in a Cypher query, with its 1-based line and column"""
+
+    def __init__(self, message: str, line: int, column: int):
+        super().__init__(f"{message} (line {line}, column {column})")
+        self.message = message
+        self.line = line
+        self.column = column
+
+
+class _Deferred(Exception):
+    """The query uses a construct the local parser doesn't cover"""
+
+
+class Token(NamedTuple):
+    kind: str  # "ident", "quoted", "string", "number", "param", "op" or "eof"
+    value: str
+    line: int
+    column: int
+
+
+def tokenize(query: str) -> List[Token]:
+    """
+    Split a query into tokens
+
+    Raises:
+        CypherSyntaxError: On unterminated strings or comments, or unknown characters
+    """
+    tokens = []
+    i = 0
+    line = 1
+    line_start = 0
+    length = len(query)
+
+    def error(message, offset):
+        raise CypherSyntaxError(message, line, offset - line_start + 1)
+
+    while i < length:
+        char = query[i]
+        column = i - line_start + 1
+
+        if char == "\n":
+            i += 1
+            line += 1
+            line_start = i
+        elif char.isspace():
+            i += 1
+        elif query.startswith("//", i):
+            end = query.find("\n", i)
+            i = length if end == -1 else end
+        elif query.startswith("/*", i):
+            end = query.find("*/", i + 2)
+            if end == -1:
+                error("Unterminated comment", i)
+            for offset in range(i, end):
+                if query[offset] == "\n":
+                    line += 1
+                    line_start = offset + 1
+            i = end + 2
+        elif char.isalpha() or char == "_":
+            start = i
+            while i < length and (query[i].isalnum() or query[i] == "_"):
+                i += 1
+            tokens.append(Token("ident", query[start:i], line, column))
+        elif char == "`":
+            end = i + 1
+            while True:
+                end = query.find("`", end)
+                if end == -1:
+                    error("Unterminated quoted name", i)
+                if query.startswith("``", end):
+                    end += 2
+                    continue
+                break
+            tokens.append(Token("quoted", query[i + 1 : end], line, column))
+            i = end + 1
+        elif char in "'\"":
+            start = i
+            start_line = line
+            i += 1
+            while i < length and query[i] != char:
+                if query[i] == "\\":
+                    i += 1
+                elif query[i] == "\n":
+                    line += 1
+                    line_start = i + 1
+                i += 1
+            if i >= length:
+                raise CypherSyntaxError("Unterminated string", start_line, column)
+            i += 1
+            tokens.append(Token("string", query[start:i], start_line, column))
+        elif char.isdigit() or (
+            char == "." and i + 1 < length and query[i + 1].isdigit()
+        ):
+            start = i
+            while i < length and (query[i].isalnum() or query[i] == "_"):
+                i += 1
+            if i + 1 < length and query[i] == "." and query[i + 1].isdigit():
+                i += 1
+                while i < length and (query[i].isalnum() or query[i] == "_"):
+                    i += 1
+            if i < length and query[i] in "+-" and query[i - 1] in "eE":
+                i += 1
+                while i < length and query[i].isdigit():
+                    i += 1
+            text = query[start:i]
+            if not _is_number(text):
+                error(f"Invalid number '{text}'", start)
+            tokens.append(Token("number", text, line, column))
+        elif char == "$":
+            start = i
+            i += 1
+            while i < length and (query[i].isalnum() or query[i] == "_"):
+                i += 1
+            if i == start + 1:
+                error("Expected a parameter name after '$'", start)
+            tokens.append(Token("param", query[start:i], line, column))
+        elif query[i : i + 2] in _MULTI_CHAR_OPS:
+            tokens.append(Token("op", query[i : i + 2], line, column))
+            i += 2
+        elif char in _SINGLE_CHAR_OPS:
+            tokens.append(Token("op", char, line, column))
+            i += 1
+        elif char in "!&":
+            # Label expressions and the like
+            raise _Deferred()
+        else:
+            error(f"Unexpected character '{char}'", i)
+
+    tokens.append(Token("eof", "", line, length - line_start + 1))
+    return tokens
+
+
+def _is_number(text: str) -> bool:
+    lowered = text.lower()
+    if lowered.startswith("0x"):
+        return all(c in "0123456789abcdef" for c in lowered[2:]) and len(lowered) > 2
+    if lowered.startswith("0o"):
+        return all(c in "01234567" for c in lowered[2:]) and len(lowered) > 2
+    try:
+        float(lowered.replace("_", ""))
+    except ValueError:
+        return False
+    return True
+
+
+class _Parser:
+    """Recursive-descent parser over the supported Cypher subset"""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    # Token helpers
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def advance(self) -> Token:
+        token = self.peek()
+        self.pos = min(self.pos + 1, len(self.tokens) - 1)
+        return token
+
+    def at_op(self, *ops: str, offset: int = 0) -> bool:
+        token = self.peek(offset)
+        return token.kind == "op" and token.value in ops
+
+    def at_keyword(self, *words: str, offset: int = 0) -> bool:
+        token = self.peek(offset)
+        return token.kind == "ident" and token.value.upper() in words
+
+    def accept_op(self, op: str) -> bool:
+        if self.at_op(op):
+            self.advance()
+            return True
+        return False
+
+    def accept_keyword(self, word: str) -> bool:
+        if self.at_keyword(word):
+            self.advance()
+            return True
+        return False
+
+    def error(self, message: str, token: Optional[Token] = None):
+        token = token or self.peek()
+        raise CypherSyntaxError(message, token.line, token.column)
+
+    def unexpected(self, expected: str):
+        token = self.peek()
+        found = "end of query" if token.kind == "eof" else f"'{token.value}'"
+        self.error(f"Unexpected {found}, expected {expected}")
+
+    def expect_op(self, op: str):
+        if not self.accept_op(op):
+            self.unexpected(f"'{op}'")
+
+    def expect_keyword(self, word: str):
+        if not self.accept_keyword(word):
+            self.unexpected(word)
+
+    def expect_name(self, what: str = "a name") -> Token:
+        if self.peek().kind not in ("ident", "quoted"):
+            self.unexpected(what)
+        return self.advance()
+
+    # Clauses
+
+    def query(self):
+        self.single_query()
+        while self.accept_keyword("UNION"):
+            self.accept_keyword("ALL")
+            self.single_query()
+        self.accept_op(";")
+        if self.peek().kind != "eof":
+            self.unexpected("end of query")
+
+    def single_query(self):
+        clauses = []
+        while self.peek().kind != "eof" and not (
+            self.at_op(";") or self.at_keyword("UNION")
+        ):
+            token = self.peek()
+            keyword = token.value.upper() if token.kind == "ident" else None
+            if clauses and clauses[-1][0] == "RETURN":
+                self.error("RETURN must be the last clause of a query", token)
+
+            if keyword in WRITE_CLAUSES:
+                self.error(
+                    f"{keyword} is not allowed, queries can only read the graph", token
+                )
+            if keyword in DEFERRED_CLAUSES:
+                raise _Deferred()
+
+            if keyword == "OPTIONAL":
+                self.advance()
+                if not self.at_keyword("MATCH"):
+                    self.unexpected("MATCH")
+                keyword = "MATCH"
+            if keyword == "MATCH":
+                self.advance()
+                self.match_clause()
+            elif keyword == "WITH":
+                self.advance()
+                self.projection()
+                if self.accept_keyword("WHERE"):
+                    self.expression()
+            elif keyword == "RETURN":
+                self.advance()
+                self.projection()
+            elif keyword == "UNWIND":
+                self.advance()
+                self.expression()
+                self.expect_keyword("AS")
+                self.expect_name("a variable")
+            else:
+                self.unexpected("a clause such as MATCH, WITH or RETURN")
+            clauses.append((keyword, token))
+
+        if not clauses:
+            self.unexpected("a clause such as MATCH or RETURN")
+        if clauses[-1][0] != "RETURN":
+            self.error(
+                f"A query cannot end with {clauses[-1][0]}, add a RETURN clause",
+                self.peek(),
+            )
+
+    def match_clause(self):
+        self.pattern()
+        while self.accept_op(","):
+            self.pattern()
+        if self.at_keyword("USING"):
+            raise _Deferred()
+        if self.accept_keyword("WHERE"):
+            self.expression()
+
+    def projection(self):
+        self.accept_keyword("DISTINCT")
+        first = True
+        while first or self.accept_op(","):
+            if first and self.accept_op("*"):
+                first = False
+                continue
+            first = False
+            self.expression()
+            if self.accept_keyword("AS"):
+                self.expect_name("an alias")
+
+        if self.accept_keyword("ORDER"):
+            self.expect_keyword("BY")
+            while True:
+                self.expression()
+                if self.at_keyword("ASC", "DESC", "ASCENDING", "DESCENDING"):
+                    self.advance()
+                if not self.accept_op(","):
+                    break
+        if self.accept_keyword("SKIP") or self.accept_keyword("OFFSET"):
+            self.expression()
+        if self.accept_keyword("LIMIT"):
+            self.expression()
+
+    # Patterns
+
+    def pattern(self):
+        if self.peek().kind in ("ident", "quoted") and self.at_op("=", offset=1):
+            self.advance()
+            self.advance()
+        if self.at_keyword(*DEFERRED_FUNCTIONS) or self.at_keyword(
+            "SHORTEST", "ALL", "ANY"
+        ):
+            raise _Deferred()
+        self.node_pattern()
+        while self.at_op("-", "<"):
+            self.relationship_pattern()
+            self.node_pattern()
+
+    def node_pattern(self):
+        if not self.at_op("("):
+            self.unexpected("'(' to start a node pattern")
+        self.advance()
+        if self.at_op("("):
+            raise _Deferred()  # Quantified path pattern
+        if self.peek().kind in ("ident", "quoted"):
+            self.advance()
+        self.labels()
+        if self.at_op("{"):
+            self.map_literal()
+        elif self.peek().kind == "param":
+            self.advance()
+        if self.at_keyword("WHERE"):
+            raise _Deferred()
+        if self.at_op("|"):
+            raise _Deferred()
+        self.expect_op(")")
+
+    def labels(self):
+        while self.accept_op(":"):
+            self.label_name("a label")
+            if self.at_op("|"):
+                raise _Deferred()
+
+    def label_name(self, what: str):
+        """A label or relationship type, or the % wildcard"""
+        if not self.accept_op("%"):
+            self.expect_name(what)
+
+    def relationship_pattern(self):
+        self.accept_op("<")
+        self.expect_op("-")
+        if self.accept_op("["):
+            if self.peek().kind in ("ident", "quoted"):
+                self.advance()
+            if self.accept_op(":"):
+                self.label_name("a relationship type")
+                while self.accept_op("|"):
+                    self.accept_op(":")
+                    self.label_name("a relationship type")
+            if self.accept_op("*"):
+                if self.peek().kind == "number":
+                    self.advance()
+                if self.accept_op(".."):
+                    if self.peek().kind == "number":
+                        self.advance()
+            if self.at_op("{"):
+                self.map_literal()
+            elif self.peek().kind == "param":
+                self.advance()
+            if self.at_keyword("WHERE"):
+                raise _Deferred()
+            self.expect_op("]")
+        self.expect_op("-")
+        if self.at_op("{", "+") or (self.at_op("*") and not self.at_op("(", offset=1)):
+            raise _Deferred()  # Quantified relationship
+        self.accept_op(">")
+
+    # Expressions, from the loosest binding operator to the tightest
+
+    def expression(self):
+        self.xor_expression()
+        while self.accept_keyword("OR"):
+            self.xor_expression()
+
+    def xor_expression(self):
+        self.and_expression()
+        while self.accept_keyword("XOR"):
+            self.and_expression()
+
+    def and_expression(self):
+        self.not_expression()
+        while self.accept_keyword("AND"):
+            self.not_expression()
+
+    def not_expression(self):
+        if self.accept_keyword("NOT"):
+            self.not_expression()
+        else:
+            self.comparison()
+
+    def comparison(self):
+        self.additive()
+        while True:
+            if self.at_op(*_COMPARISON_OPS):
+                self.advance()
+                self.additive()
+            elif self.accept_keyword("IS"):
+                self.accept_keyword("NOT")
+                if not self.accept_keyword("NULL"):
+                    raise _Deferred()  # Type predicates, IS NORMALIZED, ...
+            elif self.accept_keyword("IN") or self.accept_keyword("CONTAINS"):
+                self.additive()
+            elif self.at_keyword("STARTS", "ENDS"):
+                self.advance()
+                self.expect_keyword("WITH")
+                self.additive()
+            else:
+                return
+
+    def additive(self):
+        self.multiplicative()
+        while self.at_op("+", "-"):
+            self.advance()
+            self.multiplicative()
+
+    def multiplicative(self):
+        self.power()
+        while self.at_op("*", "/", "%"):
+            self.advance()
+            self.power()
+
+    def power(self):
+        self.unary()
+        while self.accept_op("^"):
+            self.unary()
+
+    def unary(self):
+        if self.at_op("+", "-"):
+            self.advance()
+            self.unary()
+        else:
+            self.postfix()
+
+    def postfix(self):
+        self.atom()
+        while True:
+            if self.accept_op("."):
+                self.expect_name("a property name")
+            elif self.accept_op("["):
+                if not self.at_op(".."):
+                    self.expression()
+                if self.accept_op(".."):
+                    if not self.at_op("]"):
+                        self.expression()
+                self.expect_op("]")
+            elif self.at_op(":"):
+                self.labels()
+            elif self.at_op("{"):
+                raise _Deferred()  # Map projection
+            else:
+                return
+
+    def atom(self):
+        token = self.peek()
+        if token.kind in ("number", "string", "param"):
+            self.advance()
+        elif self.at_op("("):
+            self.parenthesized()
+        elif self.at_op("["):
+            self.list_literal()
+        elif self.at_op("{"):
+            self.map_literal()
+        elif token.kind == "quoted":
+            self.advance()
+        elif token.kind == "ident":
+            keyword = token.value.upper()
+            if keyword == "CASE":
+                self.case_expression()
+            elif keyword in ("EXISTS", "COUNT", "COLLECT") and self.at_op(
+                "{", offset=1
+            ):
+                raise _Deferred()  # Subquery expression
+            elif self._at_function_call():
+                self.function_call()
+            elif keyword in CLAUSE_KEYWORDS:
+                raise _Deferred()  # A variable, or a missing expression
+            else:
+                self.advance()
+        else:
+            self.unexpected("an expression")
+
+    def parenthesized(self):
+        self.advance()
+        start = self.pos
+        try:
+            self.expression()
+            self.expect_op(")")
+        except CypherSyntaxError:
+            # Possibly a pattern predicate such as (s)-[:WAS_AT]->(l)
+            raise _Deferred()
+        if self.at_op("-") and self.at_op("-", "[", ">", offset=1):
+            raise _Deferred()
+        if self.at_op("<") and self.at_op("-", offset=1):
+            raise _Deferred()
+        if self.pos == start + 1:
+            self.error("Empty parentheses", self.peek(-1))
+
+    def list_literal(self):
+        self.advance()
+        if self.accept_op("]"):
+            return
+        self.expression()
+        if self.at_keyword("WHERE") or self.at_op("|"):
+            raise _Deferred()  # List comprehension
+        while self.accept_op(","):
+            self.expression()
+        self.expect_op("]")
+
+    def map_literal(self):
+        self.expect_op("{")
+        if self.accept_op("}"):
+            return
+        while True:
+            self.expect_name("a map key")
+            self.expect_op(":")
+            self.expression()
+            if not self.accept_op(","):
+                break
+        self.expect_op("}")
+
+    def case_expression(self):
+        self.advance()
+        if not self.at_keyword("WHEN"):
+            self.expression()
+        if not self.at_keyword("WHEN"):
+            self.unexpected("WHEN")
+        while self.accept_keyword("WHEN"):
+            self.expression()
+            self.expect_keyword("THEN")
+            self.expression()
+        if self.accept_keyword("ELSE"):
+            self.expression()
+        self.expect_keyword("END")
+
+    def _at_function_call(self) -> bool:
+        """Whether a (possibly namespaced) function name and '(' follow"""
+        offset = 0
+        while True:
+            if self.peek(offset).kind not in ("ident", "quoted"):
+                return False
+            if self.at_op("(", offset=offset + 1):
+                return True
+            if not self.at_op(".", offset=offset + 1):
+                return False
+            offset += 2
+
+    def function_call(self):
+        name = self.advance().value
+        while self.accept_op("."):
+            name += "." + self.advance().value
+        if name.upper() in DEFERRED_FUNCTIONS:
+            raise _Deferred()
+        self.expect_op("(")
+        if self.accept_op(")"):
+            return
+        if self.accept_op("*"):
+            self.expect_op(")")
+            return
+        self.accept_keyword("DISTINCT")
+        self.expression()
+        while self.accept_op(","):
+            self.expression()
+        self.expect_op(")")
+
+
+def check_query(query: str) -> bool:
+    """
+    Check a player's query before it is sent to the server
+
+    Args:
+        query: Cypher query string
+
+    Returns:
+        True if the query was fully checked locally, False if it uses constructs
+        outside the supported subset and is left to the server
+
+    Raises:
+        CypherSyntaxError: On syntax errors and clauses that write to the graph
+    """
+    try:
+        _Parser(tokenize(query)).query()
+    except _Deferred:
+        return False
+    return True
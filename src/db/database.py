@@ -4,18 +4,62 @@ Neo4j database connection and query execution module for CypherDetective
 
 from src.enums.game_states import GamePlayState
 from src.save_handler.save_system import complete_level
+from src.db.cypher_parser import check_query
+from src.db.cost_gate import QueryCostError, QueryCostGate
+from src.db.fingerprints import (
+    FingerprintBuilder,
+    fingerprint_rows,
+    fingerprints_file,
+    load_fingerprints,
+)
+from src.db.replay import RecordingDriver
+from src.db.schema import version_key
+from src.db.queries import (
+    DATASET_VERSION_QUERY,
+)
+from src.perf import metrics
 
-from neo4j import GraphDatabase
-from typing import TYPE_CHECKING
+import time
+from neo4j import GraphDatabase, Query, READ_ACCESS
+from neo4j.graph import Node, Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 if TYPE_CHECKING:
     from src.states.gameplay import GameplayState
 
 
+def _node_element_ids(value: Any) -> List[str]:
+    """Get the element ids of the nodes in a result value"""
+    if isinstance(value, Node):
+        return [value.element_id]
+    if isinstance(value, Path):
+        return [node.element_id for node in value.nodes]
+    if isinstance(value, list):
+        return [element_id for item in value for element_id in _node_element_ids(item)]
+    return []
+
+
 class DatabaseConnection:
-    """Manages connection to Neo4j database"""
+    """
+    Manages connection to Neo4j database
 
-    def __init__(self, uri=None, user=None, password=None):
+    One driver (and its connection pool) is shared by all cases. Sessions are
+    routed to the database of the active case (see use_case), and the dataset
+    version, fingerprints and ground truth caches are kept per case, so
+    switching between cases neither reconnects nor rebuilds them.
+    """
+
+    def __init__(
+        self,
+        uri=None,
+        user=None,
+        password=None,
+        driver=None,
+        cost_gate=None,
+        record_path=None,
+        case=None,
+        database=None,
+    ):
         """
         Initialize database connection
 
@@ -23,27 +67,140 @@ class DatabaseConnection:
             uri: Neo4j URI (defaults to Aura connection)
             user: Database username (defaults to 'detective')
             password: Database password (defaults to 'detective073')
+            driver: Optional pre-built driver (e.g. InMemoryDriver) to use instead
+            cost_gate: Optional QueryCostGate that player queries must pass
+            record_path: Optional file to record all query results to (see
+                src.db.replay), written when the connection is closed
+            case: Case queries are initially scoped to (see use_case)
+            database: Database of that case (defaults to the server default)
         """
         # Get db values from environment variables or use defaults
-        self.uri = "neo4j+s://2de166ea.databases.neo4j.io"
-        self.user = "detective"
-        self.password = "detective073"
+        self.uri = uri or "neo4j+s://2de166ea.databases.neo4j.io"
+        self.user = user or "detective"
+        self.password = password or "detective073"
+
+        self.driver = driver
+        self._owns_driver = driver is None
+        self.record_path = record_path
+        self.cost_gate: Optional[QueryCostGate] = cost_gate
 
-        self.driver = None
+        # Active case and the database its queries are routed to
+        self.case: Optional[str] = case
+        self.database: Optional[str] = database
+        # Version of the data in the database; caches key on it (None if unknown)
+        self.dataset_version: Optional[str] = None
+        self.fingerprints = None
+        self._ground_truth_cache = {}  # Ground truth fingerprints by level
+        self._case_state = {}  # Case -> (database, version, fingerprints, cache)
         self.connect()
 
     def connect(self):
         """Establish connection to Neo4j database"""
         try:
-            self.driver = GraphDatabase.driver(
-                self.uri, auth=(self.user, self.password)
-            )
+            if self.driver is None:
+                self.driver = GraphDatabase.driver(
+                    self.uri, auth=(self.user, self.password)
+                )
+                if self.record_path:
+                    self.driver = RecordingDriver(self.driver, self.record_path)
             # Verify connection
             self.driver.verify_connectivity()
-            print(f"Connected to Neo4j database as {self.user}")
+            if self._owns_driver:
+                print(f"Connected to Neo4j database as {self.user}")
+            else:
+                # Injected backends (replay, in-memory) aren't a live connection
+                print(f"Using the {type(self.driver).__name__} backend")
         except Exception as e:
             print(f"Error connecting to Neo4j: {e}")
             raise
+        self.refresh_dataset_version()
+
+    def reconnect(self):
+        """Reconnect to the database and re-read the dataset version"""
+        if self._owns_driver and self.driver:
+            self.driver.close()
+            self.driver = None
+        self.connect()
+
+    def use_case(self, case: Optional[str], database: Optional[str] = None):
+        """
+        Scope queries to a case, reusing the driver and the case's caches
+
+        Args:
+            case: Case name (see src.levels), None for no particular case
+            database: Database the case is loaded into (None for the server
+                default). Each case needs a database of its own, since graph
+                queries and the dataset version stamp cover a whole database
+        """
+        if case == self.case and database == self.database:
+            return
+
+        self._case_state[self.case] = (
+            self.database,
+            self.dataset_version,
+            self.fingerprints,
+            self._ground_truth_cache,
+        )
+        self.case = case
+        self.database = database
+        saved = self._case_state.pop(case, None)
+        if saved is not None and saved[0] == database:
+            _, self.dataset_version, self.fingerprints, self._ground_truth_cache = saved
+        else:
+            self.dataset_version = None
+            self.fingerprints = None
+            self._ground_truth_cache = {}
+        self.refresh_dataset_version()
+
+    def query_scope(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the database and dataset version queries currently run against
+
+        Background queries take it when they are submitted, so a case switch
+        while they run doesn't change where they go (see QueryPreview).
+        """
+        return self.database, self.dataset_version
+
+    def _session(self, scope=None, **kwargs):
+        """Open a session on the database of a query scope (default: active case)"""
+        database = self.database if scope is None else scope[0]
+        if database is not None:
+            kwargs["database"] = database
+        return self.driver.session(**kwargs)
+
+    def refresh_dataset_version(self) -> Optional[str]:
+        """
+        Read the dataset version and drop caches built from other data
+
+        The version is the checksum stamped by the loader. Databases without
+        a stamp have no version, so nothing read from them is cached (their
+        data can change without any way to tell).
+
+        Returns:
+            The dataset version, or None if the database isn't stamped or the
+            version can't be read
+        """
+        try:
+            stamp = self.execute_query(DATASET_VERSION_QUERY)
+            version = None
+            if stamp and stamp[0].get("checksum"):
+                version = version_key(stamp[0])
+                if self.database is not None:
+                    version = f"{self.database}/{version}"
+        except Exception as e:
+            print(f"Error reading the dataset version: {e}")
+            version = None
+
+        if version != self.dataset_version or version is None:
+            self.dataset_version = version
+            self._ground_truth_cache.clear()
+            # Precomputed ground truth fingerprints (None if missing or stale)
+            self.fingerprints = (
+                load_fingerprints(version, fingerprints_file(self.case))
+                if version
+                else None
+            )
+        return version
 
     def close(self):
         """Close database connection"""
@@ -64,13 +221,187 @@ class DatabaseConnection:
         if not self.driver:
             raise Exception("Database not connected")
 
+        start = time.perf_counter()
         try:
-            with self.driver.session() as session:
+            with self._session() as session:
                 result = session.run(query, parameters or {})
                 records = [record.data() for record in result]
                 return records
         except Exception as e:
             raise Exception(f"Query execution error: {str(e)}")
+        finally:
+            metrics.observe("db.query", (time.perf_counter() - start) * 1000.0)
+
+    def fingerprint_query(self, query, parameters=None):
+        """
+        Execute a read-only Cypher query and fingerprint its result
+
+        Rows are hashed as they are streamed, so only a digest per row is kept
+        instead of the rows themselves.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+
+        Returns:
+            Fingerprint dictionary (see src.db.fingerprints)
+        """
+        if not self.driver:
+            raise Exception("Database not connected")
+
+        start = time.perf_counter()
+        try:
+            with self._session() as session:
+                result = session.run(query, parameters or {})
+                builder = FingerprintBuilder()
+                for record in result:
+                    builder.add(record.data())
+                return builder.result()
+        except Exception as e:
+            raise Exception(f"Query execution error: {str(e)}")
+        finally:
+            metrics.observe("db.query", (time.perf_counter() - start) * 1000.0)
+
+    def execute_result_query(
+        self, query, parameters=None
+    ) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """
+        Execute a read-only Cypher query, keeping track of the returned nodes
+
+        Args:
+            query: Cypher query string
+            parameters: Optional query parameters
+
+        Returns:
+            Tuple of (records as dictionaries, element ids of the nodes, paths
+            and node lists in the result)
+        """
+        if not self.driver:
+            raise Exception("Database not connected")
+
+        start = time.perf_counter()
+        try:
+            with self._session() as session:
+                result = session.run(query, parameters or {})
+                records = []
+                element_ids = set()
+                for record in result:
+                    records.append(record.data())
+                    for value in record.values():
+                        element_ids.update(_node_element_ids(value))
+                return records, element_ids
+        except Exception as e:
+            raise Exception(f"Query execution error: {str(e)}")
+        finally:
+            metrics.observe("db.query", (time.perf_counter() - start) * 1000.0)
+
+    def check_query_cost(self, query, scope=None):
+        """
+        Reject a query whose EXPLAIN plan exceeds the cost gate's budget
+
+        Does nothing without a cost gate. Plans are only fetched for queries
+        without a cached verdict.
+
+        Args:
+            query: Cypher query string
+            scope: Database and dataset version to check against (see
+                query_scope), defaults to the active case's
+
+        Raises:
+            QueryCostError: If the query is over budget
+        """
+        if self.cost_gate is None:
+            return
+
+        if scope is None:
+            scope = self.query_scope()
+            self.cost_gate.set_dataset_version(scope[1])
+        found, reason = self.cost_gate.cached_verdict(query, scope[1])
+        if not found:
+            if not self.driver:
+                raise Exception("Database not connected")
+            start = time.perf_counter()
+            try:
+                with self._session(scope, default_access_mode=READ_ACCESS) as session:
+                    summary = session.run("EXPLAIN " + query).consume()
+                reason = self.cost_gate.analyze(summary.plan)
+            except Exception as e:
+                raise Exception(f"Query execution error: {str(e)}")
+            finally:
+                metrics.observe("db.explain", (time.perf_counter() - start) * 1000.0)
+            self.cost_gate.store_verdict(query, reason, scope[1])
+
+        if reason:
+            raise QueryCostError(f"Query rejected because {reason}.")
+
+    def execute_preview_query(
+        self, query, cancelled=None, timeout=2.0, max_rows=50, scope=None
+    ) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Execute a read-only Cypher query for a live preview, within strict budgets
+
+        The query runs in a read session with a server-side transaction timeout,
+        and only the first max_rows records are fetched; the rest of the result
+        is discarded. Fetching stops as soon as cancelled is set.
+
+        Args:
+            query: Cypher query string
+            cancelled: Optional threading.Event that cancels the query when set
+            timeout: Transaction timeout in seconds
+            max_rows: Maximum number of records to fetch
+            scope: Database and dataset version to run against (see
+                query_scope), defaults to the active case's
+
+        Returns:
+            Tuple of (records as dictionaries, whether the result has more
+            records), or None if cancelled
+        """
+        if not self.driver:
+            raise Exception("Database not connected")
+
+        # Typos are common while typing, don't send them to the server
+        check_query(query)
+        scope = self.query_scope() if scope is None else scope
+        self.check_query_cost(query, scope)
+
+        start = time.perf_counter()
+        try:
+            with self._session(
+                scope, default_access_mode=READ_ACCESS, fetch_size=max_rows + 1
+            ) as session:
+                result = session.run(Query(query, timeout=timeout))
+                records = []
+                for record in result:
+                    if cancelled is not None and cancelled.is_set():
+                        return None
+                    if len(records) == max_rows:
+                        return records, True
+                    if time.perf_counter() - start > timeout:
+                        raise Exception(f"timed out after {timeout:g} s")
+                    records.append(record.data())
+                return records, False
+        except Exception as e:
+            raise Exception(f"Query execution error: {str(e)}")
+        finally:
+            metrics.observe("db.preview", (time.perf_counter() - start) * 1000.0)
+
+    def _matches_ground_truth(self, user_results, current_level):
+        """Check the player's query result against the level's ground truth"""
+        user_fingerprint = fingerprint_rows(user_results)
+        level_key = str(current_level.level_num)
+        if self.fingerprints and level_key in self.fingerprints:
+            # Fast path: compare against the precomputed fingerprint
+            return user_fingerprint == self.fingerprints[level_key]
+
+        ground_truth_fingerprint = self._ground_truth_cache.get(level_key)
+        if ground_truth_fingerprint is None:
+            ground_truth_fingerprint = self.fingerprint_query(
+                current_level.ground_truth_query
+            )
+            # Only reuse results of data with a known version
+            if self.dataset_version is not None:
+                self._ground_truth_cache[level_key] = ground_truth_fingerprint
+        return user_fingerprint == ground_truth_fingerprint
 
     def execute_user_query(self, state: "GameplayState"):
         """
@@ -89,23 +420,33 @@ class DatabaseConnection:
             return
 
         try:
-            # Execute query
-            if current_level.level_num == 9:
-                if current_query == "37ff4d2021":
+            # Grade against the level's case
+            self.use_case(current_level.case, current_level.database)
+
+            # Levels without a ground truth aren't graded; a secret reveals
+            # their hidden result
+            if not current_level.ground_truth_query:
+                if current_level.secret and current_query == current_level.secret:
                     state.sub_state = GamePlayState.HIDDEN_RESULT
+                elif not current_level.secret:
+                    state.error_message = "This level has no answer to check."
+                    state.sub_state = GamePlayState.QUERY_RESULT
                 return
-            user_results = self.execute_query(current_query)
-            ground_truth_results = self.execute_query(current_level.ground_truth_query)
-
-            # print(f"User results: {user_results}")
-            # print(f"Ground truth results: {ground_truth_results}")
-            user_results_sorted = sorted(user_results, key=lambda d: sorted(d.items()))
-            ground_truth_results_sorted = sorted(
-                ground_truth_results, key=lambda d: sorted(d.items())
-            )
 
-            # Validate results using level validator
-            if user_results_sorted == ground_truth_results_sorted:
+            # Reject syntax errors and write clauses without a round trip, then
+            # queries that are too expensive to run
+            check_query(current_query)
+            self.check_query_cost(current_query)
+
+            user_results, element_ids = self.execute_result_query(current_query)
+            state.query_result = user_results
+
+            # Show the returned nodes in the graph
+            if state.graph_visualization:
+                state.graph_visualization.highlight_result(user_results, element_ids)
+
+            # Validate results against the level's ground truth
+            if self._matches_ground_truth(user_results, current_level):
                 complete_level(current_level.level_num)
                 state.success_message = f"Level {current_level.level_num} completed."
                 state.sub_state = GamePlayState.QUERY_RESULT
@@ -115,6 +456,8 @@ class DatabaseConnection:
 
         except Exception as e:
             state.query_result = None
+            if state.graph_visualization:
+                state.graph_visualization.highlight_nodes(set())
             state.error_message = f"Query error: {str(e)}"
             state.sub_state = GamePlayState.QUERY_RESULT
             return
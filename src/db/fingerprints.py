@@ -0,0 +1,178 @@
+"""
+Precomputed answer fingerprints for CypherDetective levels
+
+A fingerprint is a compact, order-independent summary of a query result: the
+number of rows plus a hash over the sorted per-row hashes. Fingerprints for
+every level's ground truth are built once against a dataset and stored with its
+dataset version (see DatabaseConnection.dataset_version), so grading a player's
+query only needs the player's own result. Each case has its own file.
+
+Rows match when they are equal as Python values: numbers are canonicalized
+first, so 30 and 30.0 (or True and 1) hash alike. Values JSON can't represent
+(e.g. Neo4j dates) are compared by their string form.
+
+Build (or rebuild after changing the dataset) with:
+
+    python -m src.db.fingerprints [--case john_doe]
+"""
+
+import os
+import json
+import hashlib
+import argparse
+from typing import Any, Dict, Iterable, Optional
+
+FINGERPRINTS_FILE = os.path.join("src", "db", "create", "fingerprints.json")
+
+
+def fingerprints_file(case: Optional[str] = None) -> str:
+    """Get the fingerprints file of a case (FINGERPRINTS_FILE without a case)"""
+    if case is None:
+        return FINGERPRINTS_FILE
+    return os.path.join("src", "db", "create", f"fingerprints_{case}.json")
+
+
+def _canonical(value: Any) -> Any:
+    """Turn numbers that compare equal (1, 1.0, True) into the same value"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def _row_digest(row: Dict[str, Any]) -> bytes:
+    """Hash a single result row in a canonical (key-sorted) form"""
+    canonical = json.dumps(
+        _canonical(row), sort_keys=True, default=str, separators=(",", ":")
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).digest()
+
+
+class FingerprintBuilder:
+    """Incrementally fingerprints rows as they are streamed from a result"""
+
+    def __init__(self):
+        self.digests = []
+
+    def add(self, row: Dict[str, Any]):
+        """Add a result row to the fingerprint"""
+        self.digests.append(_row_digest(row))
+
+    def result(self) -> Dict[str, Any]:
+        """Get the fingerprint of all rows added so far"""
+        row_hash = hashlib.sha256(b"".join(sorted(self.digests))).hexdigest()
+        return {"row_count": len(self.digests), "row_hash": row_hash}
+
+
+def fingerprint_rows(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fingerprint a query result
+
+    Args:
+        rows: Result rows as dictionaries
+
+    Returns:
+        Dictionary with the row count and the sorted row hash
+    """
+    builder = FingerprintBuilder()
+    for row in rows:
+        builder.add(row)
+    return builder.result()
+
+
+def load_fingerprints(
+    dataset_version: str, path: str = FINGERPRINTS_FILE
+) -> Optional[Dict[str, Any]]:
+    """
+    Load stored level fingerprints
+
+    Args:
+        dataset_version: Version of the dataset the levels are graded against
+        path: Fingerprints file
+
+    Returns:
+        Dictionary mapping level numbers (as strings) to fingerprints, or None if
+        the file is missing or was built from a different dataset
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Error loading answer fingerprints: {e}")
+        return None
+
+    if data.get("dataset_version") != dataset_version:
+        print(
+            "Answer fingerprints are stale, rebuild them with 'python -m src.db.fingerprints'"
+        )
+        return None
+    return data.get("levels", {})
+
+
+def build_fingerprints(db, path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Execute every level's ground truth query once and store its fingerprint
+
+    Args:
+        db: DatabaseConnection to the dataset the levels are graded against;
+            only the levels of its active case are built
+        path: Output file (defaults to the case's fingerprints file)
+
+    Returns:
+        Dictionary mapping level numbers (as strings) to fingerprints
+    """
+    from src.levels import get_ground_truth_queries
+
+    if db.dataset_version is None:
+        raise Exception(
+            "The database has no dataset version stamp; stamp it with "
+            "python -m src.db.schema before building fingerprints"
+        )
+
+    levels = {}
+    for level_num, query in get_ground_truth_queries(db.case).items():
+        levels[str(level_num)] = db.fingerprint_query(query)
+
+    data = {"dataset_version": db.dataset_version, "levels": levels}
+    with open(path or fingerprints_file(db.case), "w") as f:
+        json.dump(data, f, indent=2)
+    return levels
+
+
+def main():
+    """Build the answer fingerprints of every case (or one) for the current data"""
+    from src.db.database import DatabaseConnection
+    from src.levels import get_pack, get_packs
+
+    parser = argparse.ArgumentParser(description="Build level answer fingerprints")
+    parser.add_argument("--case", help="Only build the levels of this case")
+    args = parser.parse_args()
+
+    packs = get_packs()
+    if args.case:
+        if get_pack(args.case) is None:
+            parser.error(f"Unknown case: {args.case}")
+        packs = [get_pack(args.case)]
+
+    db = DatabaseConnection()
+    try:
+        for pack in packs:
+            db.use_case(pack.case, pack.database)
+            levels = build_fingerprints(db)
+            print(
+                f"Wrote {len(levels)} level fingerprints to {fingerprints_file(pack.case)}"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Procedural case generator for load and scale testing
+
+Generates seeded cases that follow the John Doe schema (Victim, Location,
+Suspect, Bank; WAS_AT, WORKS_AT, CLOSE_FRIEND_OF, DEPOSITED_IN) including the
+per-level visibility masks, plus the matching ground truth answer of every level.
+Cases are written in the loader format (see src.db.loader) or served directly
+by the in-memory backend.
+
+    python -m src.db.generator --suspects 10000 --output case.json \\
+        --answers answers.json
+"""
+
+import json
+import random
+import argparse
+import itertools
+from src.db.values import row_properties
+from src.db.visibility import VISIBILITY_PROPERTY, compact_properties
+from src.db.schema import JOHN_DOE_INDEXES
+from typing import Any, Dict, List
+
+CRIME_SCENE = "Grandview Hotel"
+VICTIM = "John Doe"
+CULPRIT_TOTAL = 475500  # Level 8: total deposits of the culprit
+NUM_VISIBILITY_LEVELS = 9  # graph_0 .. graph_8
+
+FIRST_NAMES = [
+    "Alice", "Ben", "Chloe", "David", "Ella", "Frank", "Grace", "Harry", "Isla",
+    "Jack", "Kara", "Liam", "Maya", "Noah", "Olive", "Paul", "Quinn", "Ruby",
+    "Sam", "Tara", "Umar", "Vera", "Will", "Xena", "Yusuf", "Zoe",
+]  # fmt: skip
+LAST_NAMES = [
+    "Brown", "Carter", "Diaz", "Evans", "Fisher", "Green", "Hill", "Irving",
+    "Jones", "Knight", "Lopez", "Moore", "Nash", "Owens", "Price", "Quill",
+    "Reed", "Stone", "Turner", "Underwood", "Vance", "White", "Xu", "Young",
+    "Zimmer",
+]  # fmt: skip
+HAIR_COLORS = ["blonde", "brown", "red", "black", "gray"]
+BLOOD_TYPES = ["O+", "O-", "A+", "A-", "B+", "B-", "AB+", "AB-"]
+LOCATION_TYPES = ["residential", "outdoors", "office", "restaurant", "store"]
+BANK_WORDS = ["National", "City", "Metro", "Union", "Trust", "Savings", "River"]
+
+
+def _unique_names(rng: random.Random, count: int) -> List[str]:
+    """Generate count unique person names"""
+    combos = [f"{f} {l}" for f, l in itertools.product(FIRST_NAMES, LAST_NAMES)]
+    rng.shuffle(combos)
+    return [
+        combos[i] if i < len(combos) else f"{combos[i % len(combos)]} {i}"
+        for i in range(count)
+    ]
+
+
+def _level_filters(suspect: Dict[str, Any]) -> List[bool]:
+    """Whether a suspect passes the clue of levels 1..8, in order"""
+    props = suspect["properties"]
+    return [
+        not props["verified_alibi"],
+        suspect["was_at"] == CRIME_SCENE,
+        suspect["works_at_scene"],
+        props["access_level"] >= 2,
+        props["hair"] == "brown" and props["height"] >= 6.0,
+        props["blood_type"] == "O+",
+        suspect["close_friend"],
+        suspect["total_deposits"] == CULPRIT_TOTAL,
+    ]
+
+
+def generate_case(
+    suspects: int = 10,
+    locations: int = 3,
+    banks: int = 3,
+    seed: int = 73,
+    friend_ratio: float = 0.3,
+) -> Dict[str, Any]:
+    """
+    Generate a case in the loader format
+
+    Exactly one suspect (the culprit) matches every clue. Bit n of each suspect's
+    visibility mask is set for as long as it survives the clues of levels 1..n,
+    like in the hand-written dataset.
+
+    Args:
+        suspects: Number of suspects (at least 1)
+        locations: Number of locations (at least 1, the first is the crime scene)
+        banks: Number of banks (at least 1)
+        seed: Random seed
+        friend_ratio: Fraction of suspects who are close friends of the victim
+
+    Returns:
+        Case dictionary with "nodes", "relationships" and "answers" (ground truth
+        rows keyed by level number)
+    """
+    rng = random.Random(seed)
+    nodes = [{"id": "victim", "labels": ["Victim"], "properties": {"name": VICTIM}}]
+    relationships = []
+
+    location_names = [CRIME_SCENE] + [
+        f"{rng.choice(['North', 'South', 'East', 'West', 'Old', 'New'])} "
+        f"{rng.choice(['Street', 'Park', 'Tower', 'Market', 'Pier'])} {i}"
+        for i in range(1, locations)
+    ]
+    for i, name in enumerate(location_names):
+        location_type = "hotel" if i == 0 else rng.choice(LOCATION_TYPES)
+        nodes.append(
+            {
+                "id": f"loc{i}",
+                "labels": ["Location"],
+                "properties": {"name": name, "type": location_type},
+            }
+        )
+
+    bank_ids = [f"b{i}" for i in range(banks)]
+    for i, bank_id in enumerate(bank_ids):
+        nodes.append(
+            {
+                "id": bank_id,
+                "labels": ["Bank"],
+                "properties": {
+                    "name": f"{rng.choice(BANK_WORDS)} Bank {i}",
+                    VISIBILITY_PROPERTY: 1 << 7,
+                },
+            }
+        )
+
+    culprit = rng.randrange(suspects)
+    generated = []
+    for i, name in enumerate(_unique_names(rng, suspects)):
+        is_culprit = i == culprit
+        access_level = rng.choice([2, 3]) if is_culprit else rng.randint(0, 3)
+        properties = {
+            "name": name,
+            "verified_alibi": False if is_culprit else rng.random() < 0.2,
+            "hair": "brown" if is_culprit else rng.choice(HAIR_COLORS),
+            "height": (
+                round(rng.uniform(6.0, 6.5), 1)
+                if is_culprit
+                else round(rng.uniform(5.0, 6.6), 1)
+            ),
+            "blood_type": "O+" if is_culprit else rng.choice(BLOOD_TYPES),
+            "access_level": access_level,
+        }
+        was_at = (
+            CRIME_SCENE
+            if is_culprit or rng.random() < 0.5
+            else rng.choice(location_names)
+        )
+        works_at_scene = access_level > 0
+        close_friend = is_culprit or rng.random() < friend_ratio
+
+        # Deposits: the culprit's sum to exactly CULPRIT_TOTAL, nobody else's do
+        if is_culprit:
+            first = rng.randint(1, CULPRIT_TOTAL // 2)
+            amounts = [first, CULPRIT_TOTAL - first]
+        else:
+            amounts = [rng.randint(100, 200000) for _ in range(rng.randint(0, 3))]
+            if sum(amounts) == CULPRIT_TOTAL:
+                amounts[0] += 1
+        deposits = [
+            (rng.choice(bank_ids), amount, f"2025-10-{day:02d}")
+            for amount, day in zip(amounts, rng.sample(range(1, 32), len(amounts)))
+        ]
+
+        generated.append(
+            {
+                "id": f"s{i}",
+                "properties": properties,
+                "was_at": was_at,
+                "works_at_scene": works_at_scene,
+                "close_friend": close_friend,
+                "deposits": deposits,
+                "total_deposits": sum(amounts),
+            }
+        )
+
+    location_ids = {name: f"loc{i}" for i, name in enumerate(location_names)}
+    answers = {str(level): [] for level in range(NUM_VISIBILITY_LEVELS)}
+    for suspect in generated:
+        properties = suspect["properties"]
+        filters = _level_filters(suspect)
+
+        # Graph 0 always, graph n while the suspect passes the clues of levels 1..n
+        mask = 1
+        for level in range(1, NUM_VISIBILITY_LEVELS):
+            if not filters[level - 1]:
+                break
+            mask |= 1 << level
+        properties[VISIBILITY_PROPERTY] = mask
+
+        answers["0"].append({"suspect": properties["name"]})
+        for level, passed in enumerate(filters, start=1):
+            if passed:
+                answers[str(level)].append({"suspect": properties["name"]})
+
+        nodes.append(
+            {"id": suspect["id"], "labels": ["Suspect"], "properties": properties}
+        )
+        relationships.append(
+            {
+                "type": "WAS_AT",
+                "source": suspect["id"],
+                "target": location_ids[suspect["was_at"]],
+            }
+        )
+        if suspect["works_at_scene"]:
+            relationships.append(
+                {"type": "WORKS_AT", "source": suspect["id"], "target": "loc0"}
+            )
+        if suspect["close_friend"]:
+            relationships.append(
+                {"type": "CLOSE_FRIEND_OF", "source": suspect["id"], "target": "victim"}
+            )
+        for bank_id, amount, date in suspect["deposits"]:
+            relationships.append(
+                {
+                    "type": "DEPOSITED_IN",
+                    "source": suspect["id"],
+                    "target": bank_id,
+                    "properties": {"amount": amount, "date": {"$date": date}},
+                }
+            )
+
+    return {
+        "case": f"generated_{seed}",
+        "relationship_keys": {"DEPOSITED_IN": ["date", "amount"]},
+        "indexes": JOHN_DOE_INDEXES,
+        "nodes": nodes,
+        "relationships": relationships,
+        "answers": answers,
+    }
+
+
+def case_rows(case: Dict[str, Any]):
+    """
+    Convert a case to the row format of the visualization queries
+
+    Properties are converted as the loader writes them (typed values, legacy
+    visibility flags), with typed values shown as strings like in query rows.
+
+    Returns:
+        Tuple of (node rows, relationship rows)
+    """
+    nodes = [
+        {
+            "labels": node["labels"],
+            "props": compact_properties(row_properties(node.get("properties", {}))),
+            "id": node["id"],
+        }
+        for node in case["nodes"]
+    ]
+    relationships = [
+        {
+            "source": rel["source"],
+            "relationship": rel["type"],
+            "target": rel["target"],
+            "props": row_properties(rel.get("properties", {})),
+        }
+        for rel in case["relationships"]
+    ]
+    return nodes, relationships
+
+
+def main():
+    """Generate a case file"""
+    parser = argparse.ArgumentParser(description="Generate a CypherDetective case")
+    parser.add_argument("--suspects", type=int, default=10)
+    parser.add_argument("--locations", type=int, default=3)
+    parser.add_argument("--banks", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=73)
+    parser.add_argument("--output", required=True, help="Case JSON file")
+    parser.add_argument("--answers", help="Separate ground truth answers JSON file")
+    args = parser.parse_args()
+
+    case = generate_case(args.suspects, args.locations, args.banks, args.seed)
+    if args.answers:
+        with open(args.answers, "w") as f:
+            json.dump(case.pop("answers"), f)
+    with open(args.output, "w") as f:
+        json.dump(case, f)
+    print(
+        f"Generated case '{case['case']}': {len(case['nodes'])} nodes, "
+        f"{len(case['relationships'])} relationships"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Batched, idempotent case dataset loader for CypherDetective
+
+Case data comes from a structured source instead of a hand-written Cypher script:
+
+- JSON: a single file with "nodes" and "relationships" lists (see
+  src/db/create/john_doe.json)
+- CSV: a directory with nodes.csv and relationships.csv, using typed headers
+  such as "height:float" (types: string, int, float, boolean, date)
+
+Legacy graph_n visibility flags are compacted into a single graph_mask property
+(see src.db.visibility).
+
+Nodes are written with batched UNWIND + MERGE on a per-label key property
+(backed by a uniqueness constraint), so reloading a case updates it in place
+instead of duplicating it. Deletes run in chunks to stay within transaction
+memory limits. The case's constraints and indexes are created before the data
+is written, and the dataset version is stamped after (see src.db.schema).
+
+    python -m src.db.loader src/db/create/john_doe.json --password <password>
+"""
+
+import os
+import csv
+import json
+import argparse
+from src.db.values import convert_properties
+from src.db.visibility import compact_properties
+from src.db.schema import (
+    DEFAULT_NODE_KEY,
+    _identifier,
+    apply_schema,
+    stamp_version,
+)
+
+from neo4j import GraphDatabase
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _parse_csv_value(raw: str, value_type: str) -> Any:
+    """Parse a CSV cell according to its header type"""
+    if value_type == "int":
+        return int(raw)
+    if value_type == "float":
+        return float(raw)
+    if value_type == "boolean":
+        return raw.strip().lower() == "true"
+    if value_type == "date":
+        return {"$date": raw}
+    return raw
+
+
+def _read_csv_rows(path: str, fixed_columns: Iterable[str]) -> List[Dict[str, Any]]:
+    """Read a typed CSV file into dicts of fixed columns plus "properties" """
+    fixed_columns = set(fixed_columns)
+    rows = []
+    with open(path, "r", newline="") as f:
+        for record in csv.DictReader(f):
+            row = {"properties": {}}
+            for header, raw in record.items():
+                name, _, value_type = header.partition(":")
+                if name in fixed_columns:
+                    row[name] = raw
+                elif raw != "":
+                    row["properties"][name] = _parse_csv_value(raw, value_type)
+            rows.append(row)
+    return rows
+
+
+def read_case(path: str) -> Dict[str, Any]:
+    """
+    Read a case from a JSON file or a directory of CSV files
+
+    Args:
+        path: JSON file, or directory containing nodes.csv and relationships.csv
+
+    Returns:
+        Case dictionary with "nodes" and "relationships" lists
+    """
+    if os.path.isdir(path):
+        nodes = _read_csv_rows(os.path.join(path, "nodes.csv"), ["id", "labels"])
+        for node in nodes:
+            node["labels"] = node["labels"].split(";")
+        relationships = _read_csv_rows(
+            os.path.join(path, "relationships.csv"), ["source", "target", "type"]
+        )
+        case = {"case": os.path.basename(os.path.normpath(path))}
+        keys_file = os.path.join(path, "keys.json")
+        if os.path.exists(keys_file):
+            with open(keys_file, "r") as f:
+                case.update(json.load(f))
+        case["nodes"] = nodes
+        case["relationships"] = relationships
+        return case
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _batches(rows: List[Any], batch_size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(rows), batch_size):
+        yield rows[start : start + batch_size]
+
+
+class CaseLoader:
+    """Loads case data into Neo4j with batched UNWIND writes"""
+
+    def __init__(
+        self,
+        driver,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        database: Optional[str] = None,
+    ):
+        """
+        Args:
+            driver: neo4j.Driver with write access
+            batch_size: Rows per write transaction
+            database: Target database (defaults to the server default)
+        """
+        self.driver = driver
+        self.batch_size = batch_size
+        self.database = database
+
+    def _write(self, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run a write query in its own transaction"""
+
+        def work(tx):
+            return [record.data() for record in tx.run(query, parameters)]
+
+        with self.driver.session(database=self.database) as session:
+            return session.execute_write(work)
+
+    def clear(self) -> int:
+        """
+        Delete all nodes and relationships in chunks
+
+        Returns:
+            Number of deleted nodes
+        """
+        query = """
+        MATCH (n)
+        WITH n LIMIT $batch_size
+        DETACH DELETE n
+        RETURN count(*) AS deleted
+        """
+        total = 0
+        while True:
+            deleted = self._write(query, {"batch_size": self.batch_size})[0]["deleted"]
+            total += deleted
+            if deleted == 0:
+                return total
+
+    def apply_schema(self, case: Dict[str, Any]):
+        """Create the case's constraints and indexes if they don't exist yet"""
+        apply_schema(self._write, case)
+
+    def stamp_version(self, case: Dict[str, Any]):
+        """Record the loaded case and its checksum in the DatasetVersion node"""
+        stamp_version(self._write, case)
+
+    def load(self, case: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Merge a case's nodes and relationships into the database
+
+        Applies the case's schema first and stamps the dataset version last.
+
+        Args:
+            case: Case dictionary (see read_case)
+
+        Returns:
+            Dictionary with the number of nodes and relationships written
+        """
+        node_keys = case.get("node_keys", {})
+        relationship_keys = case.get("relationship_keys", {})
+        self.apply_schema(case)
+
+        # Resolve file-local node ids to (label, key value) for MERGE lookups
+        node_refs = {}
+        node_groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for node in case["nodes"]:
+            labels = tuple(node["labels"])
+            key = node_keys.get(labels[0], DEFAULT_NODE_KEY)
+            properties = compact_properties(
+                convert_properties(node.get("properties", {}))
+            )
+            node_refs[node["id"]] = (labels[0], properties[key])
+            node_groups.setdefault(labels, []).append(
+                {"key": properties[key], "properties": properties}
+            )
+
+        nodes_written = 0
+        for labels, rows in node_groups.items():
+            key = node_keys.get(labels[0], DEFAULT_NODE_KEY)
+            extra_labels = "".join(f":{_identifier(label)}" for label in labels[1:])
+            query = (
+                "UNWIND $rows AS row "
+                f"MERGE (n:{_identifier(labels[0])} {{{_identifier(key)}: row.key}}) "
+                "SET n += row.properties"
+                + (f" SET n{extra_labels}" if extra_labels else "")
+            )
+            for batch in _batches(rows, self.batch_size):
+                self._write(query, {"rows": batch})
+                nodes_written += len(batch)
+
+        relationship_groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for rel in case["relationships"]:
+            source_label, source_key = node_refs[rel["source"]]
+            target_label, target_key = node_refs[rel["target"]]
+            relationship_groups.setdefault(
+                (rel["type"], source_label, target_label), []
+            ).append(
+                {
+                    "source": source_key,
+                    "target": target_key,
+                    "properties": convert_properties(rel.get("properties", {})),
+                }
+            )
+
+        relationships_written = 0
+        for (rel_type, source_label, target_label), rows in relationship_groups.items():
+            source_key = node_keys.get(source_label, DEFAULT_NODE_KEY)
+            target_key = node_keys.get(target_label, DEFAULT_NODE_KEY)
+            # Properties that tell parallel relationships of this type apart
+            merge_props = ", ".join(
+                f"{_identifier(prop)}: row.properties.{_identifier(prop)}"
+                for prop in relationship_keys.get(rel_type, [])
+            )
+            query = (
+                "UNWIND $rows AS row "
+                f"MATCH (a:{_identifier(source_label)} {{{_identifier(source_key)}: row.source}}) "
+                f"MATCH (b:{_identifier(target_label)} {{{_identifier(target_key)}: row.target}}) "
+                f"MERGE (a)-[r:{_identifier(rel_type)}"
+                + (f" {{{merge_props}}}" if merge_props else "")
+                + "]->(b) SET r += row.properties"
+            )
+            for batch in _batches(rows, self.batch_size):
+                self._write(query, {"rows": batch})
+                relationships_written += len(batch)
+
+        self.stamp_version(case)
+        return {"nodes": nodes_written, "relationships": relationships_written}
+
+
+def main():
+    """Load a case file into a Neo4j database"""
+    parser = argparse.ArgumentParser(description="Load a CypherDetective case")
+    parser.add_argument("path", help="Case JSON file or directory of CSV files")
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--database", help="Target database (default: server default)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete all existing data before loading",
+    )
+    args = parser.parse_args()
+
+    case = read_case(args.path)
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        loader = CaseLoader(driver, batch_size=args.batch_size, database=args.database)
+        if args.reset:
+            print(f"Deleted {loader.clear()} nodes")
+        counts = loader.load(case)
+    finally:
+        driver.close()
+    print(
+        f"Loaded case '{case.get('case')}': {counts['nodes']} nodes, "
+        f"{counts['relationships']} relationships"
+    )
+
+
+if __name__ == "__main__":
+    main()
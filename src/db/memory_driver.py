@@ -0,0 +1,224 @@
+"""
+In-process stand-in for the Neo4j driver
+
+Serves the graph visualization queries from an in-memory graph, plus any
+canned query results, through the same driver/session/record interface
+DatabaseConnection uses. This lets the game loop, benchmarks and demos run
+without a database server.
+"""
+
+from src.db.queries import (
+    DATASET_VERSION_QUERY,
+    NODES_QUERY,
+    RELATIONSHIPS_QUERY,
+    normalize_query,
+)
+
+import time
+from typing import Any, Dict, List, Optional
+
+
+class InMemoryRecord:
+    """Stand-in for neo4j.Record"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def data(self) -> Dict[str, Any]:
+        return dict(self._data)
+
+    def values(self) -> List[Any]:
+        return list(self._data.values())
+
+
+class InMemorySummary:
+    """Stand-in for neo4j.ResultSummary"""
+
+    def __init__(self, plan: Optional[Dict[str, Any]] = None):
+        self.plan = plan
+
+
+class InMemoryResult:
+    """Stand-in for neo4j.Result"""
+
+    def __init__(
+        self, rows: List[Dict[str, Any]], plan: Optional[Dict[str, Any]] = None
+    ):
+        self._rows = rows
+        self._plan = plan
+
+    def __iter__(self):
+        for row in self._rows:
+            yield InMemoryRecord(row)
+
+    def consume(self) -> InMemorySummary:
+        self._rows = []
+        return InMemorySummary(self._plan)
+
+
+class InMemorySession:
+    """Stand-in for neo4j.Session"""
+
+    def __init__(self, driver: "InMemoryDriver", database: Optional[str] = None):
+        self.driver = driver
+        self.database = database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs):
+        # Accept neo4j.Query objects (query text with a timeout) as well
+        query = getattr(query, "text", query)
+        # Only pass a database when routed, the default keeps plain signatures
+        routing = {"database": self.database} if self.database is not None else {}
+        if query.lstrip()[:8].upper() == "EXPLAIN ":
+            return InMemoryResult([], self.driver.plan(query.lstrip()[8:], **routing))
+        return InMemoryResult(self.driver.query(query, parameters, **routing))
+
+    def close(self):
+        pass
+
+
+class InMemoryDriver:
+    """Stand-in for neo4j.Driver backed by an in-memory graph"""
+
+    def __init__(
+        self,
+        nodes: Optional[List[Dict[str, Any]]] = None,
+        relationships: Optional[List[Dict[str, Any]]] = None,
+        results: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        latency: float = 0.0,
+    ):
+        """
+        Args:
+            nodes: Node rows as returned by NODES_QUERY (labels, props, id)
+            relationships: Relationship rows as returned by RELATIONSHIPS_QUERY
+                (source, relationship, target, props)
+            results: Canned results for other queries, keyed by query text
+            latency: Simulated round-trip time per query, in seconds
+        """
+        self.latency = latency
+        self.nodes = nodes or []
+        self.relationships = relationships or []
+        self.results = {}
+        for query, rows in (results or {}).items():
+            self.add_result(query, rows)
+        self.plans = {}
+        self.version_stamp: Optional[Dict[str, Any]] = None  # DatasetVersion row
+        self.snapshot = None  # GraphSnapshot the rows are read from, if any
+        self.databases: Dict[str, "InMemoryDriver"] = {}  # See add_database
+
+    @classmethod
+    def from_case(cls, case: Dict[str, Any], latency: float = 0.0):
+        """
+        Build a driver serving a case in the loader format
+
+        If the case has ground truth "answers" (see src.db.generator), they are
+        served as the results of the ground truth queries of the case's levels
+        (of all levels if there is no level pack for the case).
+        """
+        from src.db.generator import case_rows
+        from src.db.schema import case_checksum
+        from src.levels import get_ground_truth_queries, get_pack
+
+        nodes, relationships = case_rows(case)
+        driver = cls(nodes, relationships, latency=latency)
+        driver.version_stamp = {
+            "case": case.get("case"),
+            "checksum": case_checksum(case),
+            "version": 1,
+        }
+        answers = case.get("answers", {})
+        pack = get_pack(case.get("case"))
+        first_level = pack.first_level if pack else 0
+        queries = get_ground_truth_queries(pack.case if pack else None)
+        for level_num, query in queries.items():
+            # Answers are numbered by level within the case
+            case_level = str(level_num - first_level)
+            if case_level in answers:
+                driver.add_result(query, answers[case_level])
+        return driver
+
+    @classmethod
+    def from_snapshot(cls, path: str, latency: float = 0.0):
+        """
+        Build a driver serving a graph snapshot (see src.db.snapshot)
+
+        The snapshot is memory-mapped and its rows are only decoded when read.
+        """
+        from src.db.snapshot import SnapshotRows, open_snapshot
+
+        snapshot = open_snapshot(path)
+        driver = cls(
+            SnapshotRows(snapshot),
+            SnapshotRows(snapshot, relationships=True),
+            latency=latency,
+        )
+        driver.snapshot = snapshot
+        driver.version_stamp = snapshot.version_stamp
+        return driver
+
+    def add_result(self, query: str, rows: List[Dict[str, Any]]):
+        """Register the result rows for a query"""
+        self.results[normalize_query(query)] = rows
+
+    def add_database(self, name: str, driver: "InMemoryDriver"):
+        """Serve another driver's graph as a named database (for multiple cases)"""
+        self.databases[name] = driver
+
+    def _database(self, name: Optional[str]) -> "InMemoryDriver":
+        """Get the driver serving a named database (self for the default)"""
+        if name is None:
+            return self
+        if name not in self.databases:
+            raise Exception(f"Database does not exist: {name}")
+        return self.databases[name]
+
+    def add_plan(self, query: str, plan: Dict[str, Any]):
+        """Register the EXPLAIN plan for a query"""
+        self.plans[normalize_query(query)] = plan
+
+    def plan(
+        self, query: str, database: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the EXPLAIN plan for a query (None if not registered)"""
+        if database is not None:
+            return self._database(database).plan(query)
+        if self.latency:
+            time.sleep(self.latency)
+        return self.plans.get(normalize_query(query))
+
+    def query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        database: Optional[str] = None,
+    ):
+        """Get the result rows for a query (from the named database, if given)"""
+        if database is not None:
+            return self._database(database).query(query, parameters)
+        if self.latency:
+            time.sleep(self.latency)
+        key = normalize_query(query)
+        if key == normalize_query(NODES_QUERY):
+            return self.nodes
+        if key == normalize_query(RELATIONSHIPS_QUERY):
+            return self.relationships
+        if key == normalize_query(DATASET_VERSION_QUERY):
+            return [self.version_stamp] if self.version_stamp else []
+        if key in self.results:
+            return self.results[key]
+        raise Exception(f"Query not supported by the in-memory backend: {key}")
+
+    def verify_connectivity(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def session(self, database: Optional[str] = None, **kwargs) -> InMemorySession:
+        return InMemorySession(self, database)
+
+    def close(self):
+        pass
@@ -0,0 +1,164 @@
+"""
+Live query preview for the gameplay screen
+
+The player's query is re-run in the background once typing pauses. At most one
+preview query is in flight: edits cancel it, and the latest text is only sent
+after it has stopped. Successful results are cached per normalized query text
+until the dataset version changes, so going back to an earlier query is instant
+and doesn't reach the server. A preview runs against the database and dataset
+version of the case that was active when it was started, and its result is
+only cached if that is still the current version.
+"""
+
+from src.db.queries import normalize_query
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+
+class QueryPreview:
+    """Debounced, cancellable background execution of the query being typed"""
+
+    def __init__(
+        self,
+        db,
+        debounce: float = 0.5,
+        timeout: float = 2.0,
+        max_rows: int = 50,
+        cache_size: int = 128,
+    ):
+        """
+        Args:
+            db: DatabaseConnection to run the preview queries on
+            debounce: Typing pause in seconds before a query is run
+            timeout: Time budget of a preview query in seconds
+            max_rows: Row budget of a preview query
+            cache_size: Maximum number of cached results
+        """
+        self.db = db
+        self.debounce = debounce
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.cache_size = cache_size
+
+        # Latest result for the current text: dictionary with "query", "rows",
+        # "truncated", "error" and "elapsed_ms", or None
+        self.result: Optional[Dict[str, Any]] = None
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dataset_version = db.dataset_version
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="query-preview"
+        )
+        self._key = ""  # Normalized current text
+        self._pending = None  # Text waiting for the typing pause
+        self._pending_since = 0.0
+        self._future = None
+        self._cancelled: Optional[threading.Event] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether a preview of the current text is waiting or running"""
+        return self._pending is not None or self._future is not None
+
+    def _check_dataset_version(self):
+        """Drop the cached results if the data changed"""
+        if self.db.dataset_version != self._dataset_version:
+            self._cache.clear()
+            self._dataset_version = self.db.dataset_version
+
+    def set_query(self, text: str):
+        """Update the query text, cancelling the preview of the previous text"""
+        key = normalize_query(text)
+        if key == self._key:
+            return
+        self._key = key
+        if self._cancelled:
+            self._cancelled.set()
+
+        if not key:
+            self._pending = None
+            self.result = None
+            return
+
+        self._check_dataset_version()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._pending = None
+            self.result = cached
+            return
+
+        self._pending = text
+        self._pending_since = time.monotonic()
+
+    def update(self):
+        """Collect a finished preview and start the pending one (call every frame)"""
+        if self._future is not None and self._future.done():
+            key, version, result = self._future.result()
+            self._future = None
+            self._cancelled = None
+            self._check_dataset_version()
+            if result is not None:
+                if (
+                    result["error"] is None
+                    and self._dataset_version is not None
+                    and version == self._dataset_version
+                ):
+                    self._cache[key] = result
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                if key == self._key and version != self._dataset_version:
+                    # The case changed while it ran, preview it again
+                    self._pending = key
+                    self._pending_since = 0.0
+                elif key == self._key:
+                    self.result = result
+
+        # Only one query in flight; the latest text waits for it to stop
+        if (
+            self._pending is not None
+            and self._future is None
+            and time.monotonic() - self._pending_since >= self.debounce
+        ):
+            self._cancelled = threading.Event()
+            self._future = self._executor.submit(
+                self._run,
+                self._key,
+                self._pending,
+                self._cancelled,
+                self.db.query_scope(),
+            )
+            self._pending = None
+
+    def _run(self, key: str, text: str, cancelled: threading.Event, scope):
+        """Run a preview query on the worker thread, in the submitted scope"""
+        version = scope[1]
+        start = time.perf_counter()
+        result = {"query": key, "rows": [], "truncated": False, "error": None}
+        try:
+            output = self.db.execute_preview_query(
+                text,
+                cancelled=cancelled,
+                timeout=self.timeout,
+                max_rows=self.max_rows,
+                scope=scope,
+            )
+            if output is None:
+                return key, version, None
+            result["rows"], result["truncated"] = output
+        except Exception as e:
+            result["error"] = str(e)
+        if cancelled.is_set():
+            return key, version, None
+        result["elapsed_ms"] = (time.perf_counter() - start) * 1000.0
+        return key, version, result
+
+    def close(self):
+        """Cancel any running preview and stop the worker thread"""
+        if self._cancelled:
+            self._cancelled.set()
+        self._pending = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
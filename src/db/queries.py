@@ -0,0 +1,29 @@
+"""
+Shared Cypher queries and query text helpers for CypherDetective
+"""
+
+# Query all nodes for the graph visualization (without the dataset version stamp)
+NODES_QUERY = """
+MATCH (n) WHERE NOT n:DatasetVersion
+RETURN labels(n) as labels, properties(n) as props, elementId(n) as id
+"""
+
+# Query all relationships for the graph visualization
+RELATIONSHIPS_QUERY = """
+MATCH (a)-[r]->(b)
+RETURN elementId(a) as source, type(r) as relationship,
+       elementId(b) as target, properties(r) as props
+"""
+
+
+# Query the dataset version stamp (see src.db.schema)
+DATASET_VERSION_QUERY = """
+MATCH (v:DatasetVersion)
+RETURN v.case AS case, v.checksum AS checksum, v.version AS version
+LIMIT 1
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences don't affect query lookups"""
+    return " ".join(query.split())
@@ -0,0 +1,260 @@
+"""
+Record and replay database traffic
+
+RecordingDriver wraps a Neo4j driver and captures the rows of every query
+(keyed by normalized query text and parameters) and every EXPLAIN plan into a
+gzipped JSON store when it is closed. ReplayDriver serves a store through the
+in-memory driver interface with injected latency, so the full game loop
+(graph loading, validation, previews) runs deterministically without a
+network:
+
+    python -m src.play --record session.json.gz
+    python -m src.play --replay session.json.gz --latency-ms 40 --jitter-ms 10
+
+Rows are stored as record.data() dictionaries, so replayed nodes are plain
+property maps (result highlighting falls back to node names).
+"""
+
+from src.db.memory_driver import InMemoryDriver
+from src.db.queries import normalize_query
+
+import os
+import json
+import gzip
+import time
+import random
+import threading
+from typing import Any, Dict, List, Optional
+
+STORE_FORMAT = 1
+
+
+def entry_key(
+    query: str,
+    parameters: Optional[Dict[str, Any]] = None,
+    database: Optional[str] = None,
+) -> str:
+    """Get the store key of a query, its parameters and the database it ran on"""
+    key = normalize_query(query)
+    if parameters:
+        key += "\n" + json.dumps(
+            parameters, sort_keys=True, default=str, separators=(",", ":")
+        )
+    if database is not None:
+        key += "\n@" + database
+    return key
+
+
+def _explained_query(query: str) -> Optional[str]:
+    """Get the query of an EXPLAIN statement (None if it isn't one)"""
+    stripped = query.lstrip()
+    if stripped[:8].upper() == "EXPLAIN ":
+        return stripped[8:]
+    return None
+
+
+def load_store(path: str) -> Dict[str, Any]:
+    """
+    Load a recorded store
+
+    Returns:
+        Dictionary with "results" (key -> entry with "rows", "complete" and
+        "elapsed_ms") and "plans" (key of the explained query -> plan)
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        store = json.load(f)
+    if store.get("format") != STORE_FORMAT:
+        raise Exception(f"Unsupported recording format in {path}")
+    return store
+
+
+class _RecordingResult:
+    """Passes a result through while capturing its rows"""
+
+    def __init__(
+        self, driver: "RecordingDriver", key: str, result, explained, database
+    ):
+        self._driver = driver
+        self._key = key
+        self._database = database
+        self._result = result
+        self._explained = explained
+        self._start = time.perf_counter()
+        self.rows: List[Dict[str, Any]] = []
+        self.stored = False
+
+    def __iter__(self):
+        for record in self._result:
+            self.rows.append(record.data())
+            yield record
+        self.store(complete=True)
+
+    def consume(self):
+        summary = self._result.consume()
+        if self._explained is not None:
+            self._driver.store_plan(self._explained, summary.plan, self._database)
+            self.stored = True
+        else:
+            self.store(complete=False)
+        return summary
+
+    def store(self, complete: bool):
+        """Store the rows seen so far (complete if the result was exhausted)"""
+        if self.stored or self._explained is not None:
+            return
+        self.stored = True
+        elapsed_ms = (time.perf_counter() - self._start) * 1000.0
+        self._driver.store_result(self._key, self.rows, complete, elapsed_ms)
+
+
+class _RecordingSession:
+    """Wraps a neo4j.Session, recording the results it returns"""
+
+    def __init__(self, driver: "RecordingDriver", session, database=None):
+        self._driver = driver
+        self._session = session
+        self._database = database
+        self._results: List[_RecordingResult] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, query, parameters: Optional[Dict[str, Any]] = None, **kwargs):
+        text = getattr(query, "text", query)
+        result = _RecordingResult(
+            self._driver,
+            entry_key(text, parameters, self._database),
+            self._session.run(query, parameters, **kwargs),
+            _explained_query(text),
+            self._database,
+        )
+        self._results.append(result)
+        return result
+
+    def close(self):
+        # Results abandoned part way (e.g. truncated previews) keep their prefix
+        for result in self._results:
+            result.store(complete=False)
+        self._results = []
+        self._session.close()
+
+
+class RecordingDriver:
+    """Stand-in for neo4j.Driver that records all traffic of a real driver"""
+
+    def __init__(self, driver, path: str):
+        """
+        Args:
+            driver: Driver to pass the queries to
+            path: Store file, written when the driver is closed. Entries of an
+                existing store are kept unless they are recorded again
+        """
+        self.driver = driver
+        self.path = path
+        self._lock = threading.Lock()
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.plans: Dict[str, Any] = {}
+        if os.path.exists(path):
+            store = load_store(path)
+            self.results.update(store["results"])
+            self.plans.update(store["plans"])
+
+    def store_result(self, key: str, rows, complete: bool, elapsed_ms: float):
+        """Record the rows of a query, never replacing complete rows with a prefix"""
+        with self._lock:
+            previous = self.results.get(key)
+            if complete or previous is None or not previous["complete"]:
+                self.results[key] = {
+                    "rows": rows,
+                    "complete": complete,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                }
+
+    def store_plan(self, query: str, plan: Optional[Dict[str, Any]], database=None):
+        """Record the EXPLAIN plan of a query"""
+        with self._lock:
+            self.plans[entry_key(query, database=database)] = plan
+
+    def save(self):
+        """Write the store to disk"""
+        with self._lock:
+            store = {
+                "format": STORE_FORMAT,
+                "results": dict(self.results),
+                "plans": dict(self.plans),
+            }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(store, f, default=str, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    def verify_connectivity(self):
+        self.driver.verify_connectivity()
+
+    def session(self, **kwargs) -> _RecordingSession:
+        return _RecordingSession(
+            self, self.driver.session(**kwargs), kwargs.get("database")
+        )
+
+    def close(self):
+        self.save()
+        print(f"Recorded {len(self.results)} query results to {self.path}")
+        self.driver.close()
+
+
+class ReplayDriver(InMemoryDriver):
+    """Stand-in for neo4j.Driver serving recorded traffic with injected latency"""
+
+    def __init__(
+        self, path: str, latency: float = 0.0, jitter: float = 0.0, seed: int = 73
+    ):
+        """
+        Args:
+            path: Store file written by RecordingDriver
+            latency: Round-trip time added to every query, in seconds
+            jitter: Maximum random extra time per query, in seconds
+            seed: Seed of the jitter, so runs are reproducible
+        """
+        super().__init__(latency=latency)
+        store = load_store(path)
+        self.results = {key: entry["rows"] for key, entry in store["results"].items()}
+        self.plans = store["plans"]
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        """Sleep for the injected latency"""
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0.0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def plan(
+        self, query: str, database: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        self._wait()
+        return self.plans.get(entry_key(query, database=database))
+
+    def query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        database: Optional[str] = None,
+    ):
+        self._wait()
+        key = entry_key(query, parameters, database)
+        if key not in self.results:
+            raise Exception(f"Query not in the recording: {normalize_query(query)}")
+        return self.results[key]
+
+    def verify_connectivity(self):
+        self._wait()
@@ -0,0 +1,179 @@
+"""
+Schema and dataset version provisioning for case databases
+
+Every case declares the indexes its levels' lookups need; together with a
+uniqueness constraint on the merge key of each label and an index on the
+visibility mask of filtered labels, they are created idempotently (IF NOT
+EXISTS) whenever a case is loaded.
+
+Each load also stamps a single DatasetVersion node with the case name and a
+checksum of its contents, which clients read to key their caches on (see
+DatabaseConnection.dataset_version). The node is excluded from the graph
+visualization.
+
+Apply the schema and stamp to a database created with creation.cypher:
+
+    python -m src.db.schema src/db/create/john_doe.json --password <password>
+"""
+
+import json
+import hashlib
+import argparse
+from src.db.visibility import FILTERED_LABELS, VISIBILITY_PROPERTY
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+DEFAULT_NODE_KEY = "name"
+DATASET_VERSION_LABEL = "DatasetVersion"
+SCHEMA_VERSION = 1  # Bump when the shape of the stamped data changes
+
+# Lookups of the John Doe levels that aren't covered by a uniqueness constraint
+JOHN_DOE_INDEXES = [
+    {"label": "Suspect", "properties": ["verified_alibi"]},
+    {"label": "Suspect", "properties": ["access_level"]},
+    {"label": "Suspect", "properties": ["hair", "height"]},
+    {"label": "Suspect", "properties": ["blood_type"]},
+]
+
+
+class SchemaItem(NamedTuple):
+    label: str
+    properties: Tuple[str, ...]
+    unique: bool
+
+    @property
+    def name(self) -> str:
+        kind = "unique" if self.unique else "index"
+        return "_".join([self.label, *self.properties, kind]).lower()
+
+
+def _identifier(name: str) -> str:
+    """Quote a label, relationship type or property name for use in Cypher"""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def case_schema(case: Dict[str, Any]) -> List[SchemaItem]:
+    """
+    Get the constraints and indexes of a case
+
+    Args:
+        case: Case dictionary (see src.db.loader.read_case). Its optional
+            "indexes" list holds {"label", "properties"} declarations
+
+    Returns:
+        Uniqueness constraints on the node keys, visibility mask indexes and the
+        declared indexes, for the labels the case uses
+    """
+    node_keys = case.get("node_keys", {})
+    labels = sorted({node["labels"][0] for node in case["nodes"]})
+    items = [
+        SchemaItem(label, (node_keys.get(label, DEFAULT_NODE_KEY),), True)
+        for label in labels
+    ]
+    items += [
+        SchemaItem(label, (VISIBILITY_PROPERTY,), False)
+        for label in labels
+        if label in FILTERED_LABELS
+    ]
+    for index in case.get("indexes", []):
+        item = SchemaItem(index["label"], tuple(index["properties"]), False)
+        if item.label in labels and item not in items:
+            items.append(item)
+    items.append(SchemaItem(DATASET_VERSION_LABEL, ("case",), True))
+    return items
+
+
+def schema_statement(item: SchemaItem) -> str:
+    """Get the idempotent Cypher statement creating a constraint or index"""
+    label = _identifier(item.label)
+    if item.unique:
+        return (
+            f"CREATE CONSTRAINT {_identifier(item.name)} IF NOT EXISTS "
+            f"FOR (n:{label}) REQUIRE n.{_identifier(item.properties[0])} IS UNIQUE"
+        )
+    properties = ", ".join(f"n.{_identifier(prop)}" for prop in item.properties)
+    return (
+        f"CREATE INDEX {_identifier(item.name)} IF NOT EXISTS "
+        f"FOR (n:{label}) ON ({properties})"
+    )
+
+
+def case_checksum(case: Dict[str, Any]) -> str:
+    """Get a checksum of a case's schema, nodes and relationships"""
+    content = {
+        "schema_version": SCHEMA_VERSION,
+        "indexes": case.get("indexes", []),
+        "nodes": case["nodes"],
+        "relationships": case["relationships"],
+    }
+    canonical = json.dumps(content, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def version_key(stamp: Dict[str, Any]) -> str:
+    """Get the dataset version clients key caches on from a DatasetVersion row"""
+    return f"{stamp['case']}:{stamp['checksum']}"
+
+
+def apply_schema(write: Callable[[str, Dict[str, Any]], Any], case: Dict[str, Any]):
+    """
+    Create the constraints and indexes of a case if they don't exist yet
+
+    Args:
+        write: Function running a write query with parameters
+        case: Case dictionary
+    """
+    for item in case_schema(case):
+        write(schema_statement(item), {})
+
+
+def stamp_version(write: Callable[[str, Dict[str, Any]], Any], case: Dict[str, Any]):
+    """
+    Record the loaded case and its checksum in the DatasetVersion node
+
+    The version counter is only increased when the checksum changes, so
+    reloading identical data keeps client caches valid.
+    """
+    write(
+        f"MATCH (v:{DATASET_VERSION_LABEL}) WHERE v.case <> $case DETACH DELETE v",
+        {"case": case.get("case")},
+    )
+    write(
+        f"MERGE (v:{DATASET_VERSION_LABEL} {{case: $case}}) "
+        "SET v.version = CASE WHEN v.checksum = $checksum THEN v.version "
+        "ELSE coalesce(v.version, 0) + 1 END, "
+        "v.checksum = $checksum, v.schema_version = $schema_version, "
+        "v.loaded_at = datetime()",
+        {
+            "case": case.get("case"),
+            "checksum": case_checksum(case),
+            "schema_version": SCHEMA_VERSION,
+        },
+    )
+
+
+def main():
+    """Apply a case's schema to a database and stamp its dataset version"""
+    from neo4j import GraphDatabase
+    from src.db.loader import CaseLoader, read_case
+
+    parser = argparse.ArgumentParser(description="Apply a CypherDetective schema")
+    parser.add_argument("path", help="Case JSON file or directory of CSV files")
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--database", help="Target database (default: server default)")
+    args = parser.parse_args()
+
+    case = read_case(args.path)
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+    try:
+        loader = CaseLoader(driver, database=args.database)
+        loader.apply_schema(case)
+        loader.stamp_version(case)
+    finally:
+        driver.close()
+    print(f"Applied {len(case_schema(case))} constraints and indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Binary graph snapshots for fast loading of large cases
+
+A snapshot is a directory of raw .npy arrays that are memory-mapped when
+opened, so loading takes milliseconds and processes opening the same snapshot
+share its pages:
+
+    meta.json                      Format, dataset version stamp, label sets
+                                   and relationship types
+    node_id_*.npy                  String table of node ids
+    node_name_*.npy                String table of node display names
+    node_label_set.npy             Index into meta "label_sets" per node
+    node_mask.npy                  Visibility mask per node (see src.db.visibility)
+    node_props.npy                 Index into the property table per node
+    edge_source.npy, edge_target.npy   Node indices of each relationship
+    edge_type.npy                  Index into meta "relationship_types"
+    edge_props.npy                 Index into the property table per relationship
+    props_*.npy                    String table of JSON property maps (deduplicated)
+
+Properties are only parsed when a row is read. Export a case file or the graph
+of a database with:
+
+    python -m src.db.snapshot snapshot_dir --case case.json
+    python -m src.db.snapshot snapshot_dir --uri bolt://localhost:7687 --password <password>
+
+Check that a case file and the database it was loaded into give the same
+snapshot (node ids aside) with --compare:
+
+    python -m src.db.snapshot case_snapshot --case src/db/create/john_doe.json
+    python -m src.db.snapshot db_snapshot --password <password> --compare case_snapshot
+"""
+
+from src.db.values import row_properties
+from src.db.visibility import graph_index, node_mask
+
+import os
+import sys
+import json
+import argparse
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+SNAPSHOT_FORMAT = 2
+META_FILE = "meta.json"
+
+_open_snapshots: Dict[str, "GraphSnapshot"] = {}  # Opened snapshots by path
+
+
+class StringTable:
+    """Memory-mapped table of UTF-8 strings (concatenated bytes plus offsets)"""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].tobytes().decode("utf-8")
+
+    def take(self, indices: np.ndarray) -> List[str]:
+        """Get the strings at many indices at once"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return []
+        starts = self.offsets[indices]
+        ends = self.offsets[indices + 1]
+        # Copy the spanned bytes once, slicing bytes is faster than the mmap
+        base = int(starts.min())
+        data = self.data[base : int(ends.max())].tobytes()
+        return [
+            data[start:end].decode("utf-8")
+            for start, end in zip((starts - base).tolist(), (ends - base).tolist())
+        ]
+
+    @staticmethod
+    def save(directory: str, name: str, strings: Sequence[str]):
+        """Write a string table as <name>_data.npy and <name>_offsets.npy"""
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        np.save(os.path.join(directory, f"{name}_data.npy"), data)
+        np.save(os.path.join(directory, f"{name}_offsets.npy"), offsets)
+
+    @classmethod
+    def load(cls, directory: str, name: str) -> "StringTable":
+        """Memory-map a string table"""
+        return cls(
+            np.load(os.path.join(directory, f"{name}_data.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, f"{name}_offsets.npy"), mmap_mode="r"),
+        )
+
+
+def _encode_properties(props: Dict[str, Any], table: Dict[str, int]) -> int:
+    """Get the property table index of a property map, adding it if new"""
+    # Typed values are stored as shown in query rows, whether they come from a
+    # case file ({"$date": ...}) or a database (neo4j.time.Date)
+    text = json.dumps(
+        row_properties(props), sort_keys=True, default=str, separators=(",", ":")
+    )
+    return table.setdefault(text, len(table))
+
+
+def _display_name(node: Dict[str, Any]) -> str:
+    """Get the name a node is shown with (its primary label if unnamed)"""
+    labels = node["labels"]
+    return str(node["props"].get("name", labels[0] if labels else "Unknown"))
+
+
+def write_snapshot(
+    path: str,
+    nodes: List[Dict[str, Any]],
+    relationships: List[Dict[str, Any]],
+    version_stamp: Optional[Dict[str, Any]] = None,
+    dataset_version: Optional[str] = None,
+):
+    """
+    Write a graph snapshot
+
+    Args:
+        path: Output directory (created if missing)
+        nodes: Node rows as returned by NODES_QUERY (labels, props, id)
+        relationships: Relationship rows as returned by RELATIONSHIPS_QUERY
+            (source, relationship, target, props); rows with an unknown
+            endpoint are skipped
+        version_stamp: DatasetVersion row of the source (case, checksum,
+            version), if it has one
+        dataset_version: Dataset version of the source (see
+            DatabaseConnection.dataset_version)
+    """
+    os.makedirs(path, exist_ok=True)
+    label_sets: Dict[tuple, int] = {}
+    relationship_types: Dict[str, int] = {}
+    props_table: Dict[str, int] = {}
+    node_index = {node["id"]: i for i, node in enumerate(nodes)}
+
+    node_label_set = np.array(
+        [label_sets.setdefault(tuple(n["labels"]), len(label_sets)) for n in nodes],
+        dtype=np.int32,
+    )
+    masks = np.array(
+        [node_mask(n["labels"], n["props"]) for n in nodes], dtype=np.int64
+    )
+    node_props = np.array(
+        [_encode_properties(n["props"], props_table) for n in nodes], dtype=np.int32
+    )
+
+    kept = [
+        rel
+        for rel in relationships
+        if rel["source"] in node_index and rel["target"] in node_index
+    ]
+    edge_source = np.array([node_index[r["source"]] for r in kept], dtype=np.int32)
+    edge_target = np.array([node_index[r["target"]] for r in kept], dtype=np.int32)
+    edge_type = np.array(
+        [
+            relationship_types.setdefault(r["relationship"], len(relationship_types))
+            for r in kept
+        ],
+        dtype=np.int32,
+    )
+    edge_props = np.array(
+        [_encode_properties(r.get("props", {}), props_table) for r in kept],
+        dtype=np.int32,
+    )
+
+    arrays = {
+        "node_label_set": node_label_set,
+        "node_mask": masks,
+        "node_props": node_props,
+        "edge_source": edge_source,
+        "edge_target": edge_target,
+        "edge_type": edge_type,
+        "edge_props": edge_props,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    StringTable.save(path, "node_id", [str(n["id"]) for n in nodes])
+    StringTable.save(path, "node_name", [_display_name(n) for n in nodes])
+    StringTable.save(path, "props", list(props_table))
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "version_stamp": version_stamp,
+        "dataset_version": dataset_version,
+        "nodes": len(nodes),
+        "relationships": len(kept),
+        "label_sets": [list(labels) for labels in label_sets],
+        "relationship_types": list(relationship_types),
+    }
+    # Written last, so an interrupted export isn't mistaken for a snapshot
+    with open(os.path.join(path, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def export_case(case: Dict[str, Any], path: str):
+    """Write the snapshot of a case in the loader format"""
+    from src.db.generator import case_rows
+    from src.db.schema import case_checksum, version_key
+
+    nodes, relationships = case_rows(case)
+    stamp = {"case": case.get("case"), "checksum": case_checksum(case), "version": 1}
+    write_snapshot(path, nodes, relationships, stamp, version_key(stamp))
+
+
+def export_database(db, path: str):
+    """Write the snapshot of the graph in a database"""
+    from src.db.queries import DATASET_VERSION_QUERY, NODES_QUERY, RELATIONSHIPS_QUERY
+
+    stamp = db.execute_query(DATASET_VERSION_QUERY)
+    nodes = db.execute_query(NODES_QUERY)
+    relationships = db.execute_query(RELATIONSHIPS_QUERY)
+    write_snapshot(
+        path,
+        nodes,
+        relationships,
+        stamp[0] if stamp else None,
+        db.refresh_dataset_version(),
+    )
+
+
+class GraphSnapshot:
+    """Memory-mapped graph snapshot"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Snapshot directory written by write_snapshot
+        """
+        with open(os.path.join(path, META_FILE), "r") as f:
+            meta = json.load(f)
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            raise Exception(f"Unsupported snapshot format in {path}")
+
+        self.path = path
+        self.version_stamp: Optional[Dict[str, Any]] = meta["version_stamp"]
+        self.dataset_version: Optional[str] = meta["dataset_version"]
+        self.label_sets: List[List[str]] = meta["label_sets"]
+        self.relationship_types: List[str] = meta["relationship_types"]
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        self.node_label_set = load("node_label_set")
+        self.node_mask = load("node_mask")
+        self.node_props = load("node_props")
+        self.edge_source = load("edge_source")
+        self.edge_target = load("edge_target")
+        self.edge_type = load("edge_type")
+        self.edge_props = load("edge_props")
+        self.node_ids = StringTable.load(path, "node_id")
+        self.node_names = StringTable.load(path, "node_name")
+        self.props = StringTable.load(path, "props")
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_mask)
+
+    @property
+    def num_relationships(self) -> int:
+        return len(self.edge_source)
+
+    def visible_nodes(self, level_num: int) -> np.ndarray:
+        """Get the boolean mask of the nodes shown in a level's graph"""
+        return (self.node_mask & (1 << graph_index(level_num))) != 0
+
+    def visible_relationships(self, visible: np.ndarray) -> np.ndarray:
+        """Get the boolean mask of the relationships between visible nodes"""
+        return visible[self.edge_source] & visible[self.edge_target]
+
+    def _properties(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Parse many property maps with a single JSON decode"""
+        return json.loads("[" + ",".join(self.props.take(indices)) + "]")
+
+    def node_rows(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Get many nodes in the NODES_QUERY row format"""
+        label_sets = [self.label_sets[i] for i in self.node_label_set[indices].tolist()]
+        props = self._properties(self.node_props[indices])
+        return [
+            {"labels": list(labels), "props": node_props, "id": node_id}
+            for labels, node_props, node_id in zip(
+                label_sets, props, self.node_ids.take(indices)
+            )
+        ]
+
+    def relationship_rows(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Get many relationships in the RELATIONSHIPS_QUERY row format"""
+        types = [self.relationship_types[i] for i in self.edge_type[indices].tolist()]
+        return [
+            {
+                "source": source,
+                "relationship": rel_type,
+                "target": target,
+                "props": rel_props,
+            }
+            for source, rel_type, target, rel_props in zip(
+                self.node_ids.take(self.edge_source[indices]),
+                types,
+                self.node_ids.take(self.edge_target[indices]),
+                self._properties(self.edge_props[indices]),
+            )
+        ]
+
+    def node_properties(self, index: int) -> Dict[str, Any]:
+        """Parse the property map of a node"""
+        return json.loads(self.props[self.node_props[index]])
+
+    def edge_properties(self, index: int) -> Dict[str, Any]:
+        """Parse the property map of a relationship"""
+        return json.loads(self.props[self.edge_props[index]])
+
+    def node_row(self, index: int) -> Dict[str, Any]:
+        """Get a node in the NODES_QUERY row format"""
+        return {
+            "labels": list(self.label_sets[self.node_label_set[index]]),
+            "props": self.node_properties(index),
+            "id": self.node_ids[index],
+        }
+
+    def relationship_row(self, index: int) -> Dict[str, Any]:
+        """Get a relationship in the RELATIONSHIPS_QUERY row format"""
+        return {
+            "source": self.node_ids[self.edge_source[index]],
+            "relationship": self.relationship_types[self.edge_type[index]],
+            "target": self.node_ids[self.edge_target[index]],
+            "props": self.edge_properties(index),
+        }
+
+
+class SnapshotRows(Sequence):
+    """Read-only list view of a snapshot's node or relationship rows"""
+
+    def __init__(self, snapshot: GraphSnapshot, relationships: bool = False):
+        self.snapshot = snapshot
+        self.relationships = relationships
+
+    def __len__(self) -> int:
+        if self.relationships:
+            return self.snapshot.num_relationships
+        return self.snapshot.num_nodes
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if self.relationships:
+            return self.snapshot.relationship_row(index)
+        return self.snapshot.node_row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Decode in chunks, which is much faster than row by row
+        chunk = 4096
+        for start in range(0, len(self), chunk):
+            indices = np.arange(start, min(start + chunk, len(self)))
+            if self.relationships:
+                yield from self.snapshot.relationship_rows(indices)
+            else:
+                yield from self.snapshot.node_rows(indices)
+
+
+def _graph_contents(snapshot: GraphSnapshot):
+    """Get the nodes and relationships of a snapshot independent of node ids"""
+    nodes = {}
+    for row in SnapshotRows(snapshot):
+        props = json.dumps(row["props"], sort_keys=True)
+        nodes[row["id"]] = (sorted(row["labels"]), props)
+    relationships = sorted(
+        (
+            nodes[row["source"]],
+            row["relationship"],
+            nodes[row["target"]],
+            json.dumps(row["props"], sort_keys=True),
+        )
+        for row in SnapshotRows(snapshot, relationships=True)
+    )
+    return sorted(nodes.values()), relationships
+
+
+def compare_snapshots(path: str, other: str) -> List[str]:
+    """
+    Compare the graphs of two snapshots, e.g. of a case file and of the
+    database it was loaded into (node ids may differ, properties may not)
+
+    Returns:
+        Descriptions of the differences (empty if the graphs are identical)
+    """
+    differences = []
+    for name, ours, theirs in zip(
+        ("node", "relationship"),
+        _graph_contents(GraphSnapshot(path)),
+        _graph_contents(GraphSnapshot(other)),
+    ):
+        if len(ours) != len(theirs):
+            differences.append(f"{len(ours)} vs {len(theirs)} {name}s")
+        differences.extend(f"{name} {a} vs {b}" for a, b in zip(ours, theirs) if a != b)
+    return differences
+
+
+def open_snapshot(path: str) -> GraphSnapshot:
+    """Open a snapshot, reusing it if it was already opened by this process"""
+    key = os.path.abspath(path)
+    if key not in _open_snapshots:
+        _open_snapshots[key] = GraphSnapshot(path)
+    return _open_snapshots[key]
+
+
+def main():
+    """Export a case file or a database graph as a snapshot"""
+    parser = argparse.ArgumentParser(description="Write a CypherDetective snapshot")
+    parser.add_argument("path", help="Output snapshot directory")
+    parser.add_argument("--case", help="Case JSON file or directory of CSV files")
+    parser.add_argument("--uri", help="Bolt URI to export from (default: game db)")
+    parser.add_argument("--user")
+    parser.add_argument("--password")
+    parser.add_argument(
+        "--compare",
+        help="Snapshot to check the written one against (exits 1 if they differ)",
+    )
+    args = parser.parse_args()
+
+    if args.case:
+        from src.db.loader import read_case
+
+        export_case(read_case(args.case), args.path)
+    else:
+        from src.db.database import DatabaseConnection
+
+        db = DatabaseConnection(args.uri, args.user, args.password)
+        try:
+            export_database(db, args.path)
+        finally:
+            db.close()
+
+    snapshot = GraphSnapshot(args.path)
+    print(
+        f"Wrote snapshot of {snapshot.num_nodes} nodes and "
+        f"{snapshot.num_relationships} relationships to {args.path}"
+    )
+
+    if args.compare:
+        differences = compare_snapshots(args.path, args.compare)
+        for difference in differences[:20]:
+            print(f"Differs from {args.compare}: {difference}")
+        if differences:
+            sys.exit(1)
+        print(f"Same graph as {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
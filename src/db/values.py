@@ -0,0 +1,39 @@
+"""
+Typed property values of the case file format
+
+Values JSON has no type for are encoded as single-key objects in case files,
+e.g. {"$date": "2025-10-09"}. The loader writes them as Neo4j values; rows
+built straight from a case file (the in-memory backend, case snapshots) hold
+them as strings, the way query results show them.
+"""
+
+from typing import Any, Dict
+
+from neo4j.time import Date
+
+
+def convert_value(value: Any) -> Any:
+    """Convert JSON-encoded typed values (e.g. {"$date": "2025-10-09"})"""
+    if isinstance(value, dict) and "$date" in value:
+        return Date.from_iso_format(value["$date"])
+    if isinstance(value, list):
+        return [convert_value(v) for v in value]
+    return value
+
+
+def convert_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: convert_value(value) for key, value in properties.items()}
+
+
+def row_value(value: Any) -> Any:
+    """Get a (typed or Neo4j) value as it is shown in a query row"""
+    value = convert_value(value)
+    if isinstance(value, list):
+        return [row_value(v) for v in value]
+    if isinstance(value, Date):
+        return str(value)
+    return value
+
+
+def row_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: row_value(value) for key, value in properties.items()}
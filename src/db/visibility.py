@@ -0,0 +1,57 @@
+"""
+Per-level graph visibility for CypherDetective
+
+Which Suspect and Bank nodes appear in a level's graph is stored as a single
+integer bitmask property (bit n set = visible in graph n). Older datasets use
+one boolean property per level (graph_0, graph_1, ...), which is still read.
+"""
+
+from typing import Any, Dict, Iterable
+
+VISIBILITY_PROPERTY = "graph_mask"
+LEGACY_PREFIX = "graph_"
+
+# Labels whose nodes are filtered per level, all other nodes are always visible
+FILTERED_LABELS = ("Suspect", "Bank")
+ALL_LEVELS = -1  # Every bit set
+
+
+def graph_index(level_num: int) -> int:
+    """Get the graph a level displays (level n shows graph n - 1)"""
+    return max(0, level_num - 1)
+
+
+def flags_to_mask(properties: Dict[str, Any]) -> int:
+    """Build a visibility mask from legacy graph_n boolean properties"""
+    mask = 0
+    for key, value in properties.items():
+        suffix = key[len(LEGACY_PREFIX) :]
+        if key.startswith(LEGACY_PREFIX) and suffix.isdigit() and value:
+            mask |= 1 << int(suffix)
+    return mask
+
+
+def compact_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace legacy graph_n flags with a single visibility mask property"""
+    legacy = [
+        key
+        for key in properties
+        if key.startswith(LEGACY_PREFIX) and key[len(LEGACY_PREFIX) :].isdigit()
+    ]
+    if not legacy:
+        return properties
+    compacted = {k: v for k, v in properties.items() if k not in legacy}
+    compacted[VISIBILITY_PROPERTY] = properties.get(
+        VISIBILITY_PROPERTY, 0
+    ) | flags_to_mask(properties)
+    return compacted
+
+
+def node_mask(labels: Iterable[str], properties: Dict[str, Any]) -> int:
+    """Get the visibility mask of a node (ALL_LEVELS for unfiltered labels)"""
+    if not any(label in FILTERED_LABELS for label in labels):
+        return ALL_LEVELS
+    mask = properties.get(VISIBILITY_PROPERTY)
+    if mask is None:
+        mask = flags_to_mask(properties)
+    return mask
@@ -11,3 +11,4 @@ class GamePlayState(Enum):
     QUERY_INPUT = auto()
     QUERY_RESULT = auto()
     HIDDEN_RESULT = auto()
+    RESULT_TABLE = auto()
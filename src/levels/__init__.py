@@ -1 +1,12 @@
-from .levels import Level, get_level, get_total_levels
+from .levels import (
+    Level,
+    LevelInfo,
+    LevelPack,
+    get_level,
+    get_total_levels,
+    get_level_page,
+    get_page_count,
+    get_packs,
+    get_pack,
+    get_ground_truth_queries,
+)
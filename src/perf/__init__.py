@@ -0,0 +1,2 @@
+from .metrics import Metrics, LatencyHistogram, metrics, rss_mb
+from .profiler import StateProfiler
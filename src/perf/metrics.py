@@ -0,0 +1,177 @@
+"""
+Lightweight runtime instrumentation for CypherDetective
+
+Keeps rolling windows of section timings (per-frame handle_events/update/render
+and per-state render breakdowns) and latency histograms (database queries) that
+can be shown in the performance overlay or dumped to JSON.
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, fall back to /proc on Linux
+    psutil = None
+
+
+# Upper bounds (ms) of the latency histogram buckets, the last bucket is open
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets: Iterable[float] = HISTOGRAM_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        """Add a latency sample"""
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable view of the histogram"""
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class Metrics:
+    """Rolling section timings and latency histograms"""
+
+    def __init__(self, window: int = 600):
+        """
+        Args:
+            window: Number of samples kept per timed section (10s at 60 FPS)
+        """
+        self.window = window
+        self.timings: Dict[str, deque] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.frame_times: deque = deque(maxlen=window)
+        self._last_frame_end = None
+        # Histograms are also fed from background threads (database connect,
+        # query previews)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed_ms: float):
+        """Record a timing sample for a section"""
+        samples = self.timings.get(name)
+        if samples is None:
+            samples = self.timings[name] = deque(maxlen=self.window)
+        samples.append(elapsed_ms)
+
+    @contextmanager
+    def timed(self, name: str):
+        """Time the body of a with-block as a section"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000.0)
+
+    def observe(self, name: str, elapsed_ms: float):
+        """Add a sample to a latency histogram"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(elapsed_ms)
+
+    def end_frame(self):
+        """Mark the end of a frame, recording the wall time since the last one"""
+        now = time.perf_counter()
+        if self._last_frame_end is not None:
+            self.frame_times.append((now - self._last_frame_end) * 1000.0)
+        self._last_frame_end = now
+
+    def percentiles(
+        self, name: Optional[str] = None, points: Iterable[float] = (50, 95, 99)
+    ) -> Dict[float, float]:
+        """
+        Get percentiles of a section's samples
+
+        Args:
+            name: Section name, or None for whole-frame times
+            points: Percentiles to compute
+
+        Returns:
+            Dictionary mapping each percentile to its value in ms
+        """
+        samples = self.frame_times if name is None else self.timings.get(name, ())
+        ordered = sorted(samples)
+        if not ordered:
+            return {p: 0.0 for p in points}
+        last = len(ordered) - 1
+        return {p: ordered[min(last, int(round(p / 100 * last)))] for p in points}
+
+    def fps(self) -> float:
+        """Get the average frames per second over the window"""
+        if not self.frame_times:
+            return 0.0
+        mean_ms = sum(self.frame_times) / len(self.frame_times)
+        return 1000.0 / mean_ms if mean_ms > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a JSON-serializable view of all metrics"""
+        sections = {}
+        for name, samples in self.timings.items():
+            p = self.percentiles(name)
+            sections[name] = {
+                "samples": len(samples),
+                "mean_ms": sum(samples) / len(samples) if samples else 0.0,
+                "p50_ms": p[50],
+                "p95_ms": p[95],
+                "p99_ms": p[99],
+            }
+        frame = self.percentiles()
+        with self._lock:
+            histograms = {k: h.to_dict() for k, h in self.histograms.items()}
+        return {
+            "timestamp": time.time(),
+            "fps": self.fps(),
+            "frame_ms": {"p50": frame[50], "p95": frame[95], "p99": frame[99]},
+            "rss_mb": rss_mb(),
+            "sections": sections,
+            "histograms": histograms,
+        }
+
+    def dump_json(self, path: str):
+        """Write a snapshot of all metrics to a JSON file"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def rss_mb() -> Optional[float]:
+    """Get the resident set size of this process in MB, or None if unavailable"""
+    if psutil is not None:
+        return psutil.Process(os.getpid()).memory_info().rss / (1024**2)
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024**2)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Shared instance used by the game loop, states and database connection
+metrics = Metrics()
@@ -0,0 +1,102 @@
+"""
+Per-state profiling for CypherDetective
+
+Captures deterministic cProfile data and sampled call stacks segmented by the
+active game state, so CPU time can be attributed to e.g. the menu render or the
+gameplay graph visualization under a realistic play session.
+"""
+
+import os
+import sys
+import time
+import cProfile
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+
+class StateProfiler:
+    """Profiles the main thread, keeping one profile per active state"""
+
+    def __init__(self, output_dir: str, sample_interval: float = 0.005):
+        """
+        Args:
+            output_dir: Directory the profiles are written to
+            sample_interval: Seconds between call stack samples
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.stacks: Dict[str, Counter] = {}
+        self.current_key: Optional[str] = None
+
+        self._thread_id = threading.get_ident()
+        self._sampling = False
+        self._sampler = None
+
+    def start(self):
+        """Start the stack sampler (profiles are enabled by set_state)"""
+        self._sampling = True
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+
+    def set_state(self, key: str):
+        """Attribute everything from now on to the given state"""
+        if key == self.current_key:
+            return
+        if self.current_key is not None:
+            self.profiles[self.current_key].disable()
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.profiles[key] = cProfile.Profile()
+        self.current_key = key
+        profile.enable()
+
+    def stop(self):
+        """Stop profiling and sampling"""
+        if self.current_key is not None:
+            self.profiles[self.current_key].disable()
+            self.current_key = None
+        self._sampling = False
+        if self._sampler:
+            self._sampler.join()
+            self._sampler = None
+
+    def write(self):
+        """
+        Write one .prof file per state plus a combined collapsed-stack file
+
+        The collapsed stacks use the state as the root frame and can be fed
+        directly to flamegraph.pl or speedscope.
+        """
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+
+        for key, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(self.output_dir, f"{key}.prof"))
+
+        with open(os.path.join(self.output_dir, "stacks.collapsed"), "w") as f:
+            for key, stacks in self.stacks.items():
+                for stack, count in stacks.items():
+                    f.write(f"{key};{stack} {count}\n")
+
+        print(f"Wrote profiles for {len(self.profiles)} states to {self.output_dir}")
+
+    def _sample_loop(self):
+        """Periodically record the main thread's call stack"""
+        while self._sampling:
+            time.sleep(self.sample_interval)
+            key = self.current_key
+            frame = sys._current_frames().get(self._thread_id)
+            if key is None or frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stacks = self.stacks.get(key)
+            if stacks is None:
+                stacks = self.stacks[key] = Counter()
+            stacks[";".join(reversed(names))] += 1
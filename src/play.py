@@ -2,42 +2,48 @@
 CypherDetective - A noir-themed detective game where you solve crimes using Cypher queries
 """
 
-from src.enums.colors import Colors
 from src.enums.game_states import GameState
 
+# Only what the first menu frame needs is imported here. The level selector,
+# gameplay (numpy, graph UI) and database (neo4j) modules are imported on
+# first use, see GameManager.update_state and GameManager.db
 from src.states.menu import MenuState
-from src.states.gameplay import GameplayState
-from src.states.level_selector import LevelSelectorState
 
+from src.perf import metrics, StateProfiler
+from src.ui.perf_overlay import PerfOverlay
 from src.cfg.game_cfg import GameConfig
-from src.db.database import DatabaseConnection
-from src.save_handler.save_system import (
-    load_progress,
-    save_progress,
-    complete_level,
-    is_level_unlocked,
-    get_highest_unlocked_level,
-)
 
 import os
+import re
 import sys
+import time
 import pygame
+import argparse
+import threading
+from typing import TYPE_CHECKING
 
-# import psutil
+if TYPE_CHECKING:
+    from src.db.database import DatabaseConnection
 
-# process = psutil.Process(os.getpid())
 
-
-# Initialize Pygame
-pygame.init()
+def init_pygame():
+    """Initialize the pygame subsystems the game uses (not audio or joysticks)"""
+    pygame.display.init()
+    pygame.font.init()
 
 
 class GameManager:
     """Main game class"""
 
-    def __init__(self):
+    def __init__(self, profiler: StateProfiler = None, db: "DatabaseConnection" = None):
+        init_pygame()
         self.cfg = GameConfig()
         self.running = True
+        # Connected on first use or in the background after the first frame
+        self._db = None
+        self._db_lock = threading.Lock()
+        if db is not None:
+            self.db = db
         self.screen = pygame.display.set_mode(
             (self.cfg.screen_width, self.cfg.screen_height)
         )
@@ -49,20 +55,72 @@ class GameManager:
         pygame.display.set_icon(self.icon)
         pygame.display.set_caption("CypherDetective")
         self.clock = pygame.time.Clock()
-
-        self.db = DatabaseConnection()
+        self.metrics = metrics
+        self.perf_overlay = PerfOverlay(self.metrics, self.cfg.font_tiny)
+        self.profiler = profiler
         self.current_level = None
 
+    @property
+    def db(self) -> "DatabaseConnection":
+        """Database connection, connected on first use if not connected yet"""
+        if self._db is None:
+            with self._db_lock:
+                if self._db is None:
+                    from src.db.database import DatabaseConnection
+
+                    self.db = DatabaseConnection()
+        return self._db
+
+    @db.setter
+    def db(self, db: "DatabaseConnection"):
+        if self.cfg.query_cost_gate and db.cost_gate is None:
+            from src.db.cost_gate import QueryCostGate
+
+            db.cost_gate = QueryCostGate(self.cfg.max_estimated_rows)
+        self._db = db
+
+    def connect_in_background(self):
+        """Connect to the database on a worker thread while the menu is shown"""
+
+        def connect():
+            try:
+                self.db
+            except Exception:
+                pass  # Reported by DatabaseConnection, retried on first use
+
+        if self._db is None:
+            threading.Thread(target=connect, name="db-connect", daemon=True).start()
+
     def run(self):
         """Main game loop"""
+        if self.profiler:
+            self.profiler.start()
+
+        connecting = False
         while self.running:
+            if self.profiler:
+                self.profiler.set_state(self.profile_key())
             time_delta = self.clock.tick(self.cfg.fps) / 1000.0
-            self.handle_events()
-            self.update(time_delta)
-            self.render()
+            with self.metrics.timed("handle_events"):
+                self.handle_events()
+            if self.profiler:
+                # Events may have switched the state
+                self.profiler.set_state(self.profile_key())
+            with self.metrics.timed("update"):
+                self.update(time_delta)
+            with self.metrics.timed("render"):
+                self.render()
+            self.metrics.end_frame()
+            if not connecting:
+                # The menu is on screen, connect while the player reads it
+                self.connect_in_background()
+                connecting = True
 
-        if self.db:
-            self.db.close()
+        if self.profiler:
+            self.profiler.stop()
+            self.profiler.write()
+        if self._db:
+            self._db.close()
         pygame.quit()
         sys.exit()
 
@@ -73,15 +131,21 @@ class GameManager:
                 self.running = False
                 return
 
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.perf_overlay.toggle()
+                    continue
+                elif event.key == pygame.K_F4:
+                    self.dump_metrics()
+                    continue
+
             # Delegate event handling to current state
             self.state.handle_event(event)
 
     def update(self, time_delta):
         """Update game"""
-        # cpu = process.cpu_percent(interval=None)
-        # mem = process.memory_info().rss / (1024**2)  # in MB
-        # print(f"CPU usage: {cpu:.2f}%, Memory usage: {mem:.2f} MB")
         self.state.update(time_delta)
+        self.perf_overlay.update(time_delta)
 
     def update_state(self, state: GameState):
         match state:
@@ -89,20 +153,42 @@ class GameManager:
                 if not isinstance(self.state, MenuState):
                     self.state = MenuState(self)
             case GameState.LEVEL_SELECTOR:
+                from src.states.level_selector import LevelSelectorState
+
                 if not isinstance(self.state, LevelSelectorState):
                     self.state = LevelSelectorState(self)
             case GameState.GAMEPLAY:
+                from src.states.gameplay import GameplayState
+
                 if not isinstance(self.state, GameplayState):
                     self.state = GameplayState(self)
             case _:
                 raise ValueError(f"Invalid game state: {state}")
 
+    def profile_key(self) -> str:
+        """Get the profile name of the active state (e.g. gameplay.query_input)"""
+        name = type(self.state).__name__.removesuffix("State")
+        key = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+        sub_state = getattr(self.state, "sub_state", None)
+        if sub_state is not None:
+            key = f"{key}.{sub_state.name.lower()}"
+        return key
+
     def render(self):
         """Render the current game display"""
         # Delegate rendering to current state
         self.state.render()
+        self.perf_overlay.render(self.screen)
         pygame.display.flip()
 
+    def dump_metrics(self):
+        """Write the current performance metrics to a JSON file"""
+        path = os.path.join(
+            ".user_data", f"metrics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        self.metrics.dump_json(path)
+        print(f"Wrote performance metrics to {path}")
+
     # TODO: Move to a util folder
     def wrap_text(self, text, font, max_width):
         """Wrap text to fit within max_width"""
@@ -128,7 +214,67 @@ class GameManager:
 
 def main():
     """Entry point"""
-    game = GameManager()
+    parser = argparse.ArgumentParser(description="CypherDetective")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the session per game state and write the profiles on exit",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=os.path.join(".user_data", "profiles", time.strftime("%Y%m%d_%H%M%S")),
+        help="Directory for profile output (default: .user_data/profiles/<timestamp>)",
+    )
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record all database query results to a file (e.g. session.json.gz)",
+    )
+    traffic.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="Serve database queries from a recording instead of the server",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Latency added to every replayed query, in milliseconds",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=0.0,
+        help="Maximum random extra latency per replayed query, in milliseconds",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="Load level graphs from a binary graph snapshot (see src.db.snapshot)",
+    )
+    args = parser.parse_args()
+
+    db = None
+    if args.replay:
+        from src.db.database import DatabaseConnection
+        from src.db.replay import ReplayDriver
+
+        driver = ReplayDriver(
+            args.replay,
+            latency=args.latency_ms / 1000.0,
+            jitter=args.jitter_ms / 1000.0,
+        )
+        db = DatabaseConnection(driver=driver)
+    elif args.record:
+        from src.db.database import DatabaseConnection
+
+        db = DatabaseConnection(record_path=args.record)
+
+    profiler = StateProfiler(args.profile_dir) if args.profile else None
+    game = GameManager(profiler, db)
+    if args.snapshot:
+        game.cfg.graph_snapshot = args.snapshot
     game.run()
 
 
@@ -3,6 +3,7 @@ Save and load system for CypherDetective game progress
 """
 
 import os
+import copy
 import json
 from typing import Dict, Any
 
@@ -10,6 +11,11 @@ from typing import Dict, Any
 SAVE_DIR = ".user_data"
 SAVE_FILE = os.path.join(SAVE_DIR, "progress.json")
 
+# Progress as last loaded or saved, so lookups don't read the file each time
+_progress_cache = None
+# Bumped on every save, lets screens cache what they draw from the progress
+_progress_version = 0
+
 
 def ensure_save_dir():
     """Ensure the save directory exists"""
@@ -24,6 +30,10 @@ def load_progress() -> Dict[str, Any]:
     Returns:
         Dictionary containing progress data, or default if file doesn't exist
     """
+    global _progress_cache
+    if _progress_cache is not None:
+        return copy.deepcopy(_progress_cache)
+
     ensure_save_dir()
 
     default_progress = {
@@ -34,6 +44,7 @@ def load_progress() -> Dict[str, Any]:
     }
 
     if not os.path.exists(SAVE_FILE):
+        _progress_cache = copy.deepcopy(default_progress)
         return default_progress
 
     try:
@@ -43,6 +54,7 @@ def load_progress() -> Dict[str, Any]:
             for key in default_progress:
                 if key not in progress:
                     progress[key] = default_progress[key]
+            _progress_cache = copy.deepcopy(progress)
             return progress
     except Exception as e:
         print(f"Error loading progress: {e}")
@@ -56,6 +68,9 @@ def save_progress(progress: Dict[str, Any]):
     Args:
         progress: Dictionary containing progress data
     """
+    global _progress_cache, _progress_version
+    _progress_cache = None  # Reloaded (with defaults) on the next lookup
+    _progress_version += 1
     ensure_save_dir()
 
     try:
@@ -93,3 +108,8 @@ def get_highest_unlocked_level() -> int:
     """Get the highest unlocked level number"""
     progress = load_progress()
     return progress["highest_level_unlocked"]
+
+
+def get_progress_version() -> int:
+    """Get a counter that changes whenever the progress is saved"""
+    return _progress_version
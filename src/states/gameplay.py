@@ -2,8 +2,12 @@ from src.enums.colors import Colors
 from src.states.state_interface import StateInterface
 from src.enums.game_states import GamePlayState, GameState
 from src.ui.gameplay_ui import create_graph_visualization, GraphVisualization
+from src.ui.result_table import ResultTable
+from src.db.preview import QueryPreview
+from src.perf import metrics
 
 import os
+import time
 import pygame
 import pygame_gui
 
@@ -27,6 +31,7 @@ class GameplayState(StateInterface):
         self.query_input = None
         self.submit_button = None
         self.hint_button = None
+        self.preview_button = None
 
         # Hint state
         self.hint_shown = False
@@ -40,14 +45,26 @@ class GameplayState(StateInterface):
 
         # query result
         self.query_result = None
+        self.result_table: Optional[ResultTable] = None
 
         # graph visualization
         self.graph_visualization: Optional[GraphVisualization] = None
 
+        # live query preview
+        self.query_preview: Optional[QueryPreview] = None
+        self.preview_table: Optional[ResultTable] = None
+        if self.game.cfg.live_preview:
+            self._set_live_preview(True)
+
     def handle_event(self, event: Event):
         # Process pygame_gui events first
         self.pygame_gui_manager.process_events(event)
 
+        # Scroll the result table
+        if self.sub_state == GamePlayState.RESULT_TABLE and self.result_table:
+            if self.result_table.handle_event(event):
+                return
+
         # Pass events to graph visualization
         if self.graph_visualization:
             consumed = self.graph_visualization.handle_event(event)
@@ -70,6 +87,9 @@ class GameplayState(StateInterface):
                     # Second click: show answer
                     self.answer_shown = True
                 return
+            elif event.ui_object_id == "#preview_button":
+                self._set_live_preview(self.query_preview is None)
+                return
 
         if event.type == pygame.KEYDOWN:
             if self.sub_state == GamePlayState.QUERY_INPUT:
@@ -79,7 +99,9 @@ class GameplayState(StateInterface):
                     self.game.update_state(GameState.LEVEL_SELECTOR)
 
             elif self.sub_state == GamePlayState.QUERY_RESULT:
-                if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
+                if event.key == pygame.K_r and self.query_result:
+                    self._open_result_table()
+                elif event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
                     if self.success_message:
                         # Level completed, go back to level select
                         self.clean_up()
@@ -97,6 +119,10 @@ class GameplayState(StateInterface):
                     self.game.current_level = None
                     self.game.update_state(GameState.LEVEL_SELECTOR)
 
+            elif self.sub_state == GamePlayState.RESULT_TABLE:
+                if event.key in (pygame.K_ESCAPE, pygame.K_RETURN, pygame.K_r):
+                    self.sub_state = GamePlayState.QUERY_RESULT
+
     def render(self):
         """Render gameplay screen based on substate"""
         if self.sub_state == GamePlayState.QUERY_INPUT:
@@ -105,20 +131,63 @@ class GameplayState(StateInterface):
             self._render_query_result()
         elif self.sub_state == GamePlayState.HIDDEN_RESULT:
             self._render_hidden_result()
+        elif self.sub_state == GamePlayState.RESULT_TABLE:
+            self._render_result_table()
 
     def update(self, time_delta: float):
         """Update the state"""
         self.pygame_gui_manager.update(time_delta)
 
+        if self.query_preview and self.sub_state == GamePlayState.QUERY_INPUT:
+            if self.query_input:
+                self.query_preview.set_query(self.query_input.get_text())
+            self.query_preview.update()
+
     def clean_up(self):
         """Clean up the state"""
+        self._set_live_preview(False)
         if self.graph_visualization:
             self.graph_visualization.clean_up()
             self.graph_visualization = None
 
+    def _set_live_preview(self, enabled: bool):
+        """Turn the live query preview on or off"""
+        if enabled and self.query_preview is None:
+            cfg = self.game.cfg
+            self.query_preview = QueryPreview(
+                self.game.db,
+                debounce=cfg.preview_debounce,
+                timeout=cfg.preview_timeout,
+                max_rows=cfg.preview_max_rows,
+            )
+        elif not enabled and self.query_preview is not None:
+            self.query_preview.close()
+            self.query_preview = None
+            self.preview_table = None
+        if self.preview_button:
+            self.preview_button.set_text(
+                "Preview: On" if self.query_preview else "Preview: Off"
+            )
+
+    def _open_result_table(self):
+        """Show the rows of the last query result in the RESULT_TABLE substate"""
+        if self.result_table is None or self.result_table.rows is not self.query_result:
+            margin = 50
+            rect = pygame.Rect(
+                margin,
+                100,
+                self.game.cfg.screen_width - 2 * margin,
+                self.game.cfg.screen_height - 170,
+            )
+            self.result_table = ResultTable(
+                self.query_result, rect, self.game.cfg.font_tiny
+            )
+        self.sub_state = GamePlayState.RESULT_TABLE
+
     def _render_query_input(self):
         """Render substate QUERY_INPUT screen"""
         screen = self.game.screen
+        text_start = time.perf_counter()
         screen.fill(Colors.DARK_BG.value)
 
         # Level title
@@ -217,6 +286,19 @@ class GameplayState(StateInterface):
                 object_id="#submit_button",
             )
 
+            # Live preview toggle, next to the submit button
+            self.preview_button = pygame_gui.elements.UIButton(
+                relative_rect=pygame.Rect(
+                    button_x + button_width + button_padding,
+                    button_y,
+                    button_width,
+                    button_height,
+                ),
+                text="Preview: On" if self.query_preview else "Preview: Off",
+                manager=self.pygame_gui_manager,
+                object_id="#preview_button",
+            )
+
             # Create hint button in bottom right corner of input box (if hint exists)
             if self.game.current_level.hint and not self.hint_button:
                 # Parse hint text to separate hint from answer
@@ -288,19 +370,24 @@ class GameplayState(StateInterface):
             "bottom_y": input_box.bottom,
         }
 
-        # Initialize and render graph visualization
-        if not self.graph_visualization and self.game.current_level:
-            # Create graph with proper positioning
-            graph_rect = pygame.Rect(
-                self._right_column_info["x"],
-                self._right_column_info["top_y"],
-                self._right_column_info["width"],
-                self._right_column_info["bottom_y"] - self._right_column_info["top_y"],
+        if self.query_preview:
+            self._render_preview(
+                pygame.Rect(
+                    right_x,
+                    input_box.bottom + 10,
+                    right_width,
+                    screen_height - 80 - input_box.bottom,
+                )
             )
-            self.graph_visualization = create_graph_visualization(self, graph_rect)
-        elif self.graph_visualization and self.game.current_level:
-            # Update graph rect if layout changed
-            if hasattr(self, "_right_column_info"):
+
+        metrics.record(
+            "render.gameplay.text", (time.perf_counter() - text_start) * 1000.0
+        )
+
+        # Initialize and render graph visualization
+        with metrics.timed("render.gameplay.graph"):
+            if not self.graph_visualization and self.game.current_level:
+                # Create graph with proper positioning
                 graph_rect = pygame.Rect(
                     self._right_column_info["x"],
                     self._right_column_info["top_y"],
@@ -308,19 +395,31 @@ class GameplayState(StateInterface):
                     self._right_column_info["bottom_y"]
                     - self._right_column_info["top_y"],
                 )
-                self.graph_visualization.rect = graph_rect
-            # Reload graph if level changed
-            if (
-                self.graph_visualization.current_level
-                != self.game.current_level.level_num
-            ):
-                self.graph_visualization.load_graph_for_level(
-                    self.game.current_level.level_num
-                )
-            # Render graph
-            self.graph_visualization.render(screen)
+                self.graph_visualization = create_graph_visualization(self, graph_rect)
+            elif self.graph_visualization and self.game.current_level:
+                # Update graph rect if layout changed
+                if hasattr(self, "_right_column_info"):
+                    graph_rect = pygame.Rect(
+                        self._right_column_info["x"],
+                        self._right_column_info["top_y"],
+                        self._right_column_info["width"],
+                        self._right_column_info["bottom_y"]
+                        - self._right_column_info["top_y"],
+                    )
+                    self.graph_visualization.rect = graph_rect
+                # Reload graph if level changed
+                if (
+                    self.graph_visualization.current_level
+                    != self.game.current_level.level_num
+                ):
+                    self.graph_visualization.load_graph_for_level(
+                        self.game.current_level.level_num
+                    )
+                # Render graph
+                self.graph_visualization.render(screen)
 
-        self.pygame_gui_manager.draw_ui(screen)
+        with metrics.timed("render.gameplay.gui"):
+            self.pygame_gui_manager.draw_ui(screen)
 
         # Instructions
         instructions = [
@@ -362,6 +461,40 @@ class GameplayState(StateInterface):
         )
         screen.blit(next_text, next_rect)
 
+    def _render_preview(self, panel: pygame.Rect):
+        """Render the live preview panel with the latest preview result"""
+        screen = self.game.screen
+        font = self.game.cfg.font_tiny
+        result = self.query_preview.result
+
+        if self.query_preview.busy:
+            status, color = "running...", Colors.TEXT_DIM.value
+        elif result is None:
+            status, color = "start typing a query", Colors.TEXT_DIM.value
+        elif result["error"]:
+            status, color = result["error"], Colors.ERROR.value
+        else:
+            rows = len(result["rows"])
+            status = f"first {rows} rows" if result["truncated"] else f"{rows} rows"
+            status += f" in {result['elapsed_ms']:.0f} ms"
+            color = Colors.TEXT.value
+
+        label = font.render("LIVE PREVIEW:", True, Colors.ACCENT.value)
+        screen.blit(label, (panel.x, panel.y))
+        status_text = font.render(status, True, color)
+        screen.blit(
+            status_text,
+            (panel.x + label.get_width() + 8, panel.y),
+            pygame.Rect(0, 0, panel.width - label.get_width() - 8, panel.height),
+        )
+
+        if not result or result["error"] or not result["rows"]:
+            return
+        table_rect = pygame.Rect(panel.x, panel.y + 22, panel.width, panel.height - 22)
+        if self.preview_table is None or self.preview_table.rows is not result["rows"]:
+            self.preview_table = ResultTable(result["rows"], table_rect, font)
+        self.preview_table.render(screen)
+
     def _render_query_result(self):
         """Render substate QUERY_RESULT screen"""
         screen = self.game.screen
@@ -404,6 +537,22 @@ class GameplayState(StateInterface):
                 )
                 screen.blit(message, message_rect)
 
+            if self.query_result is not None:
+                summary = f"Your query returned {len(self.query_result)} rows"
+                if self.graph_visualization:
+                    highlighted = len(self.graph_visualization.highlighted_nodes)
+                    summary += f", {highlighted} nodes are highlighted in the graph"
+                summary_text = self.game.cfg.font_small.render(
+                    summary, True, Colors.TEXT.value
+                )
+                summary_rect = summary_text.get_rect(
+                    center=(
+                        self.game.cfg.screen_width // 2,
+                        self.game.cfg.screen_height // 2 + 50,
+                    )
+                )
+                screen.blit(summary_text, summary_rect)
+
             retry_text = self.game.cfg.font_small.render(
                 "Press ENTER to try again", True, Colors.TEXT.value
             )
@@ -414,3 +563,40 @@ class GameplayState(StateInterface):
                 )
             )
             screen.blit(retry_text, retry_rect)
+
+        if self.query_result:
+            table_text = self.game.cfg.font_small.render(
+                "Press R to view the returned rows", True, Colors.TEXT_DIM.value
+            )
+            table_rect = table_text.get_rect(
+                center=(
+                    self.game.cfg.screen_width // 2,
+                    self.game.cfg.screen_height // 2 + 150,
+                )
+            )
+            screen.blit(table_text, table_rect)
+
+    def _render_result_table(self):
+        """Render substate RESULT_TABLE screen"""
+        screen = self.game.screen
+        screen.fill(Colors.DARK_BG.value)
+
+        title = self.game.cfg.font_medium.render(
+            f"Query result: {len(self.query_result)} rows", True, Colors.ACCENT.value
+        )
+        title_rect = title.get_rect(center=(self.game.cfg.screen_width // 2, 50))
+        screen.blit(title, title_rect)
+
+        with metrics.timed("render.gameplay.result_table"):
+            self.result_table.render(screen)
+
+        first, last = self.result_table.visible_range()
+        footer = self.game.cfg.font_tiny.render(
+            f"Rows {first}-{last} of {len(self.query_result)}    "
+            "Arrows/PgUp/PgDn/Home/End or mouse wheel to scroll, ESC to go back",
+            True,
+            Colors.TEXT_DIM.value,
+        )
+        screen.blit(
+            footer, (self.result_table.rect.x, self.result_table.rect.bottom + 15)
+        )
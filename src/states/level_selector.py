@@ -1,7 +1,7 @@
-from src.enums.colors import Colors
 from src.enums.game_states import GameState
-from src.levels import get_level, get_total_levels
+from src.levels import get_level
 from src.states.state_interface import StateInterface
+from src.ui.level_selector_ui import LevelSelectorUI
 from src.save_handler.save_system import is_level_unlocked, save_progress
 
 import pygame
@@ -13,6 +13,7 @@ from pygame.event import Event
 class LevelSelectorState(StateInterface):
     def __init__(self, game):
         self.game = game
+        self.ui = LevelSelectorUI(game.cfg)
         self.reset_progress_rect = None
         self.showing_confirmation = False
         self.confirmation_result = None
@@ -55,6 +56,10 @@ class LevelSelectorState(StateInterface):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.game.update_state(GameState.MENU)
+            elif event.key in [pygame.K_LEFT, pygame.K_PAGEUP]:
+                self.ui.set_page(self.ui.page - 1)
+            elif event.key in [pygame.K_RIGHT, pygame.K_PAGEDOWN]:
+                self.ui.set_page(self.ui.page + 1)
             elif event.key in [
                 pygame.K_0,
                 pygame.K_1,
@@ -67,114 +72,22 @@ class LevelSelectorState(StateInterface):
                 pygame.K_8,
                 pygame.K_9,
             ]:
-                level_num = int(event.unicode)
-                if is_level_unlocked(level_num):
+                level_num = self.ui.level_on_page(int(event.unicode))
+                if get_level(level_num) and is_level_unlocked(level_num):
                     self.start_level(level_num)
                     self.game.update_state(GameState.GAMEPLAY)
 
     def render(self):
         """Render level selection screen"""
-        screen = self.game.screen
-        screen.fill(Colors.DARK_BG.value)
-
-        # Title
-        title = self.game.cfg.font_large.render(
-            "Select Level", True, Colors.ACCENT.value
-        )
-        title_rect = title.get_rect(center=(self.game.cfg.screen_width // 2, 100))
-        screen.blit(title, title_rect)
-
-        # Level buttons - layout for 10 levels (0-9)
-        total_levels = get_total_levels()
-
-        button_width = 300
-        button_height = 80
-        spacing = 100
-
-        # Center the gap between columns on the screen
-        gap_width = 200
-        center_x = self.game.cfg.screen_width // 2
-
-        # Left column: levels 0-4
-        left_column_x = center_x - button_width - gap_width // 2
-        # Right column: levels 5-9
-        right_column_x = center_x + gap_width // 2
-
-        start_y = 200
-
-        for i in range(0, total_levels):
-            level = get_level(i)
-
-            # Determine column and position
-            if i <= 4:
-                # Left column (levels 0-4)
-                x = left_column_x
-                y = start_y + i * spacing
-            else:
-                # Right column (levels 5-9)
-                x = right_column_x
-                y = start_y + (i - 5) * spacing
-
-            # Check if unlocked
-            unlocked = is_level_unlocked(i)
-
-            # Button background
-            color = Colors.LIGHT_BG.value if unlocked else Colors.DARKER_BG.value
-            border_color = Colors.ACCENT.value if unlocked else Colors.TEXT_DIM.value
-
-            button_rect = pygame.Rect(x, y, button_width, button_height)
-            pygame.draw.rect(screen, color, button_rect)
-            pygame.draw.rect(screen, border_color, button_rect, 2)
-
-            # Level text
-            if unlocked:
-                level_text = self.game.cfg.font_medium.render(
-                    f"Level {i}: {level.title}", True, Colors.TEXT_BRIGHT.value
-                )
-            else:
-                level_text = self.game.cfg.font_medium.render(
-                    f"Level {i}: Locked", True, Colors.TEXT_DIM.value
-                )
-
-            text_rect = level_text.get_rect(center=button_rect.center)
-            screen.blit(level_text, text_rect)
-
-            # Key hint
-            if unlocked:
-                key_text = self.game.cfg.font_tiny.render(
-                    f"Press {i} to play", True, Colors.TEXT_DIM.value
-                )
-                key_rect = key_text.get_rect(
-                    center=(button_rect.centerx, button_rect.centery + 25)
-                )
-                screen.blit(key_text, key_rect)
-
-        # Back instruction
-        back_text = self.game.cfg.font_small.render(
-            "Press ESC to return to menu", True, Colors.TEXT_DIM.value
-        )
-        back_rect = back_text.get_rect(
-            center=(self.game.cfg.screen_width // 2, self.game.cfg.screen_height - 50)
-        )
-        screen.blit(back_text, back_rect)
-
-        # Reset progress button
-        reset_text = self.game.cfg.font_small.render(
-            "Reset progress", True, Colors.ERROR.value
-        )
-        reset_rect = reset_text.get_rect(
-            center=(self.game.cfg.screen_width - 100, self.game.cfg.screen_height - 50)
-        )
-        reset_rect.inflate_ip(20, 20)
-        self.reset_progress_rect = reset_rect
-        pygame.draw.rect(screen, Colors.ERROR.value, reset_rect, 2)
-
-        text_pos = reset_text.get_rect(center=reset_rect.center)
-        screen.blit(reset_text, text_pos)
-
-        # Render confirmation dialog if showing
+        # The screen is pre-rendered and only rebuilt when progress changes
         if self.showing_confirmation:
-            self._render_confirmation_dialog(screen)
+            surface = self.ui.dialog_surface()
+            self._yes_button_rect = self.ui.yes_button_rect
+            self._no_button_rect = self.ui.no_button_rect
+        else:
+            surface = self.ui.grid_surface()
+        self.reset_progress_rect = self.ui.reset_progress_rect
+        self.game.screen.blit(surface, (0, 0))
 
     def update(self, time_delta: float):
         """Update the state"""
@@ -185,96 +98,6 @@ class LevelSelectorState(StateInterface):
                 save_progress({})
             self.confirmation_result = None
 
-    def _render_confirmation_dialog(self, screen: pygame.Surface):
-        """Render a confirmation dialog overlay"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface(
-            (self.game.cfg.screen_width, self.game.cfg.screen_height)
-        )
-        overlay.set_alpha(200)
-        overlay.fill(Colors.DARKER_BG.value)
-        screen.blit(overlay, (0, 0))
-
-        # Dialog box
-        dialog_width = 500
-        dialog_height = 200
-        dialog_x = (self.game.cfg.screen_width - dialog_width) // 2
-        dialog_y = (self.game.cfg.screen_height - dialog_height) // 2
-        dialog_rect = pygame.Rect(dialog_x, dialog_y, dialog_width, dialog_height)
-
-        # Draw dialog background
-        pygame.draw.rect(screen, Colors.DARK_BG.value, dialog_rect)
-        pygame.draw.rect(screen, Colors.BORDER.value, dialog_rect, 3)
-
-        # Title
-        title_text = self.game.cfg.font_medium.render(
-            "Reset Progress?", True, Colors.ERROR.value
-        )
-        title_rect = title_text.get_rect(
-            center=(dialog_rect.centerx, dialog_rect.y + 40)
-        )
-        screen.blit(title_text, title_rect)
-
-        # Message
-        message_text = self.game.cfg.font_small.render(
-            "Are you sure you want to reset all progress?",
-            True,
-            Colors.TEXT.value,
-        )
-        message_rect = message_text.get_rect(
-            center=(dialog_rect.centerx, dialog_rect.y + 80)
-        )
-        screen.blit(message_text, message_rect)
-
-        sub_message_text = self.game.cfg.font_tiny.render(
-            "This action cannot be undone.",
-            True,
-            Colors.TEXT_DIM.value,
-        )
-        sub_message_rect = sub_message_text.get_rect(
-            center=(dialog_rect.centerx, dialog_rect.y + 110)
-        )
-        screen.blit(sub_message_text, sub_message_rect)
-
-        # Yes button
-        yes_button_width = 120
-        yes_button_height = 40
-        yes_button_x = dialog_rect.centerx - yes_button_width - 20
-        yes_button_y = dialog_rect.bottom - yes_button_height - 30
-        self._yes_button_rect = pygame.Rect(
-            yes_button_x, yes_button_y, yes_button_width, yes_button_height
-        )
-        pygame.draw.rect(screen, Colors.ERROR.value, self._yes_button_rect)
-        pygame.draw.rect(screen, Colors.TEXT_BRIGHT.value, self._yes_button_rect, 2)
-        yes_text = self.game.cfg.font_small.render(
-            "Yes", True, Colors.TEXT_BRIGHT.value
-        )
-        yes_text_rect = yes_text.get_rect(center=self._yes_button_rect.center)
-        screen.blit(yes_text, yes_text_rect)
-
-        # No button
-        no_button_width = 120
-        no_button_height = 40
-        no_button_x = dialog_rect.centerx + 20
-        no_button_y = dialog_rect.bottom - no_button_height - 30
-        self._no_button_rect = pygame.Rect(
-            no_button_x, no_button_y, no_button_width, no_button_height
-        )
-        pygame.draw.rect(screen, Colors.LIGHT_BG.value, self._no_button_rect)
-        pygame.draw.rect(screen, Colors.BORDER.value, self._no_button_rect, 2)
-        no_text = self.game.cfg.font_small.render("No", True, Colors.TEXT.value)
-        no_text_rect = no_text.get_rect(center=self._no_button_rect.center)
-        screen.blit(no_text, no_text_rect)
-
-        # Instructions
-        instruction_text = self.game.cfg.font_tiny.render(
-            "Press ESC to cancel", True, Colors.TEXT_DIM.value
-        )
-        instruction_rect = instruction_text.get_rect(
-            center=(dialog_rect.centerx, dialog_rect.bottom - 15)
-        )
-        screen.blit(instruction_text, instruction_rect)
-
     def start_level(self, level_num):
         """Start a specific level"""
         self.game.current_level = get_level(level_num)
@@ -1,10 +1,12 @@
 from src.enums.colors import Colors
 from src.enums.game_states import GameState
 from src.states.state_interface import StateInterface
+from src.perf import metrics
 
 import os
 import json
 import math
+import time
 import pygame
 import pygame_gui
 
@@ -68,6 +70,7 @@ class MenuState(StateInterface):
     def render(self):
         """Render main menu with noir effects"""
         screen = self.game.screen
+        text_start = time.perf_counter()
 
         # Calculate flicker effect using sine waves for smooth variation
         # Multiple sine waves at different frequencies create more natural flicker
@@ -200,8 +203,11 @@ class MenuState(StateInterface):
                 object_id="#case_details_button",
             )
 
+        metrics.record("render.menu.text", (time.perf_counter() - text_start) * 1000.0)
+
         # Draw pygame_gui elements first
-        self.pygame_gui_manager.draw_ui(screen)
+        with metrics.timed("render.menu.gui"):
+            self.pygame_gui_manager.draw_ui(screen)
 
         # Blit button image on top (positioned where the button is)
         if self.case_button:
@@ -0,0 +1,164 @@
+import html
+import pygame
+import pygame_gui
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class DetailsPanel:
+    """
+    Reusable overlay panel with the details of a node or relationship
+
+    The pygame_gui elements are created once and then moved, resized and
+    refilled in place; closing the panel only hides them. The formatted HTML
+    of each item is cached, so showing an item again doesn't format its
+    properties again.
+    """
+
+    def __init__(
+        self,
+        manager: pygame_gui.UIManager,
+        width: int = 300,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            manager: UI manager the panel elements belong to
+            width: Panel width in pixels
+            cache_size: Maximum number of cached formatted items
+        """
+        self.manager = manager
+        self.width = width
+        self.cache_size = cache_size
+
+        self.line_height = 25
+        self.max_text_height = 400
+        self.instruction_height = 25  # Space for instruction text
+        self.border_thickness = 1
+        self.padding = 10
+
+        self.panel = None
+        self.text_box = None
+        self.instruction_label = None
+        self.key: Optional[Hashable] = None  # Item currently shown
+        self._html = None
+        self._height = None
+        self._cache: "OrderedDict[Hashable, Tuple[str, int]]" = OrderedDict()
+
+    @property
+    def visible(self) -> bool:
+        return self.panel is not None and self.panel.visible
+
+    @staticmethod
+    def format_lines(header: List[str], properties: Dict[str, Any]) -> List[str]:
+        """Format header lines and the (non-visibility) properties as HTML lines"""
+        lines = [html.escape(line) for line in header]
+        shown = {k: v for k, v in properties.items() if not k.startswith("graph_")}
+        if shown:
+            lines.append("Properties:")
+            for key, value in shown.items():
+                lines.append(html.escape(f"  {key}: {value}"))
+        else:
+            lines.append("No properties")
+        return lines
+
+    def cached(self, key: Hashable) -> bool:
+        """Whether the formatted content of an item is cached"""
+        return key in self._cache
+
+    def store(self, key: Hashable, lines: List[str]):
+        """Cache the formatted content of an item"""
+        self._cache[key] = ("<br>".join(lines), len(lines))
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop all formatted content (e.g. when the graph is reloaded)"""
+        self._cache.clear()
+        self.key = None
+
+    def show(self, key: Hashable, anchor: Tuple[float, float]):
+        """
+        Show a cached item with the panel's top center at anchor
+
+        Args:
+            key: Key the item's content was stored under
+            anchor: Screen position of the panel's top center
+        """
+        self._cache.move_to_end(key)
+        html_text, line_count = self._cache[key]
+        height = (
+            min(self.max_text_height, line_count * self.line_height + 40)
+            + self.instruction_height
+        )
+        if self.panel is None:
+            self._build(height)
+
+        if height != self._height:
+            self._resize(height)
+        if html_text != self._html:
+            self.text_box.set_text(html_text)
+            self._html = html_text
+        self.panel.set_relative_position(
+            (int(anchor[0] - self.width / 2), int(anchor[1]))
+        )
+        self.key = key
+        self.panel.show()
+
+    def hide(self):
+        """Hide the panel, keeping its elements for the next item"""
+        self.key = None
+        if self.panel is not None and self.panel.visible:
+            self.panel.hide()
+
+    def kill(self):
+        """Destroy the panel elements"""
+        if self.panel is not None:
+            self.panel.kill()
+        self.panel = self.text_box = self.instruction_label = None
+        self._html = self._height = self.key = None
+
+    def _text_size(self, height: int) -> Tuple[int, int]:
+        border = 2 * self.border_thickness
+        return (
+            self.width - 2 * self.padding - border,
+            height - 2 * self.padding - self.instruction_height - border,
+        )
+
+    def _instruction_position(self, height: int) -> Tuple[int, int]:
+        return (self.padding, height - self.instruction_height - 5)
+
+    def _build(self, height: int):
+        """Create the panel elements"""
+        self.panel = pygame_gui.elements.UIPanel(
+            relative_rect=pygame.Rect(0, 0, self.width, height),
+            manager=self.manager,
+            object_id="#details_panel",
+        )
+        # Leave room for the instruction at the bottom
+        self.text_box = pygame_gui.elements.UITextBox(
+            relative_rect=pygame.Rect(
+                (self.padding, self.padding), self._text_size(height)
+            ),
+            html_text="",
+            manager=self.manager,
+            container=self.panel,
+        )
+        self.instruction_label = pygame_gui.elements.UILabel(
+            relative_rect=pygame.Rect(
+                self._instruction_position(height),
+                (self.width - 2 * self.padding, self.instruction_height),
+            ),
+            text="Press 'TAB' to close",
+            manager=self.manager,
+            container=self.panel,
+        )
+        self._html = ""
+        self._height = height
+
+    def _resize(self, height: int):
+        """Fit the panel elements to a new content height"""
+        self.panel.set_dimensions((self.width, height))
+        self.text_box.set_dimensions(self._text_size(height))
+        self.instruction_label.set_relative_position(self._instruction_position(height))
+        self._height = height
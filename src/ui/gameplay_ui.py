@@ -1,33 +1,50 @@
 import math
 import pygame
-import pygame_gui
-import networkx as nx
+import numpy as np
 from src.enums.colors import Colors
+from src.db.queries import NODES_QUERY, RELATIONSHIPS_QUERY
+from src.db.snapshot import GraphSnapshot, open_snapshot
+from src.db.visibility import graph_index, node_mask
+from src.levels import get_level
+from src.ui.details_panel import DetailsPanel
+from src.ui.graph_model import GraphModel
+from src.ui.layout import create_layout_engine
 
-from typing import TYPE_CHECKING, Tuple, Optional, Set
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Optional, Set
 
 if TYPE_CHECKING:
     from src.states.gameplay import GameplayState
 
+# Caches shared by all visualizations, keyed on the database's dataset version
+# (see DatabaseConnection.dataset_version) so they are dropped when data changes
+_graph_rows = {}  # Dataset version -> (node rows, relationship rows)
+_layout_cache: "OrderedDict[tuple, Tuple[List[str], np.ndarray]]" = OrderedDict()
+_LAYOUT_CACHE_SIZE = 32
+
 
 class GraphVisualization:
-    """Interactive graph visualization using NetworkX and pygame"""
+    """Interactive graph visualization using pygame"""
+
+    # Level-of-detail tiers, picked by the number of nodes in view
+    LOD_DETAIL = 0  # Outlined circles, labels and arrowheads
+    LOD_SIMPLE = 1  # Plain circles and lines
+    LOD_CLUSTER = 2  # Nodes and edges aggregated into screen grid cells
 
     def __init__(self, state: "GameplayState", rect: pygame.Rect):
         self.state = state
         self.rect = rect  # Area where graph is rendered
-        self.graph = nx.DiGraph()
-        self.pos = {}  # Node positions (computed once, kept static)
-        self.node_attributes = {}  # Store node attributes (name, role, etc.)
-        self.edge_attributes = {}  # Store edge attributes
+        self.model = GraphModel.empty()  # Nodes, edges and positions by index
         self.layout_computed = False
+        self.layout_engine = None  # Engine of the last layout (None if cached)
         self.current_level = None
+        self.dataset_version = None  # Version of the data the graph was loaded from
 
-        # Interaction state
-        self.selected_node = None
-        self.selected_edge = None  # Tuple of (source, target) or None
-        self.highlighted_nodes: Set[str] = set()
-        self.dragging_node = None
+        # Interaction state (nodes and edges by index into the model)
+        self.selected_node: Optional[int] = None
+        self.selected_edge: Optional[int] = None
+        self.highlighted_nodes: Set[str] = set()  # Element ids
+        self.dragging_node: Optional[int] = None
         self.drag_offset = (0, 0)
         self.zoom = 1.0
         self.pan_offset = (0, 0)
@@ -43,9 +60,9 @@ class GraphVisualization:
         # Details overlay (for both nodes and edges)
         self.show_node_details = False
         self.show_edge_details = False
-        self.details_node_id = None
-        self.details_edge = None  # Tuple of (source, target) or None
-        self.details_panel = None
+        self.details_node = None
+        self.details_edge = None
+        self.details_panel: Optional[DetailsPanel] = None  # Created on first use
 
         # Visual settings
         self.node_radius = 15
@@ -60,145 +77,173 @@ class GraphVisualization:
         self.selected_color = Colors.SUCCESS.value
         self.highlight_color = Colors.ACCENT.value
 
+        # Level-of-detail settings
+        self.lod_detail_limit = 400  # Max nodes in view for LOD_DETAIL
+        self.lod_simple_limit = 4000  # Max nodes in view for LOD_SIMPLE
+        self.cluster_cell_size = 6  # Pixels per aggregation cell in LOD_CLUSTER
+
+        # Per-node render state (see _build_render_arrays)
+        self._node_color_array = np.zeros((0, 3), dtype=np.uint8)
+        self._highlighted_indices = np.zeros(0, dtype=np.int64)
+        self._highlighted_mask = np.zeros(0, dtype=bool)
+        self._label_cache = {}  # Rendered label surfaces keyed by text
+
     def clean_up(self):
         """Clean up the graph visualization"""
+        if self.details_panel:
+            self.details_panel.kill()
+            self.details_panel = None
         self.state = None
 
+    def _fetch_graph_data(self, version: Optional[str]):
+        """Get all node and relationship rows, from the row cache if still current"""
+        if version is not None and version in _graph_rows:
+            return _graph_rows[version]
+
+        db = self.state.game.db
+        data = (db.execute_query(NODES_QUERY), db.execute_query(RELATIONSHIPS_QUERY))
+        _graph_rows.clear()
+        if version is not None:
+            _graph_rows[version] = data
+        return data
+
+    def _graph_snapshot(self, version: Optional[str]) -> Optional[GraphSnapshot]:
+        """Get the binary snapshot of the database graph, if one is current"""
+        snapshot = getattr(self.state.game.db.driver, "snapshot", None)
+        path = self.state.game.cfg.graph_snapshot
+        if snapshot is None and path:
+            try:
+                snapshot = open_snapshot(path)
+            except Exception as e:
+                print(f"Error opening graph snapshot {path}: {e}")
+                return None
+        if snapshot is not None and snapshot.dataset_version != version:
+            print("Graph snapshot is stale, loading the graph from the database")
+            return None
+        return snapshot
+
+    def _level_model(self, level_num: int, version: Optional[str]) -> GraphModel:
+        """Build the graph model of the nodes and relationships in a level"""
+        snapshot = self._graph_snapshot(version)
+        if snapshot is not None:
+            # Only ids and names are decoded from the memory-mapped arrays
+            visible = snapshot.visible_nodes(level_num)
+            relationships = snapshot.visible_relationships(visible)
+            return GraphModel.from_snapshot(
+                snapshot, np.flatnonzero(visible), np.flatnonzero(relationships)
+            )
+
+        nodes_data, relationships_data = self._fetch_graph_data(version)
+
+        # Filter nodes by level with a single AND over all visibility masks
+        masks = np.fromiter(
+            (node_mask(node["labels"], node["props"]) for node in nodes_data),
+            dtype=np.int64,
+            count=len(nodes_data),
+        )
+        visible = (masks & (1 << graph_index(level_num))) != 0
+        filtered_nodes = [
+            node for node, keep in zip(nodes_data, visible.tolist()) if keep
+        ]
+        # Relationships to filtered out nodes are skipped by the model
+        return GraphModel.from_rows(filtered_nodes, relationships_data)
+
     def load_graph_for_level(self, level_num: int):
-        """Load graph from Neo4j filtered by graph_n property for current level"""
-        if self.current_level == level_num and self.layout_computed:
-            return  # Already loaded for this level
+        """Load graph from Neo4j filtered by the visibility mask for current level"""
+        db = self.state.game.db
+        level = get_level(level_num)
+        if level is not None:
+            # Only query the level's case
+            db.use_case(level.case, level.database)
+        version = db.refresh_dataset_version()
+        if (
+            self.current_level == level_num
+            and self.layout_computed
+            and version is not None
+            and version == self.dataset_version
+        ):
+            return  # Already loaded for this level and data
 
         self.current_level = level_num
-        self.graph.clear()
-        self.node_attributes.clear()
-        self.edge_attributes.clear()
+        self.dataset_version = version
+        self.model = GraphModel.empty()
         self.layout_computed = False
         self.selected_node = None
         self.selected_edge = None
-        self.highlighted_nodes.clear()
+        self.dragging_node = None
+        self.highlight_nodes(set())
+        self._hide_details()
+        if self.details_panel:
+            self.details_panel.clear_cache()  # Indices refer to the old graph
 
         try:
-            # Query all nodes
-            nodes_query = """
-            MATCH (n)
-            RETURN labels(n) as labels, properties(n) as props, elementId(n) as id
-            """
-            # Query all relationships
-            relationships_query = """
-            MATCH (a)-[r]->(b)
-            RETURN elementId(a) as source, type(r) as relationship, 
-                   elementId(b) as target, properties(r) as props
-            """
-            nodes_data = self.state.game.db.execute_query(nodes_query)
-            relationships_data = self.state.game.db.execute_query(relationships_query)
-
-            # Filter nodes by level
-            graph_prop = f"graph_{level_num - 1}" if level_num > 0 else "graph_0"
-            filtered_nodes = []
-            for node in nodes_data:
-                props = node["props"]
-                labels = node["labels"]
-                if ("Suspect" not in labels and "Bank" not in labels) or props.get(
-                    graph_prop, False
-                ):
-                    filtered_nodes.append(node)
-
-            # Filter relationships by nodes
-            filtered_node_ids = {node["id"] for node in filtered_nodes}
-            filtered_relationships = []
-            for rel in relationships_data:
-                if (
-                    rel["source"] in filtered_node_ids
-                    and rel["target"] in filtered_node_ids
-                ):
-                    filtered_relationships.append(rel)
-
-            # Add nodes to NetworkX graph
-            for node in filtered_nodes:
-                node_id = node["id"]
-                labels = node["labels"]
-                props = node["props"]
-                primary_label = labels[0] if labels else "Unknown"
-                node_name = props.get("name", primary_label)
-
-                # Store attributes
-                self.node_attributes[node_id] = {
-                    "labels": labels,
-                    "primary_label": primary_label,
-                    "name": node_name,
-                    "properties": props,
-                }
-                self.graph.add_node(node_id)
-
-            # Add edges
-            for rel in filtered_relationships:
-                source = rel["source"]
-                target = rel["target"]
-                rel_type = rel["relationship"]
-                rel_props = rel.get("props", {})
-
-                if source in self.graph and target in self.graph:
-                    edge_key = (source, target)
-                    self.edge_attributes[edge_key] = {
-                        "type": rel_type,
-                        "properties": rel_props,
-                    }
-                    self.graph.add_edge(source, target)
+            # Visibility masks are numbered by level within the case
+            self.model = self._level_model(
+                level.case_level_num if level is not None else level_num, version
+            )
 
             # Compute layout once
             self._compute_layout()
+            self._build_render_arrays()
             self.layout_computed = True
 
         except Exception as e:
             print(f"Error loading graph for level {level_num}: {e}")
 
     def _compute_layout(self):
-        """Compute node positions using NetworkX layout algorithm"""
-        if len(self.graph) == 0:
+        """Compute node positions with the configured layout engine"""
+        model = self.model
+        if model.num_nodes == 0:
             return
 
-        # Use spring layout for better visualization
-        # Scale to fit within the rect
-        pos = nx.spring_layout(
-            self.graph,
-            k=2.0,
-            iterations=50,
-            seed=73,
+        cfg = self.state.game.cfg
+        key = (
+            self.dataset_version,
+            self.current_level,
+            cfg.layout_engine,
+            cfg.layout_iterations,
+            cfg.layout_time_budget,
         )
-
-        # Scale and translate to fit in rect
-        if pos:
-            # Get bounding box of positions
-            x_coords = [p[0] for p in pos.values()]
-            y_coords = [p[1] for p in pos.values()]
-
-            if x_coords and y_coords:
-                min_x, max_x = min(x_coords), max(x_coords)
-                min_y, max_y = min(y_coords), max(y_coords)
-
-                # Add padding
-                padding = 50
-                width = max_x - min_x if max_x != min_x else 1
-                height = max_y - min_y if max_y != min_y else 1
-
-                # Scale to fit rect with padding
-                scale_x = (self.rect.width - 2 * padding) / width if width > 0 else 1
-                scale_y = (self.rect.height - 2 * padding) / height if height > 0 else 1
-                scale = min(scale_x, scale_y)
-
-                # Center in rect
-                center_x = (min_x + max_x) / 2
-                center_y = (min_y + max_y) / 2
-                rect_center_x = self.rect.centerx
-                rect_center_y = self.rect.centery
-
-                # Transform positions
-                for node_id, (x, y) in pos.items():
-                    # Scale and center
-                    new_x = (x - center_x) * scale + rect_center_x
-                    new_y = (y - center_y) * scale + rect_center_y
-                    self.pos[node_id] = (new_x, new_y)
+        cached = _layout_cache.get(key)
+        if cached is not None and cached[0] == model.node_ids:
+            _layout_cache.move_to_end(key)
+            positions = cached[1]
+            self.layout_engine = None
+        else:
+            engine = create_layout_engine(
+                cfg.layout_engine,
+                model.num_nodes,
+                iterations=cfg.layout_iterations,
+                time_budget=cfg.layout_time_budget,
+            )
+            positions = engine.compute(model.num_nodes, model.edges)
+            self.layout_engine = engine
+            if self.dataset_version is not None:
+                _layout_cache[key] = (model.node_ids, positions)
+                if len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+                    _layout_cache.popitem(last=False)
+
+        # Scale and translate to fit in rect, with padding
+        padding = 50
+        low = positions.min(axis=0)
+        high = positions.max(axis=0)
+        size = np.where(high > low, high - low, 1.0)
+        scale = min(
+            (self.rect.width - 2 * padding) / size[0],
+            (self.rect.height - 2 * padding) / size[1],
+        )
+        center = (low + high) / 2
+        model.positions = (positions - center) * scale + self.rect.center
+
+    def _build_render_arrays(self):
+        """Build the node color array from the primary label codes"""
+        codes, labels = self.model.primary_label_codes()
+        palette = np.array(
+            [self.node_colors.get(label, self.default_node_color) for label in labels],
+            dtype=np.uint8,
+        ).reshape(-1, 3)
+        self._node_color_array = palette[codes]
+        self.highlight_nodes(self.highlighted_nodes)
 
     def handle_event(self, event: pygame.event.Event):
         """Handle pygame events for interaction"""
@@ -213,13 +258,13 @@ class GraphVisualization:
 
                     # Check if clicking on a node first (nodes are larger targets)
                     clicked_node = self._get_node_at_position(mouse_pos)
-                    if clicked_node:
+                    if clicked_node is not None:
                         self.selected_node = clicked_node
                         self.selected_edge = None
                         self.dragging_node = clicked_node
                         self.click_start_node = clicked_node
                         self.click_start_edge = None
-                        node_pos = self.pos[clicked_node]
+                        node_pos = self.model.positions[clicked_node]
                         self.drag_offset = (  # offset of the node from the mouse position, to prevent snapping to the node
                             mouse_pos[0] - node_pos[0],
                             mouse_pos[1] - node_pos[1],
@@ -228,7 +273,7 @@ class GraphVisualization:
                     else:
                         # Check if clicking on an edge
                         clicked_edge = self._get_edge_at_position(mouse_pos)
-                        if clicked_edge:
+                        if clicked_edge is not None:
                             self.selected_edge = clicked_edge
                             self.selected_node = None
                             self.click_start_edge = clicked_edge
@@ -242,11 +287,7 @@ class GraphVisualization:
                             self.selected_edge = None
                             self.click_start_node = None
                             self.click_start_edge = None
-                            self.show_node_details = False
-                            self.show_edge_details = False
-                            if self.details_panel:
-                                self.details_panel.kill()
-                                self.details_panel = None
+                            self._hide_details()
                     consumed = True
 
             elif event.button == 4:  # Scroll up
@@ -269,9 +310,9 @@ class GraphVisualization:
                 if drag_distance > 5:  # Threshold for considering it a drag
                     self.has_dragged = True
 
-            if self.dragging_node and self.dragging_node in self.pos:
+            if self.dragging_node is not None:
                 # Update node position
-                self.pos[self.dragging_node] = (
+                self.model.positions[self.dragging_node] = (
                     mouse_pos[0] - self.drag_offset[0],
                     mouse_pos[1] - self.drag_offset[1],
                 )
@@ -289,9 +330,9 @@ class GraphVisualization:
             if event.button == 1:  # Left click release
                 # Show details panel only if we didn't drag
                 if not self.has_dragged:
-                    if self.click_start_node:
+                    if self.click_start_node is not None:
                         self._show_node_details(self.click_start_node)
-                    elif self.click_start_edge:
+                    elif self.click_start_edge is not None:
                         self._show_edge_details(self.click_start_edge)
 
                 # Clean up click tracking
@@ -305,12 +346,9 @@ class GraphVisualization:
             if event.key == pygame.K_TAB:
                 self.selected_node = None
                 self.selected_edge = None
-                self.show_node_details = False
-                self.show_edge_details = False
-                if self.details_panel:
-                    self.details_panel.kill()
-                    self.details_panel = None
+                if self.details_panel and self.details_panel.visible:
                     consumed = True
+                self._hide_details()
             elif event.mod & pygame.KMOD_CTRL:
                 if self.rect.collidepoint(pygame.mouse.get_pos()):
                     if event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
@@ -321,62 +359,46 @@ class GraphVisualization:
                         consumed = True
         return consumed
 
-    def _get_node_at_position(self, pos: Tuple[int, int]) -> Optional[str]:
-        """Get node ID at given screen position"""
-        for node_id, node_pos in self.pos.items():
-            # Apply zoom and pan transforms
-            transformed_pos = self._transform_position(node_pos)
-            # If Euclidean distance is less than or equal to node radius * zoom, return node ID
-            distance = (
-                (pos[0] - transformed_pos[0]) ** 2 + (pos[1] - transformed_pos[1]) ** 2
-            ) ** 0.5
-            if distance <= self.node_radius * self.zoom:
-                return node_id
-        return None
-
-    def _get_edge_at_position(self, pos: Tuple[int, int]) -> Optional[Tuple[str, str]]:
-        """Get edge at given screen position"""
-        for source, target in self.graph.edges():
-            if source in self.pos and target in self.pos:
-                start_pos = self._transform_position(self.pos[source])
-                end_pos = self._transform_position(self.pos[target])
-                if self._is_point_on_line(pos, (start_pos, end_pos)):
-                    return (source, target)
-        return None
-
-    def _is_point_on_line(
+    def _get_node_at_position(self, pos: Tuple[int, int]) -> Optional[int]:
+        """Get the index of the first node at a screen position"""
+        if self.model.num_nodes == 0:
+            return None
+        screen_pos = self._transform_positions(self.model.positions)
+        distance_sq = ((screen_pos - pos) ** 2).sum(axis=1)
+        hits = np.flatnonzero(distance_sq <= (self.node_radius * self.zoom) ** 2)
+        return int(hits[0]) if len(hits) else None
+
+    def _get_edge_at_position(
         self,
-        point: Tuple[int, int],
-        line: Tuple[Tuple[int, int], Tuple[int, int]],
+        pos: Tuple[int, int],
         thickness: float = 2,
         tolerance: float = 2,
-    ) -> bool:
-        """Check if point is visually on a finite line segment."""
-        (x1, y1), (x2, y2) = line
-        x, y = point
-
-        # Compute a margin for visual thickness
+    ) -> Optional[int]:
+        """Get the index of the first edge visually under a screen position"""
+        if self.model.num_edges == 0:
+            return None
+        screen_pos = self._transform_positions(self.model.positions)
+        start = screen_pos[self.model.edge_source]
+        end = screen_pos[self.model.edge_target]
+        x, y = pos
         margin = (thickness / 2) + tolerance
 
-        # Quick bounding box rejection
-        if (
-            x < min(x1, x2) - margin
-            or x > max(x1, x2) + margin
-            or y < min(y1, y2) - margin
-            or y > max(y1, y2) + margin
-        ):
-            return False
-
-        # Degenerate case: start == end
-        line_len_sq = (x2 - x1) ** 2 + (y2 - y1) ** 2
-        if line_len_sq == 0:
-            return math.hypot(x - x1, y - y1) <= margin
-
-        # Cross product (for perpendicular distance)
-        cross = abs((x - x1) * (y2 - y1) - (y - y1) * (x2 - x1))
-        distance = cross / math.sqrt(line_len_sq)
-
-        return distance <= margin
+        # Bounding box rejection, then the distance to the line through the edge
+        low = np.minimum(start, end) - margin
+        high = np.maximum(start, end) + margin
+        in_box = (x >= low[:, 0]) & (x <= high[:, 0]) & (y >= low[:, 1])
+        in_box &= y <= high[:, 1]
+        delta = end - start
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        cross = np.abs(
+            (x - start[:, 0]) * delta[:, 1] - (y - start[:, 1]) * delta[:, 0]
+        )
+        point_distance = np.hypot(x - start[:, 0], y - start[:, 1])
+        distance = np.where(
+            length > 0, cross / np.where(length > 0, length, 1.0), point_distance
+        )
+        hits = np.flatnonzero(in_box & (distance <= margin))
+        return int(hits[0]) if len(hits) else None
 
     def _transform_position(self, pos: Tuple[float, float]) -> Tuple[float, float]:
         """Apply zoom and pan transforms to a position"""
@@ -390,159 +412,136 @@ class GraphVisualization:
         y = center_y + (y - center_y) * self.zoom
         return (x, y)
 
-    def _show_node_details(self, node_id: str):
-        """Show node details in a UI overlay"""
-        self.show_node_details = True
-        self.details_node_id = node_id
+    def _transform_positions(self, positions: np.ndarray) -> np.ndarray:
+        """Apply zoom and pan transforms to an (n, 2) array of positions"""
+        center = np.array(self.rect.center, dtype=float)
+        pan = np.array(self.pan_offset, dtype=float)
+        return center + (positions + pan - center) * self.zoom
 
-        # Create details panel if it doesn't exist
-        if self.details_panel:
-            self.details_panel.kill()
+    def _details(self) -> DetailsPanel:
+        """Get the details panel, creating it on first use"""
+        if self.details_panel is None:
+            self.details_panel = DetailsPanel(self.state.pygame_gui_manager)
+        return self.details_panel
 
-        attrs = self.node_attributes.get(node_id, {})
-        props = attrs.get("properties", {})
-        name = attrs.get("name", "Unknown")
-        labels = attrs.get("labels", [])
-        pos = self.pos.get(node_id, (0, 0))
-
-        # Create text content
-        lines = [f"Node Name: {name}"]
-        lines.append(f"Type: {', '.join(labels)}")
-        lines.append("")
-        lines.append("Properties:")
-        for key, value in props.items():
-            if not key.startswith("graph_"):  # Skip graph_n properties
-                lines.append(f"  {key}: {value}")
-
-        # Create panel
-        panel_width = 300
-        instruction_height = 25  # Space for instruction text
-        panel_height = min(400, len(lines) * 25 + 40) + instruction_height
-        panel_x = int(self._transform_position(pos)[0] - panel_width / 2)
-        panel_y = int(self._transform_position(pos)[1] + self.node_radius * self.zoom)
-
-        self.details_panel = pygame_gui.elements.UIPanel(
-            relative_rect=pygame.Rect(panel_x, panel_y, panel_width, panel_height),
-            manager=self.state.pygame_gui_manager,
-            object_id="#node_details_panel",
-        )
+    def _hide_details(self):
+        """Hide the details overlay"""
+        self.show_node_details = False
+        self.show_edge_details = False
+        if self.details_panel:
+            self.details_panel.hide()
 
-        # Add text (leave room for instruction at bottom)
-        details_panel_border_thickness = 1
-        text_rect = pygame.Rect(
-            10,
-            10,
-            panel_width - 20 - 2 * details_panel_border_thickness,
-            panel_height - 20 - instruction_height - 2 * details_panel_border_thickness,
-        )
-        text_box = pygame_gui.elements.UITextBox(
-            relative_rect=text_rect,
-            html_text="<br>".join(lines),
-            manager=self.state.pygame_gui_manager,
-            container=self.details_panel,
-        )
+    def _show_node_details(self, node: int):
+        """Show node details in a UI overlay"""
+        self.show_node_details = True
+        self.show_edge_details = False
+        self.details_node = node
+
+        panel = self._details()
+        key = ("node", node)
+        if not panel.cached(key):
+            labels = self.model.labels(node)
+            header = [
+                f"Node Name: {self.model.names[node]}",
+                f"Type: {', '.join(labels)}",
+                "",
+            ]
+            panel.store(
+                key, panel.format_lines(header, self.model.node_properties(node))
+            )
 
-        # Add instruction text at bottom
-        instruction_rect = pygame.Rect(
-            10,
-            panel_height - instruction_height - 5,
-            panel_width - 20,
-            instruction_height,
-        )
-        instruction_label = pygame_gui.elements.UILabel(
-            relative_rect=instruction_rect,
-            text="Press 'TAB' to close",
-            manager=self.state.pygame_gui_manager,
-            container=self.details_panel,
-        )
+        x, y = self._transform_position(self.model.positions[node])
+        panel.show(key, (x, y + self.node_radius * self.zoom))
 
-    def _show_edge_details(self, edge: Tuple[str, str]):
+    def _show_edge_details(self, edge: int):
         """Show edge details in a UI overlay"""
         self.show_edge_details = True
+        self.show_node_details = False
         self.details_edge = edge
-        source, target = edge
-
-        # Create details panel if it doesn't exist
-        if self.details_panel:
-            self.details_panel.kill()
-
-        attrs = self.edge_attributes.get(edge, {})
-        rel_type = attrs.get("type", "Unknown")
-        props = attrs.get("properties", {})
-
-        # Get source and target node names
-        source_attrs = self.node_attributes.get(source, {})
-        target_attrs = self.node_attributes.get(target, {})
-        source_name = source_attrs.get("name", "Unknown")
-        target_name = target_attrs.get("name", "Unknown")
-
-        # Calculate position for panel (midpoint of edge)
-        source_pos = self._transform_position(self.pos[source])
-        target_pos = self._transform_position(self.pos[target])
-        edge_midpoint = (
-            (source_pos[0] + target_pos[0]) / 2,
-            (source_pos[1] + target_pos[1]) / 2,
-        )
-
-        # Create text content
-        lines = [f"Relationship: {rel_type}"]
-        lines.append(f"From: {source_name}")
-        lines.append(f"To: {target_name}")
-        lines.append("")
-        if props:
-            lines.append("Properties:")
-            for key, value in props.items():
-                if not key.startswith("graph_"):  # Skip graph_n properties
-                    lines.append(f"  {key}: {value}")
-        else:
-            lines.append("No properties")
-
-        # TODO: Code below this is duplicated from _show_node_details, should be refactored
-        # Create panel
-        panel_width = 300
-        instruction_height = 25  # Space for instruction text
-        panel_height = min(400, len(lines) * 25 + 40) + instruction_height
-        panel_x = int(edge_midpoint[0] - panel_width / 2)
-        panel_y = int(edge_midpoint[1] + 20)
-
-        self.details_panel = pygame_gui.elements.UIPanel(
-            relative_rect=pygame.Rect(panel_x, panel_y, panel_width, panel_height),
-            manager=self.state.pygame_gui_manager,
-            object_id="#edge_details_panel",
-        )
-
-        # Add text (leave room for instruction at bottom)
-        text_rect = pygame.Rect(
-            10, 10, panel_width - 20, panel_height - 20 - instruction_height
-        )
-        text_box = pygame_gui.elements.UITextBox(
-            relative_rect=text_rect,
-            html_text="<br>".join(lines),
-            manager=self.state.pygame_gui_manager,
-            container=self.details_panel,
-        )
+        source = self.model.edge_source[edge]
+        target = self.model.edge_target[edge]
+
+        panel = self._details()
+        key = ("edge", edge)
+        if not panel.cached(key):
+            header = [
+                f"Relationship: {self.model.relationship_type(edge)}",
+                f"From: {self.model.names[source]}",
+                f"To: {self.model.names[target]}",
+                "",
+            ]
+            panel.store(
+                key, panel.format_lines(header, self.model.edge_properties(edge))
+            )
 
-        # Add instruction text at bottom
-        instruction_rect = pygame.Rect(
-            10,
-            panel_height - instruction_height - 5,
-            panel_width - 20,
-            instruction_height,
-        )
-        instruction_label = pygame_gui.elements.UILabel(
-            relative_rect=instruction_rect,
-            text="Press 'TAB' to close",
-            manager=self.state.pygame_gui_manager,
-            container=self.details_panel,
+        # Place the panel below the midpoint of the edge
+        source_pos = self._transform_position(self.model.positions[source])
+        target_pos = self._transform_position(self.model.positions[target])
+        panel.show(
+            key,
+            (
+                (source_pos[0] + target_pos[0]) / 2,
+                (source_pos[1] + target_pos[1]) / 2 + 20,
+            ),
         )
 
     def highlight_nodes(self, node_ids: Set[str]):
-        """Highlight specific nodes"""
-        self.highlighted_nodes = node_ids
+        """Highlight specific nodes by element id"""
+        indices = [self.model.index_of(node_id) for node_id in node_ids]
+        self._highlighted_indices = np.array(
+            [index for index in indices if index is not None], dtype=np.int64
+        )
+        self.highlighted_nodes = {
+            self.model.node_ids[index] for index in self._highlighted_indices.tolist()
+        }
+        self._highlighted_mask = np.zeros(self.model.num_nodes, dtype=bool)
+        self._highlighted_mask[self._highlighted_indices] = True
+
+    def highlight_result(
+        self, rows: List[Dict[str, Any]], element_ids: Iterable[str] = ()
+    ) -> int:
+        """
+        Highlight the nodes referenced by a query result
+
+        Nodes are matched by element id, or by name through the model's name
+        index, so the cost is linear in the size of the result.
+
+        Args:
+            rows: Result records as dictionaries
+            element_ids: Element ids of nodes returned by the query
+
+        Returns:
+            Number of highlighted nodes
+        """
+        matched = set(element_ids)
+        for row in rows:
+            for value in row.values():
+                self._match_result_value(value, matched)
+        self.highlight_nodes(matched)
+        return len(self.highlighted_nodes)
+
+    def _match_result_value(self, value: Any, matched: Set[str]):
+        """Add the node ids a single result value refers to"""
+        model = self.model
+        if isinstance(value, str):
+            if model.index_of(value) is not None:
+                matched.add(value)
+            else:
+                matched.update(model.node_ids[i] for i in model.indices_named(value))
+        elif isinstance(value, dict):
+            # Nodes are returned as their property maps
+            name = value.get("name")
+            if name is not None:
+                matched.update(
+                    model.node_ids[i] for i in model.indices_named(str(name))
+                )
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self._match_result_value(item, matched)
 
     def render(self, screen: pygame.Surface):
         """Render the graph visualization"""
-        if not self.layout_computed or len(self.graph) == 0:
+        if not self.layout_computed or self.model.num_nodes == 0:
             return
 
         # Save the current clipping rectangle
@@ -555,80 +554,185 @@ class GraphVisualization:
         pygame.draw.rect(screen, Colors.DARKER_BG.value, self.rect)
         pygame.draw.rect(screen, Colors.BORDER.value, self.rect, 2)
 
-        # Draw edges first (so they appear behind nodes)
-        for source, target in self.graph.edges():
-            if source in self.pos and target in self.pos:
-                start_pos = self._transform_position(self.pos[source])
-                end_pos = self._transform_position(self.pos[target])
-
-                # Determine edge color
-                if self.selected_edge == (source, target):
-                    edge_color = self.selected_color
-                else:
-                    edge_color = self.edge_color
-
-                # Draw edge
-                pygame.draw.line(screen, edge_color, start_pos, end_pos, 2)
-
-                # Draw arrow head
-                self._draw_arrow(screen, start_pos, end_pos, edge_color)
-
-                # Draw edge label when zoomed in enough
-                if self.zoom >= 1.5:
-                    edge_key = (source, target)
-                    edge_attrs = self.edge_attributes.get(edge_key, {})
-                    rel_type = edge_attrs.get("type", "Unknown")
-
-                    # Calculate midpoint of edge
-                    midpoint = (
-                        (start_pos[0] + end_pos[0]) / 2,
-                        (start_pos[1] + end_pos[1]) / 2,
-                    )
+        # Cull nodes and edges against the viewport before any per-item work
+        screen_pos = self._transform_positions(self.model.positions)
+        radius = int(self.node_radius * self.zoom)
+        margin = radius + 20  # Leave room for labels below nodes
+        view = self.rect
+        x, y = screen_pos[:, 0], screen_pos[:, 1]
+        visible_nodes = np.flatnonzero(
+            (x >= view.left - margin)
+            & (x <= view.right + margin)
+            & (y >= view.top - margin)
+            & (y <= view.bottom + margin)
+        )
+        start = screen_pos[self.model.edge_source]
+        end = screen_pos[self.model.edge_target]
+        visible_edges = np.flatnonzero(
+            (np.minimum(start[:, 0], end[:, 0]) <= view.right)
+            & (np.maximum(start[:, 0], end[:, 0]) >= view.left)
+            & (np.minimum(start[:, 1], end[:, 1]) <= view.bottom)
+            & (np.maximum(start[:, 1], end[:, 1]) >= view.top)
+        )
 
-                    # Render label text
-                    font = self.state.game.cfg.font_tiny
-                    text = font.render(rel_type, True, Colors.TEXT.value)
-                    text_rect = text.get_rect(
-                        center=(int(midpoint[0]), int(midpoint[1]))
-                    )
-                    screen.blit(text, text_rect)
+        lod = self._pick_lod(len(visible_nodes))
+        if lod == self.LOD_CLUSTER:
+            self._render_clusters(screen, screen_pos, visible_nodes, visible_edges)
+        else:
+            self._render_edges(screen, start, end, visible_edges, lod)
+            # Shrink nodes to dots when many are in view
+            node_radius = radius if lod == self.LOD_DETAIL else max(1, radius // 3)
+            self._render_nodes(screen, screen_pos, visible_nodes, node_radius, lod)
+
+        # Keep the selection and highlights in view visible at every level of
+        # detail, in full detail unless there are too many of them
+        if lod != self.LOD_DETAIL:
+            emphasized = self._highlighted_indices[
+                np.isin(self._highlighted_indices, visible_nodes)
+            ]
+            if self.selected_node is not None:
+                emphasized = np.append(emphasized, self.selected_node)
+            emphasized_lod = (
+                self.LOD_DETAIL
+                if len(emphasized) <= self.lod_detail_limit
+                else self.LOD_SIMPLE
+            )
+            self._render_nodes(screen, screen_pos, emphasized, radius, emphasized_lod)
+
+        # Restore the original clipping rectangle
+        screen.set_clip(old_clip)
+
+    def _pick_lod(self, visible_count: int) -> int:
+        """Pick a level-of-detail tier for the number of nodes in view"""
+        if visible_count <= self.lod_detail_limit:
+            return self.LOD_DETAIL
+        if visible_count <= self.lod_simple_limit:
+            return self.LOD_SIMPLE
+        return self.LOD_CLUSTER
+
+    def _render_edges(self, screen, start, end, edge_indices, lod):
+        """Draw the given edges, with arrowheads and labels at LOD_DETAIL"""
+        start_points = start[edge_indices].tolist()
+        end_points = end[edge_indices].tolist()
+        for i, start_pos, end_pos in zip(
+            edge_indices.tolist(), start_points, end_points
+        ):
+            # Determine edge color
+            if self.selected_edge == i:
+                edge_color = self.selected_color
+            else:
+                edge_color = self.edge_color
 
-        # Draw nodes
-        for node_id in self.graph.nodes():
-            if node_id not in self.pos:
+            if lod != self.LOD_DETAIL:
+                pygame.draw.line(screen, edge_color, start_pos, end_pos, 1)
                 continue
 
-            pos = self._transform_position(self.pos[node_id])
-            attrs = self.node_attributes.get(node_id, {})
-            primary_label = attrs.get("primary_label", "Unknown")
-            node_name = attrs.get("name", primary_label)
+            # Draw edge
+            pygame.draw.line(screen, edge_color, start_pos, end_pos, 2)
 
+            # Draw arrow head
+            self._draw_arrow(screen, start_pos, end_pos, edge_color)
+
+            # Draw edge label when zoomed in enough
+            if self.zoom >= 1.5:
+                rel_type = self.model.relationship_type(i)
+
+                # Calculate midpoint of edge
+                midpoint = (
+                    (start_pos[0] + end_pos[0]) / 2,
+                    (start_pos[1] + end_pos[1]) / 2,
+                )
+
+                # Render label text
+                text = self._render_label(rel_type)
+                text_rect = text.get_rect(center=(int(midpoint[0]), int(midpoint[1])))
+                screen.blit(text, text_rect)
+
+    def _render_nodes(self, screen, screen_pos, node_indices, radius, lod):
+        """Draw the given nodes, with outlines and labels at LOD_DETAIL"""
+        points = screen_pos[node_indices].astype(int).tolist()
+        for i, (x, y) in zip(node_indices.tolist(), points):
             # Determine color
-            if node_id == self.selected_node:
+            if i == self.selected_node:
                 color = self.selected_color
-            elif node_id in self.highlighted_nodes:
+            elif self._highlighted_mask[i]:
                 color = self.highlight_color
             else:
-                color = self.node_colors.get(primary_label, self.default_node_color)
+                color = self._node_color_array[i].tolist()
 
             # Draw node circle
-            radius = int(self.node_radius * self.zoom)
-            pygame.draw.circle(screen, color, (int(pos[0]), int(pos[1])), radius)
-            pygame.draw.circle(
-                screen, Colors.TEXT_BRIGHT.value, (int(pos[0]), int(pos[1])), radius, 2
-            )
+            pygame.draw.circle(screen, color, (x, y), radius)
+            if lod != self.LOD_DETAIL:
+                continue
+            pygame.draw.circle(screen, Colors.TEXT_BRIGHT.value, (x, y), radius, 2)
 
             # Draw node label
             if self.zoom > 0.7:  # Only show labels when zoomed in enough
-                font = self.state.game.cfg.font_tiny
-                text = font.render(node_name, True, Colors.TEXT.value)
-                text_rect = text.get_rect(
-                    center=(int(pos[0]), int(pos[1]) + radius + 12)
-                )
+                text = self._render_label(self.model.names[i])
+                text_rect = text.get_rect(center=(x, y + radius + 12))
                 screen.blit(text, text_rect)
 
-        # Restore the original clipping rectangle
-        screen.set_clip(old_clip)
+    def _render_clusters(self, screen, screen_pos, node_indices, edge_indices):
+        """Draw nodes and edges aggregated into screen grid cells (LOD_CLUSTER)"""
+        cell = self.cluster_cell_size
+        origin = np.array(self.rect.topleft)
+        # One cell of margin on each side for nodes just outside the view
+        columns = self.rect.width // cell + 3
+        rows = self.rect.height // cell + 3
+
+        def cell_ids(points):
+            cells = np.floor((points - origin) / cell).astype(np.int64)
+            x = np.clip(cells[:, 0], -1, columns - 2)
+            y = np.clip(cells[:, 1], -1, rows - 2)
+            return (y + 1) * columns + x + 1
+
+        def cell_center(cell_id):
+            row, column = divmod(int(cell_id), columns)
+            return (
+                origin[0] + (column - 1) * cell + cell // 2,
+                origin[1] + (row - 1) * cell + cell // 2,
+            )
+
+        # One line per pair of connected cells. Edges are clipped to the view
+        # first, so one leaving it ends in the border cell it crosses
+        if len(edge_indices):
+            starts, ends = _clip_segments(
+                screen_pos[self.model.edge_source[edge_indices]],
+                screen_pos[self.model.edge_target[edge_indices]],
+                self.rect,
+            )
+            sources = cell_ids(starts)
+            targets = cell_ids(ends)
+            pairs = np.unique(np.stack([sources, targets], axis=1), axis=0)
+            for source, target in pairs.tolist():
+                if source != target:
+                    pygame.draw.line(
+                        screen,
+                        self.edge_color,
+                        cell_center(source),
+                        cell_center(target),
+                        1,
+                    )
+
+        # One square per occupied cell, in the color of its first node
+        if len(node_indices):
+            ids, first = np.unique(
+                cell_ids(screen_pos[node_indices]), return_index=True
+            )
+            colors = self._node_color_array[node_indices[first]].tolist()
+            for cell_id, color in zip(ids.tolist(), colors):
+                cx, cy = cell_center(cell_id)
+                screen.fill(color, (cx - cell // 2, cy - cell // 2, cell - 1, cell - 1))
+
+    def _render_label(self, text: str) -> pygame.Surface:
+        """Render label text, reusing the surface across frames"""
+        surface = self._label_cache.get(text)
+        if surface is None:
+            font = self.state.game.cfg.font_tiny
+            surface = self._label_cache[text] = font.render(
+                text, True, Colors.TEXT.value
+            )
+        return surface
 
     def _calc_line_angle(self, start, end):
         """Calculate the angle of a line between two points"""
@@ -654,6 +758,40 @@ class GraphVisualization:
         pygame.draw.polygon(screen, color, [end, (x1, y1), (x2, y2)])
 
 
+def _clip_segments(starts: np.ndarray, ends: np.ndarray, rect: pygame.Rect):
+    """
+    Clip line segments to a rectangle (Liang-Barsky, vectorized)
+
+    Args:
+        starts, ends: (m, 2) segment end points
+        rect: Rectangle to clip to
+
+    Returns:
+        Tuple of (starts, ends) of the clipped segments, without the segments
+        that don't cross the rectangle
+    """
+    delta = ends - starts
+    low = np.zeros(len(starts))
+    high = np.ones(len(starts))
+    keep = np.ones(len(starts), dtype=bool)
+    bounds = ((rect.left, rect.right - 1), (rect.top, rect.bottom - 1))
+    for axis, (minimum, maximum) in enumerate(bounds):
+        d = delta[:, axis]
+        for p, q in ((-d, starts[:, axis] - minimum), (d, maximum - starts[:, axis])):
+            parallel = p == 0
+            keep &= ~(parallel & (q < 0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = q / p
+            entering = ~parallel & (p < 0)
+            leaving = ~parallel & (p > 0)
+            low = np.where(entering, np.maximum(low, t), low)
+            high = np.where(leaving, np.minimum(high, t), high)
+    keep &= low <= high
+    low = low[keep, None]
+    high = high[keep, None]
+    return starts[keep] + low * delta[keep], starts[keep] + high * delta[keep]
+
+
 def create_graph_visualization(
     state: "GameplayState", graph_rect: pygame.Rect
 ) -> GraphVisualization:
@@ -0,0 +1,226 @@
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+_NO_PROPERTIES: Dict[str, Any] = {}
+
+
+class GraphModel:
+    """
+    Compact array-backed graph of the nodes and relationships shown in a level
+
+    Nodes and relationships are addressed by integer index. Relationships are
+    sorted by source node with a CSR index (indptr), so the relationships of
+    node i are edge_source/edge_target[indptr[i]:indptr[i + 1]]. Labels and
+    relationship types are stored as codes into small tables, and property
+    maps are only materialized when asked for (e.g. by the details panel).
+    Like the previous networkx model, parallel relationships between the same
+    two nodes are collapsed into the last one.
+    """
+
+    def __init__(
+        self,
+        node_ids: List[str],
+        names: List[str],
+        label_sets: Sequence[Sequence[str]],
+        node_label_set: np.ndarray,
+        edge_source: np.ndarray,
+        edge_target: np.ndarray,
+        relationship_types: Sequence[str],
+        edge_type: np.ndarray,
+        node_properties: Callable[[int], Dict[str, Any]],
+        edge_properties: Callable[[int], Dict[str, Any]],
+    ):
+        """
+        Args:
+            node_ids: Element id of each node
+            names: Display name of each node
+            label_sets: Table of label lists
+            node_label_set: Index into label_sets per node
+            edge_source, edge_target: Node indices of each relationship
+            relationship_types: Table of relationship types
+            edge_type: Index into relationship_types per relationship
+            node_properties: Gets the property map of a node by index
+            edge_properties: Gets the property map of a relationship by the
+                index it was passed in with
+        """
+        self.node_ids = node_ids
+        self.names = names
+        self.label_sets = [list(labels) for labels in label_sets]
+        self.node_label_set = np.asarray(node_label_set, dtype=np.int32)
+        self.relationship_types = list(relationship_types)
+        self._node_properties = node_properties
+        self._edge_properties = edge_properties
+
+        # Sort relationships by (source, target), keeping the last of duplicates
+        edge_source = np.asarray(edge_source, dtype=np.int64)
+        edge_target = np.asarray(edge_target, dtype=np.int64)
+        pair = edge_source * max(1, self.num_nodes) + edge_target
+        order = np.lexsort((-np.arange(len(pair)), pair))
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = pair[order][1:] != pair[order][:-1]
+        order = order[keep]
+
+        self.edge_rows = order  # Index each relationship was passed in with
+        self.edge_source = edge_source[order].astype(np.int32)
+        self.edge_target = edge_target[order].astype(np.int32)
+        self.edge_type = np.asarray(edge_type, dtype=np.int32)[order]
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.edge_source, minlength=self.num_nodes),
+            out=self.indptr[1:],
+        )
+        self.positions = np.zeros((self.num_nodes, 2))
+
+        self._index: Optional[Dict[str, int]] = None
+        self._name_index: Optional[Dict[str, List[int]]] = None
+
+    @classmethod
+    def from_rows(
+        cls, nodes: List[Dict[str, Any]], relationships: List[Dict[str, Any]]
+    ) -> "GraphModel":
+        """
+        Build a model from visualization query rows
+
+        Args:
+            nodes: Node rows (labels, props, id)
+            relationships: Relationship rows (source, relationship, target,
+                props); rows with an endpoint not in nodes are skipped
+        """
+        node_ids = [node["id"] for node in nodes]
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        label_sets: Dict[tuple, int] = {}
+        node_label_set = np.array(
+            [
+                label_sets.setdefault(tuple(node["labels"]), len(label_sets))
+                for node in nodes
+            ],
+            dtype=np.int32,
+        )
+        names = [
+            str(node["props"].get("name", _primary_label(node["labels"])))
+            for node in nodes
+        ]
+
+        kept = [
+            rel
+            for rel in relationships
+            if rel["source"] in index and rel["target"] in index
+        ]
+        relationship_types: Dict[str, int] = {}
+        edge_type = np.array(
+            [
+                relationship_types.setdefault(
+                    rel["relationship"], len(relationship_types)
+                )
+                for rel in kept
+            ],
+            dtype=np.int32,
+        )
+        model = cls(
+            node_ids,
+            names,
+            list(label_sets),
+            node_label_set,
+            np.array([index[rel["source"]] for rel in kept], dtype=np.int64),
+            np.array([index[rel["target"]] for rel in kept], dtype=np.int64),
+            list(relationship_types),
+            edge_type,
+            lambda i: nodes[i]["props"],
+            lambda i: kept[i].get("props", _NO_PROPERTIES),
+        )
+        model._index = index
+        return model
+
+    @classmethod
+    def from_snapshot(
+        cls, snapshot, node_indices: np.ndarray, edge_indices: np.ndarray
+    ) -> "GraphModel":
+        """
+        Build a model from part of a binary graph snapshot (see src.db.snapshot)
+
+        Only ids and names are decoded, properties are read from the snapshot
+        when asked for.
+
+        Args:
+            snapshot: GraphSnapshot
+            node_indices: Snapshot indices of the nodes
+            edge_indices: Snapshot indices of relationships between those nodes
+        """
+        local = np.full(snapshot.num_nodes, -1, dtype=np.int64)
+        local[node_indices] = np.arange(len(node_indices))
+        return cls(
+            snapshot.node_ids.take(node_indices),
+            snapshot.node_names.take(node_indices),
+            snapshot.label_sets,
+            snapshot.node_label_set[node_indices],
+            local[snapshot.edge_source[edge_indices]],
+            local[snapshot.edge_target[edge_indices]],
+            snapshot.relationship_types,
+            snapshot.edge_type[edge_indices],
+            lambda i: snapshot.node_properties(int(node_indices[i])),
+            lambda i: snapshot.edge_properties(int(edge_indices[i])),
+        )
+
+    @classmethod
+    def empty(cls) -> "GraphModel":
+        return cls.from_rows([], [])
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_source)
+
+    @property
+    def edges(self) -> np.ndarray:
+        """(m, 2) array of the source and target index of each relationship"""
+        return np.stack([self.edge_source, self.edge_target], axis=1)
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        """Get the index of a node by element id (None if not in the graph)"""
+        if self._index is None:
+            self._index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        return self._index.get(node_id)
+
+    def indices_named(self, name: str) -> List[int]:
+        """Get the indices of the nodes with a display name"""
+        if self._name_index is None:
+            self._name_index = {}
+            for i, node_name in enumerate(self.names):
+                self._name_index.setdefault(node_name, []).append(i)
+        return self._name_index.get(name, [])
+
+    def labels(self, index: int) -> List[str]:
+        return self.label_sets[self.node_label_set[index]]
+
+    def primary_label(self, index: int) -> str:
+        return _primary_label(self.labels(index))
+
+    def primary_label_codes(self) -> Tuple[np.ndarray, List[str]]:
+        """
+        Get the primary label of every node as codes
+
+        Returns:
+            Tuple of (code per node, primary label per code)
+        """
+        table = [_primary_label(labels) for labels in self.label_sets]
+        return self.node_label_set, table
+
+    def node_properties(self, index: int) -> Dict[str, Any]:
+        return self._node_properties(index)
+
+    def edge_properties(self, edge: int) -> Dict[str, Any]:
+        return self._edge_properties(int(self.edge_rows[edge]))
+
+    def relationship_type(self, edge: int) -> str:
+        return self.relationship_types[self.edge_type[edge]]
+
+    def neighbors(self, index: int) -> np.ndarray:
+        """Get the target indices of a node's outgoing relationships"""
+        return self.edge_target[self.indptr[index] : self.indptr[index + 1]]
+
+
+def _primary_label(labels: Sequence[str]) -> str:
+    return labels[0] if labels else "Unknown"
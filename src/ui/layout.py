@@ -0,0 +1,313 @@
+"""
+Force-directed layout engines for the graph visualization
+
+Engines take the number of nodes and an (m, 2) array of edge endpoint indices
+and return an (n, 2) array of positions in arbitrary units; the caller scales
+them to the screen.
+
+- NetworkxLayout: networkx.spring_layout (dense Fruchterman-Reingold, O(n^2)
+  per iteration). Matches the original layout for small graphs.
+- BarnesHutLayout: Fruchterman-Reingold with repulsion approximated over a
+  quadtree, vectorized with NumPy (O(n log n) per iteration, with the far
+  field computed per occupied cell).
+"""
+
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+class LayoutEngine(ABC):
+    @abstractmethod
+    def compute(self, num_nodes: int, edges: np.ndarray) -> np.ndarray:
+        """Compute (num_nodes, 2) node positions"""
+
+
+class NetworkxLayout(LayoutEngine):
+    """networkx spring layout"""
+
+    def __init__(self, iterations: int = 50, k: float = 2.0, seed: int = 73):
+        self.iterations = iterations
+        self.k = k
+        self.seed = seed
+
+    def compute(self, num_nodes: int, edges: np.ndarray) -> np.ndarray:
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(num_nodes))
+        graph.add_edges_from(edges.tolist())
+        pos = nx.spring_layout(
+            graph, k=self.k, iterations=self.iterations, seed=self.seed
+        )
+        return np.array([pos[i] for i in range(num_nodes)], dtype=float).reshape(-1, 2)
+
+
+def _interaction_offsets() -> np.ndarray:
+    """
+    Offsets from a cell to its interaction list, by the cell's parity
+
+    The interaction list is the children of the parent's neighbors that are
+    not neighbors of the cell itself. Relative to the cell it only depends on
+    whether the cell is the left/right and top/bottom child of its parent,
+    and always holds 27 cells. Indexed by (y % 2) * 2 + x % 2.
+    """
+    lists = []
+    for parity_y in (0, 1):
+        for parity_x in (0, 1):
+            lists.append(
+                [
+                    (dx - 2 - parity_x, dy - 2 - parity_y)
+                    for dy in range(6)
+                    for dx in range(6)
+                    if max(abs(dx - 2 - parity_x), abs(dy - 2 - parity_y)) >= 2
+                ]
+            )
+    return np.array(lists, dtype=np.int64)
+
+
+class BarnesHutLayout(LayoutEngine):
+    """
+    Fruchterman-Reingold layout with quadtree-approximated repulsion
+
+    The quadtree is evaluated level by level as uniform grids of the occupied
+    cells. At each level a cell is repelled by the centers of mass of its
+    interaction list (the children of its parent's neighbors that are not its
+    own neighbors), so every other node is accounted for exactly once, at the
+    coarsest level where it is well separated. The force on a cell is taken at
+    its center of mass and carried to its nodes with its gradient (a first
+    order local expansion), so the work per level grows with the occupied
+    cells instead of the nodes. Adjacent cells at the finest level are treated
+    per node, by their centers of mass.
+
+    Cooling follows the iterations that fit in the time budget, so a layout
+    stopped by the budget is still cooled down rather than cut off hot.
+    """
+
+    _INTERACTION_OFFSETS = _interaction_offsets()
+    _NEIGHBOR_OFFSETS = np.array(
+        [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)], dtype=np.int64
+    )
+    _PADDING = 3  # Empty cells around the grid, so offsets never leave it
+
+    def __init__(
+        self,
+        iterations: int = 50,
+        time_budget: float = None,
+        gravity: float = 1.0,
+        seed: int = 73,
+    ):
+        """
+        Args:
+            iterations: Maximum number of iterations
+            time_budget: Optional maximum run time in seconds
+            gravity: Pull towards the center, keeps disconnected parts together
+            seed: Random seed for the initial positions
+        """
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.gravity = gravity
+        self.seed = seed
+        # Iterations run by the last compute, and the temperature of the last
+        # one relative to the first (near 0 once the layout has cooled down)
+        self.iterations_run = 0
+        self.last_temperature = None
+
+    def compute(self, num_nodes: int, edges: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        pos = rng.random((num_nodes, 2))
+        self.iterations_run = 0
+        self.last_temperature = None
+        if num_nodes < 2:
+            return pos
+
+        k = 1.0 / np.sqrt(num_nodes)  # Ideal edge length in the unit square
+        # Finest level with about one node per cell
+        depth = max(2, int(np.ceil(np.log(num_nodes) / np.log(4))) + 1)
+        edges = edges.reshape(-1, 2)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+
+        initial_temperature = temperature = 0.1
+        start = time.perf_counter()
+        for iteration in range(self.iterations):
+            force = self._repulsion(pos, k, depth)
+            force += self._attraction(pos, edges, k, num_nodes)
+            force -= self.gravity * k * (pos - pos.mean(axis=0))
+
+            # Limit displacement by the temperature
+            length = np.sqrt((force**2).sum(axis=1))
+            scale = np.minimum(length, temperature) / np.maximum(length, 1e-12)
+            pos += force * scale[:, None]
+            self.iterations_run = iteration + 1
+            self.last_temperature = temperature / initial_temperature
+
+            # Cool linearly over the iterations left, as far as the time
+            # budget allows at the pace so far
+            remaining = self.iterations - self.iterations_run
+            if self.time_budget:
+                elapsed = time.perf_counter() - start
+                pace = elapsed / self.iterations_run
+                remaining = min(remaining, int((self.time_budget - elapsed) / pace))
+            if remaining <= 0:
+                break
+            temperature *= (remaining + 1) / (remaining + 2)
+        return pos
+
+    def _attraction(self, pos, edges, k, num_nodes):
+        """Spring forces along edges (d^2 / k)"""
+        force = np.zeros_like(pos)
+        if len(edges) == 0:
+            return force
+        delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+        dist = np.sqrt((delta**2).sum(axis=1))
+        pull = delta * (dist / k)[:, None]
+        for axis in (0, 1):
+            force[:, axis] -= np.bincount(
+                edges[:, 0], weights=pull[:, axis], minlength=num_nodes
+            )
+            force[:, axis] += np.bincount(
+                edges[:, 1], weights=pull[:, axis], minlength=num_nodes
+            )
+        return force
+
+    def _repulsion(self, pos, k, depth):
+        """Repulsive forces (k^2 / d), approximated over the quadtree"""
+        low = pos.min(axis=0)
+        span = max((pos.max(axis=0) - low).max(), 1e-9)
+        unit = (pos - low) / span * (1 - 1e-9)  # Normalized to [0, 1)
+        # Pair terms are computed in single precision, which halves the
+        # memory traffic; forces are summed in double precision
+        x = pos[:, 0].astype(np.float32)
+        y = pos[:, 1].astype(np.float32)
+        k = np.float32(k)
+        min_dist2 = np.float32((0.01 * k) ** 2)
+        force = np.zeros_like(pos)
+
+        # No cell is well separated from another below level 2
+        for level in range(2, depth + 1):
+            size = 1 << level
+            stride = size + 2 * self._PADDING
+            cell = np.floor(unit * size).astype(np.int64) + self._PADDING
+            flat = cell[:, 1] * stride + cell[:, 0]
+            counts = np.bincount(flat, minlength=stride * stride)
+
+            # Occupied cells, plus an empty one that unoccupied lookups hit
+            cell_ids = np.flatnonzero(counts)
+            num_cells = len(cell_ids)
+            lookup = np.full(stride * stride, num_cells, dtype=np.int64)
+            lookup[cell_ids] = np.arange(num_cells)
+            node_cell = lookup[flat]
+            mass = np.zeros(num_cells + 1, dtype=np.float32)
+            mass[:-1] = counts[cell_ids]
+            cx = np.zeros(num_cells + 1, dtype=np.float32)
+            cy = np.zeros(num_cells + 1, dtype=np.float32)
+            cx[:-1] = np.bincount(node_cell, weights=pos[:, 0]) / mass[:-1]
+            cy[:-1] = np.bincount(node_cell, weights=pos[:, 1]) / mass[:-1]
+
+            # Force on each cell's center of mass from its interaction list
+            parity = (cell_ids // stride - self._PADDING) % 2 * 2 + (
+                cell_ids % stride - self._PADDING
+            ) % 2
+            offsets = self._INTERACTION_OFFSETS[parity]
+            others = lookup[
+                cell_ids[:, None] + offsets[:, :, 1] * stride + offsets[:, :, 0]
+            ]
+            fx, fy, gxx, gxy, gyy = self._cell_forces(
+                cx[:-1, None],
+                cy[:-1, None],
+                mass[others],
+                cx[others],
+                cy[others],
+                k,
+                min_dist2,
+                gradient=True,
+            )
+
+            # Carry it to the nodes with the first order expansion
+            ox = x - cx[node_cell]
+            oy = y - cy[node_cell]
+            force[:, 0] += fx[node_cell] + gxx[node_cell] * ox + gxy[node_cell] * oy
+            force[:, 1] += fy[node_cell] + gxy[node_cell] * ox + gyy[node_cell] * oy
+
+            if level == depth:
+                # Near field: adjacent cells, and the node's own cell without itself
+                neighbors = lookup[cell_ids[node_cell, None] + self._neighbors(stride)]
+                m = mass[neighbors]
+                sum_x = cx[neighbors] * m
+                sum_y = cy[neighbors] * m
+                m[:, 4] -= 1.0
+                sum_x[:, 4] -= x
+                sum_y[:, 4] -= y
+                safe_m = np.maximum(m, 1.0)
+                fx, fy = self._cell_forces(
+                    x[:, None],
+                    y[:, None],
+                    m,
+                    sum_x / safe_m,
+                    sum_y / safe_m,
+                    k,
+                    min_dist2,
+                )
+                force[:, 0] += fx
+                force[:, 1] += fy
+        return force
+
+    def _neighbors(self, stride):
+        """Flat offsets of a cell's 3x3 neighborhood (the cell itself at 4)"""
+        return self._NEIGHBOR_OFFSETS[:, 1] * stride + self._NEIGHBOR_OFFSETS[:, 0]
+
+    @staticmethod
+    def _cell_forces(x, y, mass, cx, cy, k, min_dist2, gradient=False):
+        """
+        Sum the repulsion of cells on each target point
+
+        Args:
+            x, y: (t, 1) coordinates of the points the forces act on
+            mass: (t, c) mass of the cells acting on each target (0 for none)
+            cx, cy: (t, c) centers of mass of those cells
+            gradient: Also return the gradient of the force (xx, xy, yy)
+
+        Returns:
+            Force components fx, fy (and the gradient) per target
+        """
+        dx = x - cx
+        dy = y - cy
+        dist2 = np.maximum(dx * dx + dy * dy, min_dist2)
+        strength = k * k * mass / dist2
+        fx = (strength * dx).sum(axis=1)
+        fy = (strength * dy).sum(axis=1)
+        if not gradient:
+            return fx, fy
+        # Derivatives of k^2 m (dx, dy) / d^2
+        twice = 2.0 * strength / dist2
+        gxx = (strength - twice * dx * dx).sum(axis=1)
+        gxy = -(twice * dx * dy).sum(axis=1)
+        gyy = (strength - twice * dy * dy).sum(axis=1)
+        return fx, fy, gxx, gxy, gyy
+
+
+def create_layout_engine(
+    name: str,
+    num_nodes: int,
+    iterations: int = 50,
+    time_budget: float = None,
+    auto_threshold: int = 500,
+) -> LayoutEngine:
+    """
+    Create a layout engine by name
+
+    Args:
+        name: "networkx", "barnes_hut" or "auto" (networkx below auto_threshold
+            nodes, Barnes-Hut above)
+        num_nodes: Number of nodes to lay out
+        iterations: Maximum number of iterations
+        time_budget: Optional maximum run time in seconds (Barnes-Hut only)
+        auto_threshold: Node count from which "auto" uses Barnes-Hut
+    """
+    if name == "auto":
+        name = "networkx" if num_nodes < auto_threshold else "barnes_hut"
+    if name == "networkx":
+        return NetworkxLayout(iterations=iterations)
+    if name == "barnes_hut":
+        return BarnesHutLayout(iterations=iterations, time_budget=time_budget)
+    raise ValueError(f"Invalid layout engine: {name}")
@@ -0,0 +1,241 @@
+from src.enums.colors import Colors
+from src.levels import get_level_page, get_page_count, get_total_levels
+from src.save_handler.save_system import get_progress_version, is_level_unlocked
+
+import pygame
+
+
+class LevelSelectorUI:
+    """
+    Pre-rendered level selection screen
+
+    The level grid (with title, hints and reset button) is composed once into
+    a screen-sized surface, and the confirmation dialog once into a copy of it
+    with the overlay applied. Both are rebuilt only when the progress version
+    or the number of levels changes, so drawing the screen is a single blit.
+    Levels are shown a page at a time from the level index, so level bodies
+    aren't loaded to draw the grid.
+    """
+
+    def __init__(self, cfg):
+        """
+        Args:
+            cfg: GameConfig with the screen size and fonts
+        """
+        self.cfg = cfg
+        self.button_width = 300
+        self.button_height = 80
+        self.spacing = 100
+        self.gap_width = 200  # Gap between the columns, centered on screen
+        self.start_y = 200
+        self.rows = 5  # Levels per column
+        self.page_size = 2 * self.rows
+        self.page = 0
+
+        self.reset_progress_rect = None
+        self.yes_button_rect = None
+        self.no_button_rect = None
+        self._key = None
+        self._grid = None
+        self._dialog = None
+
+    def grid_surface(self) -> pygame.Surface:
+        """Get the level grid, rebuilding it if the progress changed"""
+        key = (get_progress_version(), get_total_levels(), self.page)
+        if key != self._key:
+            self._key = key
+            self._grid = self._build_grid()
+            self._dialog = None
+        return self._grid
+
+    def dialog_surface(self) -> pygame.Surface:
+        """Get the level grid with the reset confirmation dialog on top"""
+        grid = self.grid_surface()
+        if self._dialog is None:
+            self._dialog = self._build_dialog(grid)
+        return self._dialog
+
+    @property
+    def page_count(self) -> int:
+        return get_page_count(self.page_size)
+
+    def set_page(self, page: int):
+        """Show a page of levels (clamped to the existing pages)"""
+        self.page = min(max(0, page), self.page_count - 1)
+
+    def level_on_page(self, slot: int) -> int:
+        """Get the number of the level in a slot (0-9) of the current page"""
+        return self.page * self.page_size + slot
+
+    def button_rect(self, slot: int) -> pygame.Rect:
+        """Get the screen rect of the level button in a slot of the page"""
+        center_x = self.cfg.screen_width // 2
+        # Left column: slots 0-4, right column: slots 5-9
+        if slot < self.rows:
+            x = center_x - self.button_width - self.gap_width // 2
+        else:
+            x = center_x + self.gap_width // 2
+        y = self.start_y + (slot % self.rows) * self.spacing
+        return pygame.Rect(x, y, self.button_width, self.button_height)
+
+    def _new_surface(self) -> pygame.Surface:
+        surface = pygame.Surface((self.cfg.screen_width, self.cfg.screen_height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def _build_grid(self) -> pygame.Surface:
+        """Compose the level selection screen"""
+        cfg = self.cfg
+        surface = self._new_surface()
+        surface.fill(Colors.DARK_BG.value)
+
+        # Title
+        title = cfg.font_large.render("Select Level", True, Colors.ACCENT.value)
+        surface.blit(title, title.get_rect(center=(cfg.screen_width // 2, 100)))
+
+        # Level buttons
+        for slot, level in enumerate(get_level_page(self.page, self.page_size)):
+            i = level.level_num
+            unlocked = is_level_unlocked(i)
+
+            # Button background
+            color = Colors.LIGHT_BG.value if unlocked else Colors.DARKER_BG.value
+            border_color = Colors.ACCENT.value if unlocked else Colors.TEXT_DIM.value
+
+            button_rect = self.button_rect(slot)
+            pygame.draw.rect(surface, color, button_rect)
+            pygame.draw.rect(surface, border_color, button_rect, 2)
+
+            # Level text
+            if unlocked:
+                level_text = cfg.font_medium.render(
+                    f"Level {i}: {level.title}", True, Colors.TEXT_BRIGHT.value
+                )
+            else:
+                level_text = cfg.font_medium.render(
+                    f"Level {i}: Locked", True, Colors.TEXT_DIM.value
+                )
+            surface.blit(level_text, level_text.get_rect(center=button_rect.center))
+
+            # Key hint
+            if unlocked:
+                key_text = cfg.font_tiny.render(
+                    f"Press {slot} to play", True, Colors.TEXT_DIM.value
+                )
+                key_rect = key_text.get_rect(
+                    center=(button_rect.centerx, button_rect.centery + 25)
+                )
+                surface.blit(key_text, key_rect)
+
+        # Back instruction
+        back_text = cfg.font_small.render(
+            "Press ESC to return to menu", True, Colors.TEXT_DIM.value
+        )
+        back_rect = back_text.get_rect(
+            center=(cfg.screen_width // 2, cfg.screen_height - 50)
+        )
+        surface.blit(back_text, back_rect)
+
+        # Page indicator
+        if self.page_count > 1:
+            page_text = cfg.font_tiny.render(
+                f"Page {self.page + 1}/{self.page_count} - LEFT/RIGHT to turn",
+                True,
+                Colors.TEXT_DIM.value,
+            )
+            page_rect = page_text.get_rect(
+                center=(cfg.screen_width // 2, cfg.screen_height - 85)
+            )
+            surface.blit(page_text, page_rect)
+
+        # Reset progress button
+        reset_text = cfg.font_small.render("Reset progress", True, Colors.ERROR.value)
+        reset_rect = reset_text.get_rect(
+            center=(cfg.screen_width - 100, cfg.screen_height - 50)
+        )
+        reset_rect.inflate_ip(20, 20)
+        self.reset_progress_rect = reset_rect
+        pygame.draw.rect(surface, Colors.ERROR.value, reset_rect, 2)
+        surface.blit(reset_text, reset_text.get_rect(center=reset_rect.center))
+
+        return surface
+
+    def _build_dialog(self, grid: pygame.Surface) -> pygame.Surface:
+        """Compose the confirmation dialog over a copy of the grid"""
+        cfg = self.cfg
+        surface = grid.copy()
+
+        # Semi-transparent overlay
+        overlay = pygame.Surface((cfg.screen_width, cfg.screen_height))
+        overlay.set_alpha(200)
+        overlay.fill(Colors.DARKER_BG.value)
+        surface.blit(overlay, (0, 0))
+
+        # Dialog box
+        dialog_width = 500
+        dialog_height = 200
+        dialog_rect = pygame.Rect(
+            (cfg.screen_width - dialog_width) // 2,
+            (cfg.screen_height - dialog_height) // 2,
+            dialog_width,
+            dialog_height,
+        )
+        pygame.draw.rect(surface, Colors.DARK_BG.value, dialog_rect)
+        pygame.draw.rect(surface, Colors.BORDER.value, dialog_rect, 3)
+
+        # Title and message
+        for text, font, color, y in (
+            ("Reset Progress?", cfg.font_medium, Colors.ERROR.value, 40),
+            (
+                "Are you sure you want to reset all progress?",
+                cfg.font_small,
+                Colors.TEXT.value,
+                80,
+            ),
+            (
+                "This action cannot be undone.",
+                cfg.font_tiny,
+                Colors.TEXT_DIM.value,
+                110,
+            ),
+        ):
+            rendered = font.render(text, True, color)
+            surface.blit(
+                rendered,
+                rendered.get_rect(center=(dialog_rect.centerx, dialog_rect.y + y)),
+            )
+
+        # Yes and No buttons
+        button_width = 120
+        button_height = 40
+        button_y = dialog_rect.bottom - button_height - 30
+        self.yes_button_rect = pygame.Rect(
+            dialog_rect.centerx - button_width - 20,
+            button_y,
+            button_width,
+            button_height,
+        )
+        pygame.draw.rect(surface, Colors.ERROR.value, self.yes_button_rect)
+        pygame.draw.rect(surface, Colors.TEXT_BRIGHT.value, self.yes_button_rect, 2)
+        yes_text = cfg.font_small.render("Yes", True, Colors.TEXT_BRIGHT.value)
+        surface.blit(yes_text, yes_text.get_rect(center=self.yes_button_rect.center))
+
+        self.no_button_rect = pygame.Rect(
+            dialog_rect.centerx + 20, button_y, button_width, button_height
+        )
+        pygame.draw.rect(surface, Colors.LIGHT_BG.value, self.no_button_rect)
+        pygame.draw.rect(surface, Colors.BORDER.value, self.no_button_rect, 2)
+        no_text = cfg.font_small.render("No", True, Colors.TEXT.value)
+        surface.blit(no_text, no_text.get_rect(center=self.no_button_rect.center))
+
+        # Instructions
+        instruction_text = cfg.font_tiny.render(
+            "Press ESC to cancel", True, Colors.TEXT_DIM.value
+        )
+        instruction_rect = instruction_text.get_rect(
+            center=(dialog_rect.centerx, dialog_rect.bottom - 15)
+        )
+        surface.blit(instruction_text, instruction_rect)
+
+        return surface
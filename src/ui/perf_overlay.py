@@ -0,0 +1,65 @@
+from src.enums.colors import Colors
+from src.perf.metrics import Metrics, rss_mb
+
+import pygame
+
+
+class PerfOverlay:
+    """Toggleable on-screen performance readout (FPS, frame-time percentiles, RSS)"""
+
+    def __init__(self, metrics: Metrics, font: pygame.font.Font):
+        self.metrics = metrics
+        self.font = font
+        self.visible = False
+        self.refresh_interval = 0.25  # Seconds between text refreshes
+        self._refresh_timer = 0.0
+        self._surface = None
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+        self._surface = None
+
+    def update(self, time_delta: float):
+        """Refresh the cached overlay surface a few times per second"""
+        if not self.visible:
+            return
+        self._refresh_timer += time_delta
+        if self._surface is None or self._refresh_timer >= self.refresh_interval:
+            self._refresh_timer = 0.0
+            self._surface = self._build_surface()
+
+    def render(self, screen: pygame.Surface):
+        """Draw the overlay in the top left corner"""
+        if self.visible and self._surface:
+            screen.blit(self._surface, (5, 5))
+
+    def _build_surface(self) -> pygame.Surface:
+        """Compose the overlay text into a single semi-transparent surface"""
+        frame = self.metrics.percentiles()
+        rss = rss_mb()
+        lines = [
+            f"FPS: {self.metrics.fps():.1f}",
+            f"Frame ms p50/p95/p99: {frame[50]:.1f} / {frame[95]:.1f} / {frame[99]:.1f}",
+            f"RSS: {rss:.1f} MB" if rss is not None else "RSS: n/a",
+        ]
+        for section in ("handle_events", "update", "render"):
+            p = self.metrics.percentiles(section)
+            lines.append(f"{section} p50/p95: {p[50]:.2f} / {p[95]:.2f} ms")
+        # Copied, as background threads can add histograms meanwhile
+        for name, histogram in list(self.metrics.histograms.items()):
+            mean_ms = histogram.total_ms / histogram.count if histogram.count else 0.0
+            lines.append(f"{name}: n={histogram.count} mean={mean_ms:.1f} ms")
+        lines.append("F3: hide  F4: dump metrics")
+
+        rendered = [self.font.render(line, True, Colors.TEXT.value) for line in lines]
+        padding = 6
+        width = max(text.get_width() for text in rendered) + 2 * padding
+        height = sum(text.get_height() for text in rendered) + 2 * padding
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((*Colors.DARKER_BG.value, 200))
+        y = padding
+        for text in rendered:
+            surface.blit(text, (padding, y))
+            y += text.get_height()
+        return surface
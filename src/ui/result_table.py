@@ -0,0 +1,238 @@
+from src.enums.colors import Colors
+
+import math
+import pygame
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class ResultTable:
+    """
+    Virtualized, scrollable table of query result rows
+
+    Only the rows in view are formatted and rendered. Rendered rows are kept in
+    an LRU cache of surfaces, and column widths are estimated from a sample of
+    the rows, so the cost of a frame doesn't depend on the size of the result.
+    """
+
+    def __init__(
+        self,
+        rows: List[Dict[str, Any]],
+        rect: pygame.Rect,
+        font: pygame.font.Font,
+        sample_size: int = 200,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            rows: Result records as dictionaries
+            rect: Area of the table, including the header and scrollbar
+            font: Font for the header and cells
+            sample_size: Number of rows used to pick the columns and their widths
+            cache_size: Maximum number of cached row surfaces
+        """
+        self.rows = rows
+        self.rect = rect
+        self.font = font
+        self.cache_size = cache_size
+
+        self.padding = 6
+        self.min_column_width = 60
+        self.max_column_width = 320
+        self.max_value_length = 80  # Characters
+        self.scrollbar_width = 8
+        self.row_height = font.get_linesize() + 4
+        self.scroll_x = 0
+        self.scroll_y = 0  # Index of the first row in view
+
+        sample = self._sample_rows(sample_size)
+        self.columns = self._columns(sample)
+        self.column_widths = self._column_widths(sample)
+        self.content_width = sum(self.column_widths)
+
+        self._row_cache: "OrderedDict[int, pygame.Surface]" = OrderedDict()
+        self._header = self._render_row(self.columns, Colors.ACCENT.value)
+
+    @property
+    def visible_rows(self) -> int:
+        """Number of rows that fit below the header"""
+        return max(1, (self.rect.height - self.row_height) // self.row_height)
+
+    @property
+    def max_scroll_y(self) -> int:
+        return max(0, len(self.rows) - self.visible_rows)
+
+    @property
+    def max_scroll_x(self) -> int:
+        view_width = self.rect.width - self.scrollbar_width
+        return max(0, self.content_width - view_width)
+
+    def _sample_rows(self, sample_size: int) -> List[Dict[str, Any]]:
+        """Pick evenly spaced rows across the result"""
+        if len(self.rows) <= sample_size:
+            return self.rows
+        step = len(self.rows) / sample_size
+        return [self.rows[int(i * step)] for i in range(sample_size)]
+
+    def _columns(self, sample: List[Dict[str, Any]]) -> List[str]:
+        """Get the column names in order of first appearance"""
+        columns = {}
+        for row in sample:
+            for key in row:
+                columns.setdefault(key, None)
+        return list(columns)
+
+    def _column_widths(self, sample: List[Dict[str, Any]]) -> List[int]:
+        """Estimate column widths from the header and the sampled values"""
+        widths = []
+        for column in self.columns:
+            texts = [column] + [self._format_value(row.get(column)) for row in sample]
+            width = max(self.font.size(text)[0] for text in texts) + 2 * self.padding
+            widths.append(min(max(width, self.min_column_width), self.max_column_width))
+
+        # Give the last column any space left over, so long values aren't cut
+        view_width = self.rect.width - self.scrollbar_width
+        if widths and sum(widths) < view_width:
+            widths[-1] += view_width - sum(widths)
+        return widths
+
+    def _format_value(self, value: Any) -> str:
+        """Format a cell value as a single line of text"""
+        if value is None:
+            return ""
+        text = " ".join(str(value).split())
+        if len(text) > self.max_value_length:
+            text = text[: self.max_value_length - 3] + "..."
+        return text
+
+    def _render_row(self, values: List[Any], color) -> pygame.Surface:
+        """Render one row of cells, clipped to the column widths"""
+        surface = pygame.Surface((self.content_width, self.row_height), pygame.SRCALPHA)
+        x = 0
+        for value, width in zip(values, self.column_widths):
+            text = self.font.render(self._format_value(value), True, color)
+            surface.blit(
+                text,
+                (x + self.padding, 2),
+                pygame.Rect(0, 0, width - 2 * self.padding, self.row_height),
+            )
+            x += width
+        return surface
+
+    def _row_surface(self, index: int) -> pygame.Surface:
+        """Get the rendered surface of a row, from the cache if possible"""
+        surface = self._row_cache.get(index)
+        if surface is not None:
+            self._row_cache.move_to_end(index)
+            return surface
+
+        row = self.rows[index]
+        surface = self._render_row(
+            [row.get(column) for column in self.columns], Colors.TEXT.value
+        )
+        self._row_cache[index] = surface
+        if len(self._row_cache) > self.cache_size:
+            self._row_cache.popitem(last=False)
+        return surface
+
+    def scroll(self, rows: int = 0, pixels_x: int = 0):
+        """Scroll by a number of rows and/or horizontal pixels"""
+        self.scroll_y = min(max(self.scroll_y + rows, 0), self.max_scroll_y)
+        self.scroll_x = min(max(self.scroll_x + pixels_x, 0), self.max_scroll_x)
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Handle scrolling input
+
+        Returns:
+            True if the event was consumed
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll(rows=-event.y * 3, pixels_x=event.x * 40)
+            return True
+        if event.type != pygame.KEYDOWN:
+            return False
+
+        page = self.visible_rows
+        if event.key == pygame.K_UP:
+            self.scroll(rows=-1)
+        elif event.key == pygame.K_DOWN:
+            self.scroll(rows=1)
+        elif event.key == pygame.K_PAGEUP:
+            self.scroll(rows=-page)
+        elif event.key == pygame.K_PAGEDOWN:
+            self.scroll(rows=page)
+        elif event.key == pygame.K_HOME:
+            self.scroll(rows=-len(self.rows))
+        elif event.key == pygame.K_END:
+            self.scroll(rows=len(self.rows))
+        elif event.key == pygame.K_LEFT:
+            self.scroll(pixels_x=-40)
+        elif event.key == pygame.K_RIGHT:
+            self.scroll(pixels_x=40)
+        else:
+            return False
+        return True
+
+    def render(self, screen: pygame.Surface):
+        """Render the header, the rows in view and the scrollbar"""
+        pygame.draw.rect(screen, Colors.DARKER_BG.value, self.rect)
+        old_clip = screen.get_clip()
+        screen.set_clip(self.rect)
+
+        x = self.rect.x - self.scroll_x
+        screen.blit(self._header, (x, self.rect.y))
+        pygame.draw.line(
+            screen,
+            Colors.BORDER.value,
+            (self.rect.x, self.rect.y + self.row_height - 1),
+            (self.rect.right, self.rect.y + self.row_height - 1),
+        )
+
+        y = self.rect.y + self.row_height
+        last = min(len(self.rows), self.scroll_y + self.visible_rows)
+        for index in range(self.scroll_y, last):
+            if index % 2:
+                pygame.draw.rect(
+                    screen,
+                    Colors.DARK_BG.value,
+                    (self.rect.x, y, self.rect.width, self.row_height),
+                )
+            screen.blit(self._row_surface(index), (x, y))
+            y += self.row_height
+
+        self._render_scrollbar(screen)
+        screen.set_clip(old_clip)
+        pygame.draw.rect(screen, Colors.BORDER.value, self.rect, 1)
+
+    def _render_scrollbar(self, screen: pygame.Surface):
+        """Draw the vertical scrollbar when the rows don't fit"""
+        if self.max_scroll_y == 0:
+            return
+        track = pygame.Rect(
+            self.rect.right - self.scrollbar_width,
+            self.rect.y + self.row_height,
+            self.scrollbar_width,
+            self.rect.height - self.row_height,
+        )
+        pygame.draw.rect(screen, Colors.LIGHT_BG.value, track)
+        thumb_height = max(
+            20, math.floor(track.height * self.visible_rows / len(self.rows))
+        )
+        thumb_y = track.y + (track.height - thumb_height) * (
+            self.scroll_y / self.max_scroll_y
+        )
+        pygame.draw.rect(
+            screen,
+            Colors.ACCENT.value,
+            (track.x, int(thumb_y), self.scrollbar_width, thumb_height),
+        )
+
+    def visible_range(self) -> Optional[tuple]:
+        """Get the (first, last) 1-based row numbers in view, or None if empty"""
+        if not self.rows:
+            return None
+        return (
+            self.scroll_y + 1,
+            min(len(self.rows), self.scroll_y + self.visible_rows),
+        )